@@ -3,6 +3,9 @@ Main Flask application for NoteFlow AI
 """
 import os
 import sys
+import time
+
+_started = time.perf_counter()  # Startup timing report (utils/startup.py) starts here
 
 # Allow app to find packages in vendor/ (e.g. yt-dlp when installed with pip install --target vendor)
 _here = os.path.dirname(os.path.abspath(__file__))
@@ -11,27 +14,52 @@ if os.path.isdir(_vendor):
     sys.path.insert(0, _vendor)
 
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify
-from flask_migrate import Migrate
+from flask import Flask, render_template, request, jsonify, g, abort
 from flask_login import LoginManager, login_required, current_user
-from werkzeug.utils import secure_filename
 from config import Config
-from models.meeting import db, Meeting, Book, Video, Conversation, ChatMessage
+from models.meeting import db, Meeting, Book, BookChapter, Video, Conversation, Batch
 from models.user import User
-from services.transcription import transcribe_audio
-from services.summarization import generate_summary, translate_text, summarize_book
-from services.book_extraction import extract_text_from_book, get_book_title_from_text
-from services.video_extraction import get_youtube_transcript, get_video_title_from_url
-from utils.video_utils import extract_audio_from_video, cleanup_file
+from services.summarization import chat_with_context
+from services.translation import (
+    translate_document, stored_translation, translate_content, track_source_changes,
+    CONTENT_MODELS, TRANSLATABLE_FIELDS
+)
+from services.processing import (
+    save_uploaded_file, process_audio_file, process_book_file, process_video_file, process_youtube_url,
+    summarize_chapter
+)
+from services.batch import batch_scheduler, create_batch
+from services.pretranslation import pretranslator
+from services.conversation_memory import memory_folder
+from services.chat import load_chat_state, save_chat_turn
+from utils import metrics
+from utils.profiling import request_profiler
+from utils.deadlines import request_deadlines
+from utils.rate_limit import rate_limiter, rate_limited
+from utils.db_pool import configure_pool, released_connection
+from utils.audio_probe import audio_upload_error, UPLOAD_FORM_OVERHEAD
+from utils.schema import prepare_schema, init_db_command
+from utils.startup import StartupReport
+
+startup = StartupReport(started=_started)
+startup.mark('imports')
 
 app = Flask(__name__)
 app.config.from_object(Config)
 
-# Initialize database
+# Initialize database (instrumented connection pool, see utils/db_pool.py)
+configure_pool(app)
 db.init_app(app)
 
-# Initialize Flask-Migrate for database migrations
-migrate = Migrate(app, db)
+# Time every ORM commit for /metrics
+metrics.instrument_sqlalchemy()
+
+# Initialize Flask-Migrate for database migrations. Only the `flask` CLI (`flask db ...`) needs it,
+# so app servers skip importing alembic.
+if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+    from flask_migrate import Migrate
+    migrate = Migrate(app, db)
+    app.cli.add_command(init_db_command)
 
 # Initialize Flask-Login
 login_manager = LoginManager()
@@ -46,12 +74,40 @@ def load_user(user_id):
     """Load user by ID for Flask-Login"""
     return User.query.get(int(user_id))
 
+# Initialize the bulk batch worker pool
+batch_scheduler.init_app(app)
+
+# Background translation of new summaries into users' preferred languages
+pretranslator.init_app(app)
+
+# Background folding of old chat turns into each conversation's rolling summary
+memory_folder.init_app(app)
+
+# Stored translations are dropped when their source summary/transcript changes
+track_source_changes()
+
+# Per-route-class time budgets (short for reads, long for processing)
+request_deadlines.init_app(app, db)
+
+# Token buckets and concurrency caps for the LLM and processing endpoints
+rate_limiter.init_app(app, db)
+
+# Initialize opt-in request profiling (no-op unless a request is selected)
+request_profiler.init_app(app)
+
+startup.mark('extensions')
+
 # Register blueprints
 from routes.auth import auth, init_oauth
+from routes.admin import admin
+from routes.live import live
 app.register_blueprint(auth)
+app.register_blueprint(admin)
+app.register_blueprint(live)
 
 # Initialize OAuth
 init_oauth(app)
+startup.mark('blueprints')
 
 # Create upload folder if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -80,6 +136,29 @@ def _is_production():
     return bool(os.getenv('RENDER')) or os.getenv('FLASK_ENV') == 'production'
 
 
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_request_time(response):
+    started = g.pop('request_started', None)
+    if started is not None and request.endpoint != 'metrics_endpoint':
+        metrics.observe('noteflow_http_request_seconds', time.perf_counter() - started,
+                        endpoint=request.endpoint or 'unknown', status=response.status_code)
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint (merged across all gunicorn workers)"""
+    token = app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        abort(401)
+    return metrics.render_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
 @app.route('/')
 def index():
     """Homepage with upload form"""
@@ -88,6 +167,7 @@ def index():
 
 @app.route('/upload', methods=['POST'])
 @login_required
+@rate_limited('processing')
 def upload():
     """Handle audio file upload and processing"""
     try:
@@ -102,6 +182,12 @@ def upload():
         # raise Exception("🔑 Authentication error. Please check your AssemblyAI API key configuration.")
         # ========== END TEST MODE ==========
 
+        # Reject oversized bodies before the multipart form is parsed and spooled
+        max_audio_bytes = app.config['MAX_AUDIO_UPLOAD_MB'] * 1024 * 1024
+        if request.content_length and request.content_length > max_audio_bytes + UPLOAD_FORM_OVERHEAD:
+            metrics.inc('noteflow_upload_rejected_total', kind='audio', reason='too_large')
+            return jsonify({'success': False, 'message': f"Audio file is too large (limit {app.config['MAX_AUDIO_UPLOAD_MB']} MB)"}), 413
+
         # Check if file is present
         if 'audio' not in request.files:
             return jsonify({'success': False, 'message': 'No file uploaded'}), 400
@@ -116,27 +202,21 @@ def upload():
         if not allowed_file(file.filename):
             return jsonify({'success': False, 'message': 'Invalid file type'}), 400
 
+        # Probe size and container before anything is written to disk
+        rejection = audio_upload_error(file, max_audio_bytes)
+        if rejection:
+            message, status = rejection
+            return jsonify({'success': False, 'message': message}), status
+
+        # Bitrate reported by the browser recorder (static/js/audio_capture.js); ignored unless a plausible number
+        bitrate = request.form.get('recording_bitrate', type=int)
+        if bitrate is not None and 0 < bitrate <= 10_000_000:
+            metrics.observe('noteflow_recording_bitrate', bitrate, buckets=metrics.BITRATE_BUCKETS)
+
         # Save the file
-        filename = secure_filename(file.filename)
-        # Add timestamp to avoid filename conflicts
-        import time
-        timestamp = str(int(time.time()))
-        filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-
-        transcript = transcribe_audio(filepath)
-        summary = generate_summary(transcript)
-
-        meeting = Meeting(
-            title=file.filename,
-            audio_filename=filename,
-            transcript=transcript,
-            summary=summary,
-            user_id=current_user.id
-        )
-        db.session.add(meeting)
-        db.session.commit()
+        filename, filepath, _ = save_uploaded_file(file, app.config['UPLOAD_FOLDER'])
+
+        meeting = process_audio_file(filepath, filename, file.filename, current_user.id)
 
         return jsonify({
             'success': True,
@@ -165,6 +245,7 @@ def get_meetings():
 
 
 @app.route('/api/translate', methods=['POST'])
+@rate_limited('llm')
 def translate():
     """API endpoint to translate text"""
     try:
@@ -183,7 +264,11 @@ def translate():
         if not text or not target_language:
             return jsonify({'success': False, 'message': 'Missing text or language'}), 400
 
-        translated_text = translate_text(text, target_language)
+        # Summaries pretranslated into the user's preferred languages are already stored
+        translated_text = stored_translation(text, target_language)
+        if translated_text is None:
+            with released_connection(db.session):
+                translated_text = translate_document(text, target_language)
 
         return jsonify({
             'success': True,
@@ -193,6 +278,40 @@ def translate():
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+@app.route('/api/translations', methods=['POST'])
+@login_required
+@rate_limited('llm')
+def translate_stored_content():
+    """
+    API endpoint to translate a field of a stored meeting, book or video: answered from the
+    translations table when the field was translated before, translated and stored otherwise
+    """
+    data = request.get_json(silent=True) or {}
+    content_type = data.get('content_type')
+    field = data.get('field', 'summary')
+    target_language = (data.get('language') or '').strip()
+
+    if content_type not in CONTENT_MODELS or field not in TRANSLATABLE_FIELDS[content_type]:
+        return jsonify({'success': False, 'message': 'Unknown content type or field'}), 400
+    if not target_language or len(target_language) > 35:
+        return jsonify({'success': False, 'message': 'Missing or invalid language'}), 400
+    try:
+        content_id = int(data.get('content_id'))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Missing content_id'}), 400
+
+    content = CONTENT_MODELS[content_type].query.filter_by(id=content_id, user_id=current_user.id).first_or_404()
+    if not getattr(content, field):
+        return jsonify({'success': False, 'message': f'This {content_type} has no {field}'}), 400
+
+    try:
+        translated_text, stored = translate_content(content_type, content, field, target_language)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+    return jsonify({'success': True, 'translated_text': translated_text, 'stored': stored})
+
+
 # ============== BOOKS SECTION ==============
 
 @app.route('/books')
@@ -204,6 +323,7 @@ def books():
 
 @app.route('/books/upload', methods=['POST'])
 @login_required
+@rate_limited('processing')
 def upload_book():
     """Handle book file upload and processing"""
     try:
@@ -222,30 +342,9 @@ def upload_book():
             return jsonify({'success': False, 'message': 'Invalid file type. Allowed: PDF, EPUB, TXT, DOCX'}), 400
 
         # Save the file
-        filename = secure_filename(file.filename)
-        import time
-        timestamp = str(int(time.time()))
-        filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-
-        # Get file extension
-        file_type = file.filename.rsplit('.', 1)[1].lower()
-
-        full_text = extract_text_from_book(filepath, file_type)
-        book_title = get_book_title_from_text(full_text, file.filename)
-        summary = summarize_book(full_text)
-
-        book = Book(
-            title=book_title,
-            book_filename=filename,
-            file_type=file_type,
-            full_text=full_text[:50000],  # Store first 50k chars to save space
-            summary=summary,
-            user_id=current_user.id
-        )
-        db.session.add(book)
-        db.session.commit()
+        filename, filepath, _ = save_uploaded_file(file, app.config['UPLOAD_FOLDER'])
+
+        book = process_book_file(filepath, filename, file.filename, current_user.id)
 
         return jsonify({
             'success': True,
@@ -260,9 +359,24 @@ def upload_book():
 @app.route('/api/book/<int:book_id>')
 @login_required
 def get_book(book_id):
-    """API endpoint to get book data for current user"""
+    """API endpoint to get book data (with its chapter list) for current user"""
+    book = Book.query.filter_by(id=book_id, user_id=current_user.id).first_or_404()
+    return jsonify(book.to_dict(include_chapters=True))
+
+
+@app.route('/api/book/<int:book_id>/chapters/<int:chapter_id>')
+@login_required
+@rate_limited('llm')  # The first request for a chapter summarizes it with Groq
+def get_book_chapter(book_id, chapter_id):
+    """API endpoint to get a chapter with its summary (generated on first request, then cached)"""
     book = Book.query.filter_by(id=book_id, user_id=current_user.id).first_or_404()
-    return jsonify(book.to_dict())
+    chapter = BookChapter.query.filter_by(id=chapter_id, book_id=book.id).first_or_404()
+
+    try:
+        summarize_chapter(chapter)
+        return jsonify({'success': True, 'chapter': chapter.to_dict()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
 
 
 @app.route('/api/books')
@@ -277,6 +391,7 @@ def get_books():
 
 @app.route('/videos/process', methods=['POST'])
 @login_required
+@rate_limited('processing')
 def process_video():
     """Handle YouTube video URL processing OR video file upload"""
     try:
@@ -292,43 +407,15 @@ def process_video():
                 return jsonify({'success': False, 'message': 'Invalid file type. Allowed: MP4, MOV, AVI, MKV, WEBM, FLV, M4V'}), 400
 
             # Save the video file
-            filename = secure_filename(file.filename)
-            import time
-            timestamp = str(int(time.time()))
-            filename = f"{timestamp}_{filename}"
-            video_filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(video_filepath)
-
-            audio_filepath = None
-            try:
-                audio_filepath = extract_audio_from_video(video_filepath)
-                transcript = transcribe_audio(audio_filepath)
-                summary = summarize_book(transcript)
-
-                video = Video(
-                    title=file.filename,  # Original filename as title
-                    video_url=filename,  # Store filename in video_url field
-                    video_id='file_upload',
-                    transcript=transcript[:50000],
-                    summary=summary,
-                    user_id=current_user.id
-                )
-                db.session.add(video)
-                db.session.commit()
+            filename, video_filepath, _ = save_uploaded_file(file, app.config['UPLOAD_FOLDER'])
 
-                return jsonify({
-                    'success': True,
-                    'video_id': video.id,
-                    'message': 'Video processed successfully'
-                })
-
-            finally:
-                # Cleanup: Delete extracted audio file to save space
-                if audio_filepath:
-                    cleanup_file(audio_filepath)
-                # Optionally delete original video file to save space
-                # Uncomment the line below if you don't need to keep video files
-                # cleanup_file(video_filepath)
+            video = process_video_file(video_filepath, filename, file.filename, current_user.id)
+
+            return jsonify({
+                'success': True,
+                'video_id': video.id,
+                'message': 'Video processed successfully'
+            })
 
         else:
             # YouTube URL processing (disabled in production; use video file upload there)
@@ -344,28 +431,10 @@ def process_video():
                     'message': '⚠️ YouTube URL is disabled on this server. Use Video file upload instead — download the video on your device and upload it here.'
                 }), 400
 
-            result = get_youtube_transcript(video_url)
-            if not result['success']:
-                err = result.get('error', 'Unknown error')
-                # Use error as-is when it's already user-friendly (e.g. starts with ⚠️)
-                message = err if err.strip().startswith('⚠️') else f"Failed to get transcript: {err}"
-                return jsonify({'success': False, 'message': message}), 400
-
-            transcript = result['transcript']
-            video_id = result['video_id']
-            video_title = get_video_title_from_url(video_url)
-            summary = summarize_book(transcript)
-
-            video = Video(
-                title=video_title,
-                video_url=video_url,
-                video_id=video_id,
-                transcript=transcript[:50000],  # Store first 50k chars
-                summary=summary,
-                user_id=current_user.id
-            )
-            db.session.add(video)
-            db.session.commit()
+            try:
+                video = process_youtube_url(video_url, current_user.id)
+            except ValueError as e:
+                return jsonify({'success': False, 'message': str(e)}), 400
 
             return jsonify({
                 'success': True,
@@ -393,9 +462,51 @@ def get_videos():
     return jsonify([video.to_dict() for video in videos])
 
 
+# ============== BATCH PROCESSING ==============
+
+@app.route('/api/batch', methods=['POST'])
+@login_required
+@rate_limited('processing')
+def create_batch_job():
+    """Accept many files and/or YouTube URLs at once and process them in the background"""
+    try:
+        files = [f for f in request.files.getlist('files') if f.filename]
+        urls = request.form.getlist('urls')
+        if request.is_json:
+            urls = (request.get_json() or {}).get('urls', [])
+        urls = [url for url in urls if url and url.strip()]
+
+        if not files and not urls:
+            return jsonify({'success': False, 'message': 'No files or URLs provided'}), 400
+
+        if len(files) + len(urls) > app.config['BATCH_MAX_ITEMS']:
+            return jsonify({'success': False, 'message': f"Too many items. Maximum is {app.config['BATCH_MAX_ITEMS']} per batch"}), 400
+
+        batch = create_batch(current_user.id, files, urls, allow_urls=not _is_production())
+
+        return jsonify({
+            'success': True,
+            'batch_id': batch.id,
+            'batch': batch.to_dict()
+        }), 202
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/batch/<int:batch_id>')
+@login_required
+def get_batch(batch_id):
+    """API endpoint to get batch progress with per-item results"""
+    batch = Batch.query.filter_by(id=batch_id, user_id=current_user.id).first_or_404()
+    return jsonify(batch.to_dict())
+
+
 # ============== CONVERSATIONAL AI ==============
 
 @app.route('/api/chat', methods=['POST'])
+@rate_limited('llm')
 def chat_conversation():
     """Handle conversational AI messages"""
     try:
@@ -413,81 +524,27 @@ def chat_conversation():
         if not user_message:
             return jsonify({'success': False, 'message': 'No message provided'}), 400
 
-        # Get context if provided
-        context_summary = None
-        context_transcript = None
-
-        if context_id and context_type and current_user.is_authenticated:
-            if context_type == 'audio':
-                meeting = Meeting.query.filter_by(id=context_id, user_id=current_user.id).first()
-                if meeting:
-                    context_summary = meeting.summary
-                    context_transcript = meeting.transcript
-            elif context_type == 'video':
-                video = Video.query.filter_by(id=context_id, user_id=current_user.id).first()
-                if video:
-                    context_summary = video.summary
-                    context_transcript = video.transcript
-            elif context_type == 'book':
-                book = Book.query.filter_by(id=context_id, user_id=current_user.id).first()
-                if book:
-                    context_summary = book.summary
-                    context_transcript = book.full_text
-
-        # Build conversation prompt
-        from services.summarization import chat_with_context
-
-        ai_response = chat_with_context(
-            user_message=user_message,
-            summary=context_summary,
-            transcript=context_transcript
-        )
+        user_id = current_user.id if current_user.is_authenticated else None
+        state = load_chat_state(user_id, context_type, context_id, conversation_id)
 
-        # Save conversation if user is authenticated
-        if current_user.is_authenticated:
-            conversation = None
-
-            # Get or create conversation
-            if conversation_id:
-                conversation = Conversation.query.filter_by(id=conversation_id, user_id=current_user.id).first()
-
-            if not conversation:
-                # Create new conversation
-                # Generate title from first message (first 50 chars)
-                title = user_message[:50] + ('...' if len(user_message) > 50 else '')
-                conversation = Conversation(
-                    user_id=current_user.id,
-                    title=title,
-                    context_type=context_type,
-                    context_id=context_id
-                )
-                db.session.add(conversation)
-                db.session.flush()  # Get the conversation ID
-
-            # Save user message
-            user_msg = ChatMessage(
-                conversation_id=conversation.id,
-                role='user',
-                content=user_message
+        with released_connection(db.session):
+            ai_response = chat_with_context(
+                user_message=user_message,
+                summary=state['summary'],
+                transcript=state['transcript'],
+                history=state['history'],
+                memory_summary=state['memory_summary']
             )
-            db.session.add(user_msg)
 
-            # Save AI response
-            ai_msg = ChatMessage(
-                conversation_id=conversation.id,
-                role='assistant',
-                content=ai_response
+        # Save conversation if user is authenticated
+        if user_id is not None:
+            conversation_id = save_chat_turn(
+                user_id, state['conversation_id'], user_message, ai_response, context_type, context_id
             )
-            db.session.add(ai_msg)
-
-            # Update conversation timestamp
-            conversation.updated_at = datetime.utcnow()
-            db.session.commit()
-
             return jsonify({
                 'success': True,
                 'response': ai_response,
-                'conversation_id': conversation.id
+                'conversation_id': conversation_id
             })
 
         return jsonify({
@@ -554,8 +611,12 @@ def update_conversation(conversation_id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
-with app.app_context():
-    db.create_all()
+startup.mark('routes')
+
+# Schema per DB_SCHEMA_MODE: create_all locally, migrations-only (`flask init-db`) in production
+schema_mode = prepare_schema(app, db)
+startup.mark(f'schema[{schema_mode}]')
+startup.finish()
 
 
 if __name__ == '__main__':
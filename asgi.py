@@ -0,0 +1,227 @@
+"""
+ASGI configuration: async serving mode for the I/O-bound endpoints
+
+POST /api/chat, /api/translate and /videos/process (YouTube URL) run natively on the event
+loop with the async Groq / YouTube clients, so hundreds of requests waiting on the network
+need no thread each. Their database work (and the YouTube summary step, which still uses the
+blocking chunked summarizer) runs on a worker thread. Every other route (uploads, pages,
+auth, admin) is served by the Flask app through a WSGI adapter.
+
+    uvicorn asgi:application --host 0.0.0.0 --port $PORT --workers 2
+"""
+import time
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from a2wsgi import WSGIMiddleware
+from itsdangerous import BadSignature
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+# Import the Flask app
+from app import app as flask_app, _is_production
+from models.meeting import db
+from models.user import User
+from services.chat import load_chat_state, save_chat_turn
+from services.processing import store_youtube_transcript
+from services.summarization import chat_with_context_async
+from services.translation import translate_document_async, stored_translation
+from services.video_extraction import get_youtube_transcript_async
+from utils import metrics
+from utils.rate_limit import rate_limiter
+
+flask_wsgi = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_WSGI_THREADS'])
+
+
+class _FlaskFallback:
+    """Route endpoint served by an async handler, or by Flask when the handler returns None"""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def __call__(self, scope, receive, send):
+        started = time.perf_counter()
+        response = await self.handler(Request(scope, receive))
+        if response is None:
+            # The handler has not read the body, so Flask gets the untouched request
+            await flask_wsgi(scope, receive, send)
+            return
+        await response(scope, receive, send)
+        metrics.observe('noteflow_http_request_seconds', time.perf_counter() - started,
+                        endpoint=self.handler.__name__, status=response.status_code)
+
+
+async def _in_app_context(func, *args):
+    """Run blocking (database) work on a worker thread inside a Flask app context"""
+    def call():
+        with flask_app.app_context():
+            return func(*args)
+    return await run_in_threadpool(call)
+
+
+def _session_user_id(request):
+    """
+    User ID stored by Flask-Login in the signed session cookie
+
+    Returns:
+        int or None for anonymous requests; False when only a remember-me cookie is
+        present (Flask restores that session, so the request is handed to Flask)
+    """
+    cookie = request.cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    if cookie:
+        serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        try:
+            data = serializer.loads(cookie, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+            if data.get('_user_id'):
+                return int(data['_user_id'])
+        except (BadSignature, ValueError):
+            pass
+    if request.cookies.get(flask_app.config.get('REMEMBER_COOKIE_NAME', 'remember_token')):
+        return False
+    return None
+
+
+async def _admit(request, route_class, user_id):
+    """
+    Rate limiter admission (utils/rate_limit.py) for a natively served request
+
+    Returns:
+        tuple: (identity to release, 429 JSONResponse or None when admitted)
+    """
+    identity = rate_limiter.identity(user_id or None, request.client.host if request.client else None,
+                                     request.headers.get('x-forwarded-for'))
+    rejection = await _in_app_context(rate_limiter.admit, route_class, identity)
+    if rejection is None:
+        return identity, None
+    return identity, JSONResponse({'success': False, 'message': rejection.message}, status_code=429,
+                                  headers={'Retry-After': str(rejection.retry_after)})
+
+
+def _active_user_id(user_id):
+    """Same check as the Flask-Login user loader: the account must still exist"""
+    return user_id if user_id is not None and db.session.get(User, user_id) is not None else None
+
+
+async def chat_conversation(request):
+    """Async /api/chat: same contract as the Flask route"""
+    user_id = _session_user_id(request)
+    if user_id is False:
+        return None
+    identity, rejected = await _admit(request, 'llm', user_id)
+    if rejected is not None:
+        return rejected
+
+    try:
+        data = await request.json()
+        user_message = data.get('message', '').strip()
+        context_type = data.get('context_type')  # 'audio', 'video', 'book'
+        context_id = data.get('context_id')  # meeting_id, video_id, book_id
+        conversation_id = data.get('conversation_id')  # Optional: existing conversation ID
+
+        if not user_message:
+            return JSONResponse({'success': False, 'message': 'No message provided'}, status_code=400)
+
+        def load(user_id):
+            user_id = _active_user_id(user_id)
+            return user_id, load_chat_state(user_id, context_type, context_id, conversation_id)
+
+        user_id, state = await _in_app_context(load, user_id)
+
+        ai_response = await chat_with_context_async(
+            user_message=user_message,
+            summary=state['summary'],
+            transcript=state['transcript'],
+            history=state['history'],
+            memory_summary=state['memory_summary']
+        )
+
+        if user_id is None:
+            return JSONResponse({'success': True, 'response': ai_response})
+
+        conversation_id = await _in_app_context(
+            save_chat_turn, user_id, state['conversation_id'], user_message, ai_response, context_type, context_id
+        )
+        return JSONResponse({'success': True, 'response': ai_response, 'conversation_id': conversation_id})
+
+    except Exception as e:
+        return JSONResponse({'success': False, 'message': str(e)}, status_code=500)
+    finally:
+        rate_limiter.release('llm', identity)
+
+
+async def translate(request):
+    """Async /api/translate: same contract as the Flask route"""
+    identity, rejected = await _admit(request, 'llm', _session_user_id(request))
+    if rejected is not None:
+        return rejected
+
+    try:
+        data = await request.json()
+        text = data.get('text')
+        target_language = data.get('language')
+
+        if not text or not target_language:
+            return JSONResponse({'success': False, 'message': 'Missing text or language'}, status_code=400)
+
+        translated_text = await _in_app_context(stored_translation, text, target_language)
+        if translated_text is None:
+            translated_text = await translate_document_async(text, target_language)
+        return JSONResponse({'success': True, 'translated_text': translated_text})
+    except Exception as e:
+        return JSONResponse({'success': False, 'message': str(e)}, status_code=500)
+    finally:
+        rate_limiter.release('llm', identity)
+
+
+async def process_video(request):
+    """
+    Async /videos/process for YouTube URLs. File uploads, production (URLs disabled) and
+    unauthenticated requests are left to the Flask route.
+    """
+    if request.headers.get('content-type', '').split(';')[0].strip() != 'application/json' or _is_production():
+        return None
+    user_id = _session_user_id(request)
+    if not user_id:
+        return None
+    identity, rejected = await _admit(request, 'processing', user_id)
+    if rejected is not None:
+        return rejected
+
+    try:
+        data = await request.json()
+        video_url = data.get('video_url', '').strip()
+
+        if not video_url:
+            return JSONResponse({'success': False, 'message': 'No video URL provided'}, status_code=400)
+
+        result = await get_youtube_transcript_async(video_url)
+
+        def store(user_id):
+            if _active_user_id(user_id) is None:
+                raise ValueError('Please log in to access this page.')
+            return store_youtube_transcript(result, video_url, user_id).id
+
+        try:
+            video_id = await _in_app_context(store, user_id)
+        except ValueError as e:
+            return JSONResponse({'success': False, 'message': str(e)}, status_code=400)
+
+        return JSONResponse({'success': True, 'video_id': video_id, 'message': 'Video processed successfully'})
+
+    except Exception as e:
+        return JSONResponse({'success': False, 'message': str(e)}, status_code=500)
+    finally:
+        rate_limiter.release('processing', identity)
+
+
+application = Starlette(routes=[
+    Route('/api/chat', _FlaskFallback(chat_conversation), methods=['POST']),
+    Route('/api/translate', _FlaskFallback(translate), methods=['POST']),
+    Route('/videos/process', _FlaskFallback(process_video), methods=['POST']),
+    Mount('/', app=flask_wsgi),
+])
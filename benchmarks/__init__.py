@@ -0,0 +1,3 @@
+"""
+Benchmarks for NoteFlow AI (route load tests, microbenchmarks, fake upstream services)
+"""
@@ -0,0 +1,92 @@
+"""
+Transcript compaction check on the fixture transcripts (benchmarks/fixtures/transcripts)
+
+    python -m benchmarks.compaction --output bench_results/compaction.json [--summarize]
+
+For every fixture: estimated tokens before/after compaction, the reduction, the time per
+call, and whether all of the fixture's key terms survive compaction (exits with status 1
+when one is lost). With --summarize (needs GROQ_API_KEY) each fixture is also summarized
+from the raw and the compacted transcript; both summaries are written next to the output
+file for side-by-side review, with the key terms each one mentions.
+"""
+import os
+import sys
+import glob
+import json
+import argparse
+
+os.environ.setdefault('GROQ_API_KEY', 'fake-groq-key')  # summarization builds its client at import
+
+from benchmarks.micro import bench
+from benchmarks.results import write_results, print_table
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'transcripts')
+
+
+def load_fixtures(directory=FIXTURES_DIR):
+    """{name: fixture dict} for every *.json fixture"""
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            fixtures[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+    return fixtures
+
+
+def _terms_in(text, terms):
+    lowered = text.lower()
+    return [term for term in terms if term.lower() in lowered]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='bench_results/compaction.json')
+    parser.add_argument('--summarize', action='store_true', help='Also summarize raw and compacted text with Groq')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Seconds per timing run')
+    args = parser.parse_args(argv)
+
+    from services.transcript_compaction import compact_transcript
+
+    results, lost = {}, []
+    for name, fixture in load_fixtures().items():
+        transcript, terms = fixture['transcript'], fixture.get('key_terms', [])
+        compaction = compact_transcript(transcript, fixture.get('source', 'transcript'))
+        missing = [term for term in terms if term not in _terms_in(compaction.text, terms)]
+        lost.extend(f"{name}: {term}" for term in missing)
+
+        timing = bench(lambda: compact_transcript(transcript), min_time=args.min_time)
+        results[name] = {
+            'tokens_before': compaction.tokens_before,
+            'tokens_after': compaction.tokens_after,
+            'reduction_pct': round(100.0 * (1 - compaction.tokens_after / compaction.tokens_before), 1)
+            if compaction.tokens_before else 0.0,
+            'compact_ms': timing['mean_ms'],
+            'key_terms_lost': len(missing),
+        }
+        if args.summarize:
+            results[name].update(_summarize(name, transcript, compaction.text, terms, args.output))
+
+    print_table(results, ['tokens_before', 'tokens_after', 'reduction_pct', 'compact_ms', 'key_terms_lost']
+                + (['raw_summary_terms', 'compacted_summary_terms'] if args.summarize else []))
+    write_results(args.output, 'compaction', results, summarize=args.summarize)
+    for item in lost:
+        print(f"Key term lost in compaction: {item}")
+    return 1 if lost else 0
+
+
+def _summarize(name, raw, compacted, terms, output):
+    """Summaries of both versions, written to <output dir>/compaction_summaries/<name>.{raw,compacted}.md"""
+    from services.summarization import generate_summary
+
+    directory = os.path.join(os.path.dirname(output) or '.', 'compaction_summaries')
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for label, text in (('raw', raw), ('compacted', compacted)):
+        summary = generate_summary(text)
+        with open(os.path.join(directory, f'{name}.{label}.md'), 'w', encoding='utf-8') as f:
+            f.write(summary)
+        counts[f'{label}_summary_terms'] = len(_terms_in(summary, terms))
+    return counts
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Compare two benchmark result files and flag regressions
+
+    python -m benchmarks.compare bench_results/routes-main.json bench_results/routes.json --threshold 10
+
+Metrics ending in `_ms` are lower-is-better, metrics ending in `_rps` or `_per_s` are
+higher-is-better; other fields (counts, error totals) are shown but never fail the run.
+Exits with status 1 when any metric regressed by more than --threshold percent.
+"""
+import sys
+import json
+import argparse
+
+LOWER_IS_BETTER = ('_ms',)
+HIGHER_IS_BETTER = ('_rps', '_per_s')
+
+
+def _direction(metric):
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    return 0
+
+
+def compare(baseline, candidate, threshold, metrics=None):
+    """
+    Compare the `results` sections of two result documents
+
+    Returns:
+        list: (benchmark, metric, old, new, change_pct, regressed) rows
+    """
+    rows = []
+    for name, old_stats in baseline['results'].items():
+        new_stats = candidate['results'].get(name)
+        if not isinstance(new_stats, dict) or not isinstance(old_stats, dict):
+            continue
+        for metric, old in old_stats.items():
+            direction = _direction(metric)
+            new = new_stats.get(metric)
+            if not direction or (metrics and metric not in metrics):
+                continue
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or not old:
+                continue
+            change = (new - old) / old * 100.0
+            regressed = -direction * change > threshold
+            rows.append((name, metric, old, new, round(change, 1), regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Allowed regression in percent')
+    parser.add_argument('--metric', action='append', help='Only compare these metrics (repeatable), e.g. p95_ms')
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    if baseline.get('suite') != candidate.get('suite'):
+        print(f"Warning: comparing suite '{baseline.get('suite')}' with '{candidate.get('suite')}'")
+
+    rows = compare(baseline, candidate, args.threshold, args.metric)
+    width = max([len(f'{name} {metric}') for name, metric, *_ in rows] + [10])
+    for name, metric, old, new, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{f'{name} {metric}':<{width}}  {old:>12}  ->  {new:>12}  {change:+7.1f}%{flag}")
+
+    regressions = [row for row in rows if row[-1]]
+    print(f"\n{len(rows)} metrics compared, {len(regressions)} regressed beyond {args.threshold}%")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Load-test the Gunicorn (sync WSGI) and Uvicorn (ASGI) serving modes side by side
+
+Each server runs as a subprocess against the same fake upstreams and the same temporary
+SQLite database, with the worker counts used in production:
+
+    python -m benchmarks.compare_servers --concurrency 100 --requests 300 --latency-ms 300 \\
+        --output bench_results/servers.json
+
+    # Capacity while slow uploads are in flight (the "two uploads block the site" case)
+    python -m benchmarks.compare_servers --servers gunicorn-sync,gunicorn-conf \\
+        --routes list_meetings,chat --background upload_audio:4 --latency-ms 2000
+
+Results are keyed '<server>/<route>' so two runs can be diffed with benchmarks.compare.
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+
+import requests
+
+from benchmarks.fake_services import FakeServices
+from benchmarks.load_routes import SCENARIOS, _login, run_scenario, failed_routes
+from benchmarks.results import write_results, print_table
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    # The original start.sh configuration (sync workers); gunicorn would otherwise pick up ./gunicorn.conf.py
+    'gunicorn-sync': lambda port, workers: ['gunicorn', 'wsgi:application', '--config', os.devnull,
+                                            '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--timeout', '300'],
+    # gunicorn.conf.py (threaded workers, preloaded app)
+    'gunicorn-conf': lambda port, workers: ['gunicorn', 'wsgi:application', '-c', 'gunicorn.conf.py',
+                                            '--bind', f'127.0.0.1:{port}', '--workers', str(workers)],
+    'uvicorn-asgi': lambda port, workers: [sys.executable, '-m', 'uvicorn', 'asgi:application', '--host', '127.0.0.1',
+                                           '--port', str(port), '--workers', str(workers), '--no-access-log'],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(base, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with status {process.returncode}')
+        try:
+            requests.get(f'{base}/auth/login', timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.3)
+    raise RuntimeError(f'Server at {base} did not start within {timeout}s')
+
+
+def _start_background(base, spec, email, password):
+    """Keep `clients` requests of a slow scenario in flight, e.g. 'upload_audio:4'"""
+    name, _, clients = spec.partition(':')
+    stop = threading.Event()
+
+    def loop(session):
+        while not stop.is_set():
+            try:
+                SCENARIOS[name](session, base)
+            except requests.RequestException:
+                pass
+
+    for _ in range(int(clients or 1)):
+        threading.Thread(target=loop, args=(_login(base, email, password),), daemon=True).start()
+    return stop
+
+
+def _prepare_database(email, password):
+    """Create the schema and the benchmark account (the app is imported against the fakes' environment)"""
+    from app import app, db
+    from models.user import User
+    with app.app_context():
+        db.create_all()
+        if not User.query.filter_by(email=email).first():
+            user = User(email=email)
+            user.set_password(password)
+            db.session.add(user)
+            db.session.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servers', default=','.join(SERVERS))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=300, help='Requests per route')
+    parser.add_argument('--latency-ms', type=float, default=300, help='Injected upstream latency')
+    parser.add_argument('--jitter-ms', type=float, default=50)
+    parser.add_argument('--routes', default='chat,translate')
+    parser.add_argument('--background', help="Slow scenario kept in flight while measuring, e.g. 'upload_audio:4'")
+    parser.add_argument('--output', default='bench_results/servers.json')
+    args = parser.parse_args(argv)
+
+    email, password = 'bench@noteflow.local', 'bench-password'
+    fakes = FakeServices(args.latency_ms, args.jitter_ms, seed=42).start()
+    fakes.configure_environment()
+    workdir = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['METRICS_DIR'] = os.path.join(workdir, 'metrics')
+    os.environ.pop('RENDER', None)
+    _prepare_database(email, password)
+
+    routes = [r.strip() for r in args.routes.split(',') if r.strip()]
+    results = {}
+    for server in [s.strip() for s in args.servers.split(',') if s.strip()]:
+        port = _free_port()
+        base = f'http://127.0.0.1:{port}'
+        process = subprocess.Popen(SERVERS[server](port, args.workers), cwd=ROOT, env=os.environ.copy(),
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_ready(base, process)
+            sessions = [_login(base, email, password) for _ in range(args.concurrency)]
+            if 'get_meeting' in routes:
+                for session in sessions:
+                    session.meeting_id = SCENARIOS['upload_audio'](session, base).json().get('meeting_id')
+            stop = _start_background(base, args.background, email, password) if args.background else None
+            for route in routes:
+                stats = run_scenario(route, base, sessions, args.requests, args.concurrency)
+                results[f'{server}/{route}'] = stats
+                print(f"{server}/{route}: {stats['throughput_rps']} req/s, p95 {stats['p95_ms']} ms, {stats['errors']} errors")
+            if stop:
+                stop.set()
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print_table(results, ['count', 'errors', 'rate_limited', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms'])
+    write_results(args.output, 'servers', results, workers=args.workers, concurrency=args.concurrency,
+                  background=args.background,
+                  requests_per_route=args.requests, upstream_latency_ms=args.latency_ms, upstream=fakes.stats())
+    fakes.stop()
+    return 1 if failed_routes(results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+TXT encoding detection check on the fixture texts (benchmarks/fixtures/encodings)
+
+    python -m benchmarks.encodings --output bench_results/encodings.json
+
+Every fixture is encoded with its legacy codec and passed to sniff_encoding(); the check
+exits with status 1 when a detected encoding differs from the fixture's expected one
+(e.g. German Windows-1252 text taken for Windows-1256 Arabic).
+"""
+import os
+import sys
+import glob
+import json
+import argparse
+
+from benchmarks.micro import bench
+from benchmarks.results import write_results, print_table
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'encodings')
+
+
+def load_fixtures(directory=FIXTURES_DIR):
+    """{name: fixture dict} for every *.json fixture"""
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            fixtures[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+    return fixtures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='bench_results/encodings.json')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds per timing run')
+    args = parser.parse_args(argv)
+
+    from services.book_extraction import sniff_encoding
+
+    results, wrong = {}, []
+    for name, fixture in load_fixtures().items():
+        sample = fixture['text'].encode(fixture['encoding'])
+        detected = sniff_encoding(sample)
+        if detected != fixture['expected']:
+            wrong.append(f"{name}: expected {fixture['expected']}, detected {detected}")
+        results[name] = {
+            'encoding': fixture['encoding'],
+            'expected': fixture['expected'],
+            'detected': detected,
+            'sniff_ms': bench(lambda: sniff_encoding(sample), min_time=args.min_time)['mean_ms'],
+        }
+
+    print_table(results, ['encoding', 'expected', 'detected', 'sniff_ms'])
+    write_results(args.output, 'encodings', results)
+    for item in wrong:
+        print(f"Wrong encoding detected: {item}")
+    return 1 if wrong else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
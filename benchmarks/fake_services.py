@@ -0,0 +1,254 @@
+"""
+Local stand-ins for Groq (OpenAI-compatible), AssemblyAI and the YouTube Data API
+
+Each fake runs a ThreadingHTTPServer on localhost and can inject latency and errors:
+
+    fakes = FakeServices(latency_ms=200, jitter_ms=50, error_rate=0.01)
+    fakes.start()
+    fakes.configure_environment()  # GROQ_BASE_URL, ASSEMBLYAI_BASE_URL, YOUTUBE_API_ENDPOINT
+    ...
+    fakes.stop()
+"""
+import json
+import time
+import uuid
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+FAKE_TRANSCRIPT = (
+    "Um, okay so let's get started. Today we are reviewing the quarterly roadmap. "
+    "Sarah will own the onboarding redesign and deliver the mockups by Friday. "
+    "We decided to postpone the billing migration until the next quarter. "
+    "Next step is to schedule a follow up with the data team to review the metrics. "
+) * 20
+
+FAKE_SUMMARY = """📝 1. Summary
+
+The team reviewed the quarterly roadmap.
+Ownership of the onboarding redesign was assigned.
+
+
+🔑 2. Key Points Discussed
+
+2.1 Onboarding redesign mockups are due Friday
+
+2.2 Billing migration is postponed
+
+
+✅ 3. Action Items
+
+3.1 Sarah delivers the onboarding mockups by Friday
+
+
+💡 4. Decisions Made
+
+4.1 Postpone the billing migration to next quarter
+
+
+⏭️ 5. Next Steps
+
+5.1 Schedule a follow up with the data team"""
+
+FAKE_SRT = "".join(
+    f"{i}\n00:00:{i:02d},000 --> 00:00:{i + 1:02d},000\nThis is caption line number {i} of the fake video.\n\n"
+    for i in range(1, 59)
+)
+
+
+class FaultInjector:
+    """Latency and error injection shared by all fake handlers"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def delay(self):
+        with self._lock:
+            self.requests += 1
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000.0)
+
+    def should_fail(self):
+        with self._lock:
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return failed
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real APIs
+    injector = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _send(self, status, payload, content_type='application/json'):
+        data = payload if isinstance(payload, bytes) else (
+            json.dumps(payload) if content_type == 'application/json' else payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeGroqHandler(_FakeHandler):
+    """POST /openai/v1/chat/completions"""
+
+    def do_POST(self):
+        body = json.loads(self._body() or b'{}')
+        self.injector.delay()
+        if self.injector.should_fail():
+            self._send(429, {'error': {'message': 'Rate limit reached for model. Please try again in 1m0s.',
+                                       'type': 'tokens', 'code': 'rate_limit_exceeded'}})
+            return
+        if not self.path.endswith('/chat/completions'):
+            self._send(404, {'error': {'message': 'not found'}})
+            return
+
+        prompt_chars = sum(len(m.get('content') or '') for m in body.get('messages', []))
+        system = (body.get('messages') or [{}])[0].get('content') or ''
+        content = FAKE_SUMMARY if 'notes' in system or 'summar' in system or 'analyz' in system else \
+            "Here is a short answer from the fake model."
+        self._send(200, {
+            'id': f'chatcmpl-{uuid.uuid4().hex[:12]}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_chars // 4, 'completion_tokens': len(content) // 4,
+                      'total_tokens': (prompt_chars + len(content)) // 4}
+        })
+
+
+class FakeAssemblyAIHandler(_FakeHandler):
+    """POST /v2/upload, POST /v2/transcript, GET /v2/transcript/<id> (completes on first poll)"""
+
+    def do_POST(self):
+        self._body()
+        self.injector.delay()
+        if self.injector.should_fail():
+            self._send(429, {'error': 'Too many requests: rate limit exceeded'})
+            return
+        if self.path == '/v2/upload':
+            self._send(200, {'upload_url': f'https://cdn.fake.local/{uuid.uuid4().hex}'})
+        elif self.path == '/v2/transcript':
+            self._send(200, {'id': uuid.uuid4().hex, 'status': 'queued', 'audio_url': 'https://cdn.fake.local/x'})
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_GET(self):
+        self.injector.delay()
+        if self.path.startswith('/v2/transcript/'):
+            transcript_id = self.path.rsplit('/', 1)[1]
+            self._send(200, {'id': transcript_id, 'status': 'completed', 'text': FAKE_TRANSCRIPT,
+                             'audio_url': 'https://cdn.fake.local/x', 'language_code': 'en'})
+        else:
+            self._send(404, {'error': 'not found'})
+
+
+class FakeYouTubeHandler(_FakeHandler):
+    """YouTube Data API v3: GET /youtube/v3/captions (list) and /youtube/v3/captions/<id> (download)"""
+
+    def do_GET(self):
+        self.injector.delay()
+        if self.injector.should_fail():
+            self._send(403, {'error': {'code': 403, 'message': 'quotaExceeded', 'errors': [{'reason': 'quotaExceeded'}]}})
+            return
+        parsed = urlparse(self.path)
+        if parsed.path == '/youtube/v3/captions':
+            video_id = parse_qs(parsed.query).get('videoId', [''])[0]
+            self._send(200, {'kind': 'youtube#captionListResponse', 'items': [
+                {'id': f'cap-{video_id}', 'snippet': {'language': 'en', 'videoId': video_id}}
+            ]})
+        elif parsed.path.startswith('/youtube/v3/captions/'):
+            self._send(200, FAKE_SRT, content_type='text/plain')
+        else:
+            self._send(404, {'error': {'code': 404, 'message': 'not found'}})
+
+
+class FakeServices:
+    """Start/stop all fakes on free localhost ports"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        self.injectors = {
+            'groq': FaultInjector(latency_ms, jitter_ms, error_rate, seed),
+            'assemblyai': FaultInjector(latency_ms, jitter_ms, error_rate, seed),
+            'youtube': FaultInjector(latency_ms, jitter_ms, error_rate, seed),
+        }
+        self._handlers = {'groq': FakeGroqHandler, 'assemblyai': FakeAssemblyAIHandler, 'youtube': FakeYouTubeHandler}
+        self.servers = {}
+
+    def start(self):
+        for name, handler in self._handlers.items():
+            handler_class = type(handler.__name__, (handler,), {'injector': self.injectors[name]})
+            server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name=f'fake-{name}', daemon=True).start()
+            self.servers[name] = server
+        return self
+
+    def url(self, name):
+        host, port = self.servers[name].server_address
+        return f'http://{host}:{port}'
+
+    def configure_environment(self, environ=None):
+        """Point the app's upstream clients at the fakes (call before importing app)"""
+        import os
+        environ = os.environ if environ is None else environ
+        environ['GROQ_API_KEY'] = environ.get('GROQ_API_KEY') or 'fake-groq-key'
+        environ['ASSEMBLYAI_API_KEY'] = environ.get('ASSEMBLYAI_API_KEY') or 'fake-assemblyai-key'
+        environ['YOUTUBE_API_KEY'] = environ.get('YOUTUBE_API_KEY') or 'fake-youtube-key'
+        environ['GROQ_BASE_URL'] = f"{self.url('groq')}/openai/v1"
+        environ['ASSEMBLYAI_BASE_URL'] = self.url('assemblyai')
+        environ['ASSEMBLYAI_POLLING_INTERVAL'] = '0.05'
+        environ['YOUTUBE_API_ENDPOINT'] = self.url('youtube')
+        # Per-user rate limits out of the way, or a route benchmark measures 429s (admission caps stay)
+        for route_class in ('LLM', 'PROCESSING'):
+            environ.setdefault(f'RATE_LIMIT_{route_class}_BURST', '1000000')
+            environ.setdefault(f'RATE_LIMIT_{route_class}_PER_MINUTE', '1000000')
+        return environ
+
+    def stats(self):
+        return {name: {'requests': inj.requests, 'injected_errors': inj.errors} for name, inj in self.injectors.items()}
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+
+
+def main():
+    """Run the fakes standalone and print the environment for a separately started server"""
+    import argparse
+    parser = argparse.ArgumentParser(description='Run fake Groq/AssemblyAI/YouTube services')
+    parser.add_argument('--latency-ms', type=float, default=100)
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    fakes = FakeServices(args.latency_ms, args.jitter_ms, args.error_rate).start()
+    for key, value in sorted(fakes.configure_environment({}).items()):
+        print(f'export {key}={value}')
+    print('# Fakes running; Ctrl+C to stop', flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fakes.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Cold-start import time of the app (`python -X importtime`) with a budget check
+
+    python -m benchmarks.import_time                      # app, budget from import_budget.json
+    python -m benchmarks.import_time --module asgi --runs 7 --output bench_results/import.json
+
+Each run imports the module in a fresh interpreter. The median cumulative import time
+of the module is compared with its budget, and the heavy SDKs/extractors listed as
+`forbidden` must not be imported at all (they load lazily on first use, see
+services/registry.py). Exits 1 when the budget is exceeded or a forbidden module shows up.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+from benchmarks.results import write_results, print_table
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'import_budget.json')
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output
+
+    Returns:
+        list: (module name, self µs, cumulative µs, depth) in import order
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(module, env):
+    """Import `module` in a fresh interpreter, return the parsed importtime rows"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+    return parse_importtime(result.stderr)
+
+
+def heaviest_packages(rows, module, limit=10):
+    """Top-level packages imported (directly or not) by `module`, by cumulative time"""
+    totals = {}
+    for name, _self_us, cumulative_us, depth in rows:
+        root = name.split('.')[0]
+        if root == module:
+            continue
+        # Count each root package once, at its shallowest (outermost) import
+        if root not in totals or depth < totals[root][1]:
+            totals[root] = (cumulative_us, depth)
+    ranked = sorted(totals.items(), key=lambda kv: -kv[1][0])[:limit]
+    return [(name, round(us / 1000.0, 1)) for name, (us, _depth) in ranked]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, help='Override the budget from import_budget.json')
+    parser.add_argument('--output', default='bench_results/import.json')
+    args = parser.parse_args(argv)
+
+    with open(BUDGET_FILE) as f:
+        budget = json.load(f).get(args.module, {})
+    budget_ms = args.budget_ms or budget.get('max_ms')
+    forbidden = budget.get('forbidden', [])
+
+    env = os.environ.copy()
+    env.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'import.db'))
+    env.setdefault('METRICS_DIR', tempfile.mkdtemp())
+    env.setdefault('DB_SCHEMA_MODE', 'none')  # Measure imports, not schema setup
+
+    timings = []
+    rows = []
+    for _ in range(args.runs):
+        rows = measure(args.module, env)
+        own = [cumulative for name, _s, cumulative, _d in rows if name == args.module]
+        timings.append(own[-1] / 1000.0 if own else 0.0)
+
+    imported = {name.split('.')[0] for name, *_ in rows}
+    leaked = sorted(m for m in forbidden if m in imported)
+    result = {
+        'import_p50_ms': round(median(timings), 1),
+        'import_min_ms': round(min(timings), 1),
+        'modules': len(rows),
+        'budget_ms': budget_ms,
+        'forbidden_imported': leaked,
+    }
+
+    print_table({args.module: result}, ['import_p50_ms', 'import_min_ms', 'modules', 'budget_ms'])
+    print('\nHeaviest packages (cumulative ms, last run):')
+    for name, ms in heaviest_packages(rows, args.module):
+        print(f'  {name:<28} {ms:>8}')
+    write_results(args.output, 'import_time', {args.module: result}, runs=args.runs)
+
+    failed = False
+    if budget_ms and result['import_p50_ms'] > budget_ms:
+        print(f"\nFAIL: import {args.module} took {result['import_p50_ms']} ms (budget {budget_ms} ms)")
+        failed = True
+    if leaked:
+        print(f"\nFAIL: imported at startup but should load lazily: {', '.join(leaked)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+End-to-end load test of every route against fake upstream services
+
+Runs the Flask app in-process (threaded werkzeug server) with Groq, AssemblyAI and the
+YouTube Data API replaced by local fakes, then fires N requests per route at a fixed
+concurrency and reports throughput and p50/p95/p99 latency. Per-user rate limits are
+raised out of the way (FakeServices.configure_environment), and the run exits with status 1
+when a route answers 429, or anything but 2xx without --error-rate, so error responses are
+never reported as route latency.
+
+    python -m benchmarks.load_routes --concurrency 8 --requests 80 --latency-ms 150 \\
+        --output bench_results/routes.json
+
+To load-test a separately started server (gunicorn, uvicorn, ...), start the fakes with
+`python -m benchmarks.fake_services`, launch the server with the printed environment and
+pass --target http://127.0.0.1:PORT --email ... --password ... (an existing account).
+"""
+import io
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.fake_services import FakeServices
+from benchmarks.results import latency_summary, write_results, print_table
+
+YOUTUBE_URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+
+
+def _audio_payload():
+    # Content is irrelevant to the fake transcriber; an ID3 header keeps format probes happy
+    return b'ID3\x04\x00\x00\x00\x00\x00\x00' + os.urandom(32 * 1024)
+
+
+def _book_payload():
+    return ("The Fake Book\n\n" + "Chapter text about productivity and focus. " * 2000).encode('utf-8')
+
+
+def _upload_name(extension):
+    # Stored names are '<unix second>_<upload name>': a name shared by concurrent uploads would
+    # have one request overwrite the file another one is still transcribing
+    return f'bench-{uuid.uuid4().hex[:12]}.{extension}'
+
+
+SCENARIOS = {
+    'upload_audio': lambda s, base: s.post(f'{base}/upload', files={'audio': (_upload_name('mp3'), io.BytesIO(_audio_payload()), 'audio/mpeg')}),
+    'upload_book': lambda s, base: s.post(f'{base}/books/upload', files={'book': (_upload_name('txt'), io.BytesIO(_book_payload()), 'text/plain')}),
+    'youtube': lambda s, base: s.post(f'{base}/videos/process', json={'video_url': YOUTUBE_URL}),
+    'chat': lambda s, base: s.post(f'{base}/api/chat', json={'message': f'What were the action items? #{random.random()}'}),
+    'translate': lambda s, base: s.post(f'{base}/api/translate', json={'text': 'Hello team, the meeting starts at ten.', 'language': 'Spanish'}),
+    'list_meetings': lambda s, base: s.get(f'{base}/api/meetings'),
+    'get_meeting': lambda s, base: s.get(f'{base}/api/meeting/{s.meeting_id}'),
+}
+
+
+def _start_inprocess_app(fakes):
+    """Import the app against the fakes and serve it on a free port"""
+    fakes.configure_environment()
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+    os.environ.setdefault('METRICS_DIR', tempfile.mkdtemp())
+
+    import logging
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # No access log per request
+    from app import app, db
+    from models.user import User
+
+    app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
+    with app.app_context():
+        db.create_all()
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='bench-app', daemon=True).start()
+    host, port = server.server_address
+
+    def create_user(email, password):
+        with app.app_context():
+            if not User.query.filter_by(email=email).first():
+                user = User(email=email)
+                user.set_password(password)
+                db.session.add(user)
+                db.session.commit()
+
+    return f'http://{host}:{port}', server, create_user
+
+
+def _login(base, email, password):
+    session = requests.Session()
+    response = session.post(f'{base}/api/login', json={'email': email, 'password': password})
+    if not response.ok or not response.json().get('success'):
+        raise RuntimeError(f'Login failed for {email}: {response.text[:200]}')
+    return session
+
+
+def run_scenario(name, base, sessions, total, concurrency):
+    """Fire `total` requests of one scenario at `concurrency`, return stats"""
+    scenario = SCENARIOS[name]
+    latencies = []
+    errors = 0
+    rate_limited = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors, rate_limited
+        session = sessions[i % len(sessions)]
+        started = time.perf_counter()
+        status = None
+        try:
+            status = scenario(session, base).status_code
+        except requests.RequestException:
+            pass
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if status is None or not 200 <= status < 300:
+                errors += 1
+            if status == 429:
+                rate_limited += 1
+
+    wall_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - wall_started
+
+    stats = latency_summary(latencies)
+    stats['errors'] = errors
+    stats['rate_limited'] = rate_limited
+    stats['throughput_rps'] = round(total / wall, 3) if wall else None
+    stats['wall_s'] = round(wall, 3)
+    return stats
+
+
+def failed_routes(results, error_rate=0.0):
+    """
+    Names of the routes whose stats include 429s, or any non-2xx response when no upstream
+    errors were injected (injected errors fail requests on purpose); each one is printed
+    """
+    failed = [name for name, stats in results.items()
+              if stats['rate_limited'] or (stats['errors'] and not error_rate)]
+    for name in failed:
+        print(f"Route {name}: {results[name]['errors']} non-2xx responses "
+              f"({results[name]['rate_limited']} rate limited), its latency is not the route's")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=40, help='Requests per route')
+    parser.add_argument('--latency-ms', type=float, default=100, help='Injected upstream latency')
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of upstream calls that fail (0-1)')
+    parser.add_argument('--routes', default=','.join(SCENARIOS), help='Comma-separated scenario names')
+    parser.add_argument('--target', help='Base URL of an already running server (skips the in-process app)')
+    parser.add_argument('--email', default='bench@noteflow.local')
+    parser.add_argument('--password', default='bench-password')
+    parser.add_argument('--output', default='bench_results/routes.json')
+    args = parser.parse_args(argv)
+
+    fakes = None
+    if args.target:
+        base = args.target.rstrip('/')
+        create_user = None
+    else:
+        fakes = FakeServices(args.latency_ms, args.jitter_ms, args.error_rate, seed=42).start()
+        base, _server, create_user = _start_inprocess_app(fakes)
+
+    # One logged-in session per concurrent client (separate users -> realistic per-user work)
+    sessions = []
+    for i in range(args.concurrency):
+        email = args.email if args.target else f'bench{i}@noteflow.local'
+        if create_user:
+            create_user(email, args.password)
+        sessions.append(_login(base, email, args.password))
+
+    routes = [n.strip() for n in args.routes.split(',') if n.strip()]
+
+    # Seed one meeting per session so read routes have data
+    for session in sessions if 'get_meeting' in routes else []:
+        session.meeting_id = None
+        for _ in range(5):  # Injected upstream errors may fail the seed upload
+            session.meeting_id = SCENARIOS['upload_audio'](session, base).json().get('meeting_id')
+            if session.meeting_id:
+                break
+
+    results = {}
+    for name in routes:
+        results[name] = run_scenario(name, base, sessions, args.requests, args.concurrency)
+
+    print_table(results, ['count', 'errors', 'rate_limited', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms'])
+    write_results(args.output, 'routes', results,
+                  concurrency=args.concurrency, requests_per_route=args.requests,
+                  upstream_latency_ms=args.latency_ms, upstream_error_rate=args.error_rate,
+                  target=args.target or 'in-process', upstream=fakes.stats() if fakes else None)
+    if fakes:
+        fakes.stop()
+
+    return 1 if failed_routes(results, args.error_rate) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
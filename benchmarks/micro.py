@@ -0,0 +1,240 @@
+"""
+Microbenchmarks for CPU-bound helpers: book extraction, subtitle parsing, summary cleanup
+and the model to_dict serializers
+
+    python -m benchmarks.micro --output bench_results/micro.json [--filter epub]
+
+Fixture files (PDF, EPUB, DOCX, TXT, VTT, SRT, JSON3) are generated in a temp directory,
+so the run needs no network and no sample data.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime
+
+os.environ.setdefault('GROQ_API_KEY', 'fake-groq-key')  # summarization builds its client at import
+
+from benchmarks.results import latency_summary, write_results, print_table
+
+PARAGRAPH = ("Deep work is the ability to focus without distraction on a cognitively demanding task. "
+             "It is a skill that allows you to quickly master complicated information and produce better results. ")
+
+
+# ---------- fixture generation ----------
+
+def make_txt(path, paragraphs=4000):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(paragraphs):
+            f.write(f"{PARAGRAPH} ({i})\n\n")
+
+
+def make_docx(path, paragraphs=2000, table_rows=50):
+    from docx import Document
+    doc = Document()
+    doc.add_heading('Benchmark Book', 0)
+    for i in range(paragraphs):
+        if i % 200 == 0:
+            doc.add_heading(f'Chapter {i // 200 + 1}', 1)
+        doc.add_paragraph(f"{PARAGRAPH} ({i})")
+    table = doc.add_table(rows=table_rows, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f'cell {r}.{c}'
+    doc.save(path)
+
+
+def make_epub(path, chapters=30, paragraphs_per_chapter=60):
+    from ebooklib import epub
+    book = epub.EpubBook()
+    book.set_identifier('bench-book')
+    book.set_title('Benchmark Book')
+    book.set_language('en')
+    book.add_author('Bench Author')
+    items = []
+    for i in range(chapters):
+        chapter = epub.EpubHtml(title=f'Chapter {i + 1}', file_name=f'chap_{i + 1}.xhtml', lang='en')
+        body = ''.join(f'<p>{PARAGRAPH} <b>({j})</b></p>' for j in range(paragraphs_per_chapter))
+        chapter.content = f'<html><body><h1>Chapter {i + 1}</h1>{body}</body></html>'
+        book.add_item(chapter)
+        items.append(chapter)
+    book.toc = items
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    book.spine = ['nav'] + items
+    epub.write_epub(path, book)
+
+
+def make_pdf(path, pages=100, lines_per_page=40):
+    """Minimal text PDF (Helvetica, one content stream per page) without extra dependencies"""
+    objects = []  # object bodies, 1-based ids
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(None)
+    pages_id = add(None)
+    font_id = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    page_ids = []
+    line = PARAGRAPH[:90].replace('(', '').replace(')', '')
+    for p in range(pages):
+        text = b''.join(f'({line} {p}.{i}) Tj T* '.encode('latin-1') for i in range(lines_per_page))
+        stream = b'BT /F1 9 Tf 11 TL 40 800 Td ' + text + b'ET'
+        content_id = add(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        page_ids.append(add(b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] '
+                            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>' % (pages_id, font_id, content_id)))
+    objects[catalog_id - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id
+    kids = b' '.join(b'%d 0 R' % pid for pid in page_ids)
+    objects[pages_id - 1] = b'<< /Type /Pages /Kids [' + kids + b'] /Count %d >>' % len(page_ids)
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % i + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % off for off in offsets)
+    out += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, catalog_id, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def make_vtt(path, cues=1500):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('WEBVTT\nKind: captions\nLanguage: en\n\n')
+        for i in range(cues):
+            s = i * 2
+            f.write(f'00:{s // 60 % 60:02d}:{s % 60:02d}.000 --> 00:{(s + 2) // 60 % 60:02d}:{(s + 2) % 60:02d}.000 align:start position:0%\n')
+            f.write(f'this is<00:00:00.199><c> caption</c><00:00:00.400><c> number</c> {i}\n\n')
+
+
+def make_srt(path, cues=1500):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(cues):
+            s = i * 2
+            f.write(f'{i + 1}\n00:{s // 60 % 60:02d}:{s % 60:02d},000 --> 00:{(s + 2) // 60 % 60:02d}:{(s + 2) % 60:02d},000\n')
+            f.write(f'This is caption number {i}\n\n')
+
+
+def make_json3(path, cues=1500):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([{'text': f'This is caption number {i}', 'start': i * 2} for i in range(cues)], f)
+
+
+SUMMARY_WITH_EMPTY_SECTIONS = """📝 1. Summary
+
+The team reviewed the roadmap.
+
+
+🔑 2. Key Points Discussed
+
+""" + "\n\n".join(f"2.{i} Key point number {i}" for i in range(1, 30)) + """
+
+
+✅ 3. Action Items
+
+None mentioned in the transcript.
+
+
+💡 4. Decisions Made
+
+None mentioned in the transcript.
+
+
+⏭️ 5. Next Steps
+
+None mentioned in the transcript."""
+
+
+# ---------- runner ----------
+
+def bench(func, min_iterations=5, min_time=1.0, max_iterations=1000):
+    """Run func repeatedly (after one warm-up call) and return per-call latency stats"""
+    func()
+    durations = []
+    started = time.perf_counter()
+    while len(durations) < max_iterations and (len(durations) < min_iterations or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - t0)
+    stats = latency_summary(durations)
+    stats['calls_per_s'] = round(len(durations) / sum(durations), 3) if sum(durations) else None
+    return stats
+
+
+def _python_docx_text(path):
+    from docx import Document
+    return '\n'.join(paragraph.text for paragraph in Document(path).paragraphs)
+
+
+def build_benchmarks(workdir):
+    """Generate fixtures and return {name: zero-arg callable}"""
+    from services.book_extraction import extract_text_from_book
+    from services.video_extraction import _parse_subtitle_file
+    from services.summarization import _remove_empty_sections
+    from models.meeting import Meeting, Book, Video, Conversation, ChatMessage
+
+    paths = {ext: os.path.join(workdir, f'fixture.{ext}') for ext in ('txt', 'docx', 'epub', 'pdf', 'vtt', 'srt', 'json3')}
+    make_txt(paths['txt'])
+    make_docx(paths['docx'])
+    make_epub(paths['epub'])
+    make_pdf(paths['pdf'])
+    make_vtt(paths['vtt'])
+    make_srt(paths['srt'])
+    make_json3(paths['json3'])
+
+    now = datetime.utcnow()
+    long_text = PARAGRAPH * 400
+    meeting = Meeting(id=1, user_id=1, title='Weekly sync', audio_filename='a.mp3', transcript=long_text,
+                      summary=SUMMARY_WITH_EMPTY_SECTIONS, created_at=now, updated_at=now)
+    book = Book(id=1, user_id=1, title='Deep Work', book_filename='b.pdf', file_type='pdf', full_text=long_text,
+                summary=SUMMARY_WITH_EMPTY_SECTIONS, created_at=now, updated_at=now)
+    video = Video(id=1, user_id=1, title='Talk', video_url='https://youtu.be/x', video_id='x', transcript=long_text,
+                  summary=SUMMARY_WITH_EMPTY_SECTIONS, created_at=now, updated_at=now)
+    conversation = Conversation(id=1, user_id=1, title='Chat', created_at=now, updated_at=now)
+    conversation.messages = [ChatMessage(id=i, conversation_id=1, role='user' if i % 2 else 'assistant',
+                                         content=PARAGRAPH, created_at=now) for i in range(50)]
+
+    benchmarks = {
+        f'extract_text_from_book[{ext}]': (lambda ext=ext: extract_text_from_book(paths[ext], ext))
+        for ext in ('txt', 'docx', 'epub', 'pdf')
+    }
+    # The python-docx DOM path extract_text_from_docx replaced, for comparison (paragraphs only, no tables)
+    benchmarks['python-docx reference[docx]'] = lambda: _python_docx_text(paths['docx'])
+    benchmarks.update({
+        f'_parse_subtitle_file[{ext}]': (lambda ext=ext: _parse_subtitle_file(paths[ext]))
+        for ext in ('vtt', 'srt', 'json3')
+    })
+    benchmarks['_remove_empty_sections'] = lambda: _remove_empty_sections(SUMMARY_WITH_EMPTY_SECTIONS)
+    benchmarks['Meeting.to_dict'] = meeting.to_dict
+    benchmarks['Book.to_dict'] = book.to_dict
+    benchmarks['Video.to_dict'] = video.to_dict
+    benchmarks['Conversation.to_dict[50 messages]'] = conversation.to_dict
+    return benchmarks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this string')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds per benchmark')
+    parser.add_argument('--output', default='bench_results/micro.json')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {}
+        for name, func in build_benchmarks(workdir).items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = bench(func, min_time=args.min_time)
+
+    print_table(results, ['count', 'mean_ms', 'p50_ms', 'p95_ms', 'calls_per_s'])
+    write_results(args.output, 'micro', results, min_time_s=args.min_time)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
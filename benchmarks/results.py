@@ -0,0 +1,76 @@
+"""
+Shared helpers for benchmark statistics and machine-readable result files
+"""
+import os
+import sys
+import json
+import platform
+import subprocess
+from datetime import datetime
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def latency_summary(latencies_s):
+    """p50/p95/p99/mean/min/max in milliseconds for a list of durations in seconds"""
+    values = sorted(v * 1000.0 for v in latencies_s)
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values), 3),
+        'min_ms': round(values[0], 3),
+        'p50_ms': round(percentile(values, 50), 3),
+        'p95_ms': round(percentile(values, 95), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+        'max_ms': round(values[-1], 3),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path, suite, results, **meta):
+    """
+    Write results as JSON: {"suite", "meta", "results": {name: {metric: value}}}
+
+    Metrics ending in '_ms' are lower-is-better, '_rps' / '_per_s' are higher-is-better
+    (benchmarks/compare.py relies on this naming).
+    """
+    payload = {
+        'suite': suite,
+        'meta': dict(meta,
+                     timestamp=datetime.utcnow().isoformat(),
+                     git_commit=_git_commit(),
+                     python=sys.version.split()[0],
+                     platform=platform.platform(),
+                     cpu_count=os.cpu_count()),
+        'results': results,
+    }
+    if path:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+    return payload
+
+
+def print_table(results, columns):
+    """Print results as an aligned text table"""
+    header = ['name'] + columns
+    rows = [[name] + [str(metrics.get(col, '')) for col in columns] for name, metrics in results.items()]
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print('  '.join(str(cell).ljust(width) for cell, width in zip(row, widths)))
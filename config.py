@@ -17,14 +17,117 @@ class Config:
     UPLOAD_FOLDER = 'static/uploads'
     MAX_CONTENT_LENGTH = 500 * 1024 * 1024  # 500MB max file size (for video files)
     ALLOWED_EXTENSIONS = {'mp3', 'wav', 'm4a', 'ogg', 'flac', 'webm', 'opus'}
+    # Audio uploads above this are rejected before they are saved (a 2h speech recording at 24 kbps is ~22 MB)
+    MAX_AUDIO_UPLOAD_MB = int(os.environ.get('MAX_AUDIO_UPLOAD_MB', 200))
     ALLOWED_BOOK_EXTENSIONS = {'pdf', 'epub', 'txt', 'docx', 'doc'}
     ALLOWED_VIDEO_EXTENSIONS = {'mp4', 'mov', 'avi', 'mkv', 'webm', 'flv', 'm4v'}
 
+    # Bulk batch processing (/api/batch)
+    BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', 2))  # Worker threads per process
+    BATCH_MAX_PER_USER = int(os.environ.get('BATCH_MAX_PER_USER', 1))  # Concurrent items per user
+    BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 100))
+    BATCH_POLL_INTERVAL = float(os.environ.get('BATCH_POLL_INTERVAL', 10))  # Idle workers recheck the queue table
+    BATCH_LEASE_SECONDS = int(os.environ.get('BATCH_LEASE_SECONDS', 120))  # Claims older than this are requeued
+
+    # Request time budgets by route class (utils/deadlines.py): reads vs. uploads/processing
+    REQUEST_TIMEOUT_READ = int(os.environ.get('REQUEST_TIMEOUT_READ', 30))
+    REQUEST_TIMEOUT_PROCESSING = int(os.environ.get('REQUEST_TIMEOUT_PROCESSING', 300))
+
+    # Rate limiting and admission control (utils/rate_limit.py). Token buckets (shared by all
+    # workers through the database): LLM requests (chat, translate) per user, and per IP for
+    # anonymous requests; processing requests (uploads, videos, batches) per user
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_LLM_PER_MINUTE = float(os.environ.get('RATE_LIMIT_LLM_PER_MINUTE', 20))
+    RATE_LIMIT_LLM_BURST = int(os.environ.get('RATE_LIMIT_LLM_BURST', 20))
+    RATE_LIMIT_ANONYMOUS_PER_MINUTE = float(os.environ.get('RATE_LIMIT_ANONYMOUS_PER_MINUTE', 5))
+    RATE_LIMIT_ANONYMOUS_BURST = int(os.environ.get('RATE_LIMIT_ANONYMOUS_BURST', 5))
+    RATE_LIMIT_PROCESSING_PER_MINUTE = float(os.environ.get('RATE_LIMIT_PROCESSING_PER_MINUTE', 2))
+    RATE_LIMIT_PROCESSING_BURST = int(os.environ.get('RATE_LIMIT_PROCESSING_BURST', 10))
+    # Concurrent requests per worker process by route class, and processing requests per user;
+    # requests over a cap wait up to ADMISSION_QUEUE_TIMEOUT seconds (at most ADMISSION_MAX_QUEUE waiting)
+    ADMISSION_LLM_CONCURRENCY = int(os.environ.get('ADMISSION_LLM_CONCURRENCY', 16))
+    ADMISSION_PROCESSING_CONCURRENCY = int(os.environ.get('ADMISSION_PROCESSING_CONCURRENCY', 8))
+    ADMISSION_PROCESSING_PER_USER = int(os.environ.get('ADMISSION_PROCESSING_PER_USER', 2))
+    ADMISSION_MAX_QUEUE = int(os.environ.get('ADMISSION_MAX_QUEUE', 16))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 2))
+    # Reverse proxies in front of the app whose X-Forwarded-For entry is trusted (Render has one)
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 1 if os.environ.get('RENDER') else 0))
+
+    # ASGI entry point (asgi.py): threads serving the Flask (sync) routes in each worker
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 10))
+
+    # Metrics: set METRICS_TOKEN to require 'Authorization: Bearer <token>' on /metrics
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # Admin endpoints (/admin/*): comma-separated list of emails
+    ADMIN_EMAILS = {e.strip().lower() for e in os.environ.get('ADMIN_EMAILS', '').split(',') if e.strip()}
+
+    # Request profiling: send 'X-Profile: <PROFILING_TOKEN>' or set a sampling rate (0.0 - 1.0)
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN')
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0.0))
+    PROFILING_INTERVAL_MS = float(os.environ.get('PROFILING_INTERVAL_MS', 5))
+    PROFILING_DIR = os.environ.get('PROFILING_DIR', 'instance/profiles')
+
     # API Keys
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
     ASSEMBLYAI_API_KEY = os.environ.get('ASSEMBLYAI_API_KEY')
     GROQ_API_KEY = os.environ.get('GROQ_API_KEY')
 
+    # Upstream endpoints (override to point at local fakes, e.g. benchmarks/fake_services.py)
+    GROQ_BASE_URL = os.environ.get('GROQ_BASE_URL', 'https://api.groq.com/openai/v1')
+    ASSEMBLYAI_BASE_URL = os.environ.get('ASSEMBLYAI_BASE_URL')  # None = SDK default
+    ASSEMBLYAI_POLLING_INTERVAL = float(os.environ.get('ASSEMBLYAI_POLLING_INTERVAL', 3.0))
+
+    # Shared upstream HTTP clients (services/http_clients.py): connections per upstream and
+    # process, idle keep-alive connections kept open and for how long; HTTP/2 needs the h2 package
+    HTTP_POOL_MAX_CONNECTIONS = int(os.environ.get('HTTP_POOL_MAX_CONNECTIONS', 20))
+    HTTP_POOL_MAX_KEEPALIVE = int(os.environ.get('HTTP_POOL_MAX_KEEPALIVE', 10))
+    HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('HTTP_KEEPALIVE_EXPIRY', 60))
+    HTTP2_ENABLED = os.environ.get('HTTP2_ENABLED', 'true').lower() == 'true'
+
+    # yt-dlp extraction results per YouTube video (services/youtube_session.py), shared by the
+    # subtitle and audio fallbacks; media URLs in them expire after a few hours
+    YOUTUBE_INFO_CACHE_SIZE = int(os.environ.get('YOUTUBE_INFO_CACHE_SIZE', 64))
+    YOUTUBE_INFO_CACHE_TTL = int(os.environ.get('YOUTUBE_INFO_CACHE_TTL', 900))
+
+    # Live transcription of browser recordings (services/live_transcription.py): assemblyai, fake or off
+    LIVE_TRANSCRIPTION_BACKEND = os.environ.get('LIVE_TRANSCRIPTION_BACKEND', 'assemblyai').lower()
+    LIVE_MAX_MINUTES = int(os.environ.get('LIVE_MAX_MINUTES', 180))  # Longest live recording
+    LIVE_IDLE_TIMEOUT = int(os.environ.get('LIVE_IDLE_TIMEOUT', 60))  # Seconds without audio before a session expires
+    LIVE_FINISH_TIMEOUT = int(os.environ.get('LIVE_FINISH_TIMEOUT', 30))  # Wait for the final transcript before batch fallback
+    LIVE_SESSION_MAX_AGE = int(os.environ.get('LIVE_SESSION_MAX_AGE', 86400))  # Abandoned session files are deleted after this
+
+    # Incremental summary of live recordings (services/incremental_summary.py): transcript characters
+    # per summarized section (~7 minutes of speech) and the notes size above which old notes are condensed
+    INCREMENTAL_SECTION_CHARS = int(os.environ.get('INCREMENTAL_SECTION_CHARS', 6000))
+    INCREMENTAL_NOTES_MAX_CHARS = int(os.environ.get('INCREMENTAL_NOTES_MAX_CHARS', 12000))
+
+    # Transcript compaction before summarization (services/transcript_compaction.py): filler words
+    # removed anywhere, filler phrases where set off by commas, repeated phrases up to N words
+    TRANSCRIPT_COMPACTION = os.environ.get('TRANSCRIPT_COMPACTION', 'true').lower() == 'true'
+    TRANSCRIPT_FILLERS = [w for w in os.environ.get('TRANSCRIPT_FILLERS', 'um,umm,uh,uhh,uhm,erm,hmm,hm').split(',') if w]
+    TRANSCRIPT_FILLER_PHRASES = [p for p in os.environ.get('TRANSCRIPT_FILLER_PHRASES', 'you know,I mean,like').split(',') if p]
+    TRANSCRIPT_MAX_NGRAM = int(os.environ.get('TRANSCRIPT_MAX_NGRAM', 6))
+    # Words that are never collapsed when doubled, because the double is correct grammar
+    TRANSCRIPT_KEEP_DOUBLES = [w for w in os.environ.get('TRANSCRIPT_KEEP_DOUBLES', 'had,that,is').split(',') if w]
+
+    # Segmented translation (services/translation.py): segment size, concurrent requests per
+    # translation, and cached (segment, language) translations per process
+    TRANSLATION_SEGMENT_CHARS = int(os.environ.get('TRANSLATION_SEGMENT_CHARS', 2000))
+    TRANSLATION_MAX_PARALLEL = int(os.environ.get('TRANSLATION_MAX_PARALLEL', 4))
+    TRANSLATION_CACHE_SIZE = int(os.environ.get('TRANSLATION_CACHE_SIZE', 2048))
+
+    # Background pretranslation of new summaries into each user's preferred languages
+    # (services/pretranslation.py): worker threads per process (0 disables) and languages per user
+    PRETRANSLATION_WORKERS = int(os.environ.get('PRETRANSLATION_WORKERS', 2))
+    MAX_PREFERRED_LANGUAGES = int(os.environ.get('MAX_PREFERRED_LANGUAGES', 3))
+
+    # Conversation memory: last N turns are sent verbatim, older turns are folded into a rolling summary
+    CHAT_MEMORY_TURNS = int(os.environ.get('CHAT_MEMORY_TURNS', 6))
+    CHAT_MEMORY_SUMMARY_MAX_CHARS = int(os.environ.get('CHAT_MEMORY_SUMMARY_MAX_CHARS', 2000))
+    # Background threads per process folding old turns into the summary (0: fold inside the request)
+    CHAT_MEMORY_WORKERS = int(os.environ.get('CHAT_MEMORY_WORKERS', 1))
+
     # OAuth Settings
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
@@ -46,7 +149,28 @@ class Config:
 
     SQLALCHEMY_DATABASE_URI = database_url or 'sqlite:///noteflow.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Schema at startup (utils/schema.py): 'create' (db.create_all, local default), 'migrations'
+    # (production default, schema only via `flask init-db`) or 'none' (fast start, no database access)
+    _production = bool(os.environ.get('RENDER')) or os.environ.get('FLASK_ENV') == 'production'
+    DB_SCHEMA_MODE = os.environ.get('DB_SCHEMA_MODE') or ('migrations' if _production else 'create')
+
+    # Connection pool per worker process (utils/db_pool.py); PostgreSQL max_connections must cover
+    # workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW). It can be smaller than the Gunicorn thread count:
+    # connections are released around upstream calls (see gunicorn.conf.py). Pre-ping costs a
+    # round-trip per checkout, so it is off by default: pool_recycle retires connections before
+    # typical 5-minute idle disconnects.
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 5))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 280))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'false').lower() in ('1', 'true', 'yes')
+
     SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,  # Verify connections before using
-        'pool_recycle': 300,    # Recycle connections after 5 minutes
+        'pool_pre_ping': DB_POOL_PRE_PING,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_use_lifo': True,  # Reuse the most recent connection; idle extras age out via pool_recycle
     }
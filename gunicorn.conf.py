@@ -0,0 +1,82 @@
+"""
+Gunicorn configuration for production
+
+    gunicorn wsgi:application -c gunicorn.conf.py
+
+Most request time is spent waiting on Groq, AssemblyAI and YouTube, so workers are
+threaded (gthread) by default: a slow upload or transcription holds one thread, not the
+whole worker. Every setting can be overridden from the environment:
+
+    WEB_CONCURRENCY        worker processes (default 2, memory-bound on small instances)
+    GUNICORN_WORKER_CLASS  gthread (default) or gevent (requires the gevent package)
+    GUNICORN_THREADS       threads per gthread worker (default GUNICORN_THREADS_PER_CPU x CPUs)
+    GUNICORN_WORKER_CONNECTIONS  concurrent greenlets per gevent worker (default 1000)
+
+Threads and the database pool (DB_POOL_SIZE + DB_MAX_OVERFLOW, default 5 + 5 per worker) are
+sized independently on purpose: requests return their connection to the pool while they wait
+on Groq, AssemblyAI or YouTube (utils/db_pool.released_connection), so only the threads
+running queries at that moment need one. A thread that finds the pool empty waits up to
+DB_POOL_TIMEOUT; if noteflow_db_pool_wait_seconds shows visible waits, raise DB_MAX_OVERFLOW
+towards the thread count, keeping workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) below
+PostgreSQL's max_connections. The sizing is printed when the master starts.
+
+Per-route-class time budgets (REQUEST_TIMEOUT_READ / REQUEST_TIMEOUT_PROCESSING) are
+enforced inside the app, see utils/deadlines.py; the worker timeout below is only the
+hard ceiling for a stuck worker.
+"""
+import os
+import multiprocessing
+
+from config import Config
+from utils import metrics
+
+# The master records startup samples while preloading but never runs the metrics flush thread
+metrics.mark_master()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5001')}"
+
+cpu_count = multiprocessing.cpu_count()
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 0)) or min(32, cpu_count * int(os.environ.get('GUNICORN_THREADS_PER_CPU', 8)))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Load the app once in the master and fork it: workers share the imported code (copy-on-write)
+preload_app = True
+
+# Hard ceiling: the longest route class plus a margin for the app's own deadline to fire first
+timeout = Config.REQUEST_TIMEOUT_PROCESSING + 30
+# On deploys/restarts let in-flight processing finish; idle read traffic drains immediately
+graceful_timeout = Config.REQUEST_TIMEOUT_PROCESSING
+keepalive = 5
+
+# Heartbeat files on tmpfs (avoids worker stalls on slow container disks)
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')  # e.g. '-' for stdout; off by default
+
+
+def on_starting(server):
+    """Drop metrics files of the previous run before any worker writes new ones"""
+    metrics.clear_metrics_dir()
+    connections = Config.DB_POOL_SIZE + Config.DB_MAX_OVERFLOW
+    print(f"Gunicorn: {workers} workers x {threads} threads, DB pool {Config.DB_POOL_SIZE}+{Config.DB_MAX_OVERFLOW} "
+          f"per worker (at most {workers * connections} connections)")
+
+
+def post_fork(server, worker):
+    """Connections opened in the master during preload must not be shared with the workers"""
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def when_ready(server):
+    """Publish the samples the master recorded while preloading (startup timing)"""
+    metrics.flush()
+
+
+def child_exit(server, worker):
+    """Keep an exited worker's counters in the retired totals and drop its metrics file"""
+    metrics.retire_worker(worker.pid)
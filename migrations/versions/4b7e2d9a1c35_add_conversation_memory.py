@@ -0,0 +1,35 @@
+"""add_conversation_memory
+
+Revision ID: 4b7e2d9a1c35
+Revises: ee36ccf99364
+Create Date: 2026-10-19 10:12:31.482913
+
+This migration adds:
+1. memory_summary (rolling summary of older chat turns) to conversations
+2. summarized_message_count (how many messages are already folded into it)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2d9a1c35'
+down_revision = 'ee36ccf99364'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database schema"""
+
+    with op.batch_alter_table('conversations') as batch_op:
+        batch_op.add_column(sa.Column('memory_summary', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('summarized_message_count', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    """Downgrade database schema"""
+
+    with op.batch_alter_table('conversations') as batch_op:
+        batch_op.drop_column('summarized_message_count')
+        batch_op.drop_column('memory_summary')
@@ -0,0 +1,43 @@
+"""add_book_chapters
+
+Revision ID: 6c2a9e4f7b18
+Revises: 8d1f5c3e6a27
+Create Date: 2026-10-19 14:36:05.527410
+
+This migration adds:
+1. book_chapters table (chapter title, text and lazily generated summary per book)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c2a9e4f7b18'
+down_revision = '8d1f5c3e6a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database schema"""
+
+    op.create_table(
+        'book_chapters',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('book_id', sa.Integer(), sa.ForeignKey('books.id'), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=300), nullable=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('char_count', sa.Integer(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('summarized_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_book_chapters_book_id', 'book_chapters', ['book_id'], unique=False)
+
+
+def downgrade():
+    """Downgrade database schema"""
+
+    op.drop_index('ix_book_chapters_book_id', table_name='book_chapters')
+    op.drop_table('book_chapters')
@@ -0,0 +1,62 @@
+"""add_batches
+
+Revision ID: 8d1f5c3e6a27
+Revises: 4b7e2d9a1c35
+Create Date: 2026-10-19 11:02:47.105362
+
+This migration adds:
+1. batches table (bulk processing requests)
+2. batch_items table (one row per file/URL with status, content hash and result)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d1f5c3e6a27'
+down_revision = '4b7e2d9a1c35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database schema"""
+
+    op.create_table(
+        'batches',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_batches_user_id', 'batches', ['user_id'], unique=False)
+
+    op.create_table(
+        'batch_items',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('batch_id', sa.Integer(), sa.ForeignKey('batches.id'), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=True),
+        sa.Column('source', sa.String(length=500), nullable=False),
+        sa.Column('stored_filename', sa.String(length=255), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('duplicate_of_id', sa.Integer(), sa.ForeignKey('batch_items.id'), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('result_type', sa.String(length=20), nullable=True),
+        sa.Column('result_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_batch_items_batch_id', 'batch_items', ['batch_id'], unique=False)
+    op.create_index('ix_batch_items_content_hash', 'batch_items', ['content_hash'], unique=False)
+
+
+def downgrade():
+    """Downgrade database schema"""
+
+    op.drop_index('ix_batch_items_content_hash', table_name='batch_items')
+    op.drop_index('ix_batch_items_batch_id', table_name='batch_items')
+    op.drop_table('batch_items')
+    op.drop_index('ix_batches_user_id', table_name='batches')
+    op.drop_table('batches')
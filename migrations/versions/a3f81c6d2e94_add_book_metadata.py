@@ -0,0 +1,41 @@
+"""add_book_metadata
+
+Revision ID: a3f81c6d2e94
+Revises: 6c2a9e4f7b18
+Create Date: 2026-10-19 16:12:41.308215
+
+This migration adds:
+1. author, language and page_count columns to books (read from the file's embedded metadata)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f81c6d2e94'
+down_revision = '6c2a9e4f7b18'
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = (
+    sa.Column('author', sa.String(length=200), nullable=True),
+    sa.Column('language', sa.String(length=35), nullable=True),
+    sa.Column('page_count', sa.Integer(), nullable=True),
+)
+
+
+def upgrade():
+    """Upgrade database schema"""
+
+    with op.batch_alter_table('books') as batch_op:
+        for column in NEW_COLUMNS:
+            batch_op.add_column(column)
+
+
+def downgrade():
+    """Downgrade database schema"""
+
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.drop_column('page_count')
+        batch_op.drop_column('language')
+        batch_op.drop_column('author')
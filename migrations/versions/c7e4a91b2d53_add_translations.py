@@ -0,0 +1,50 @@
+"""add_translations
+
+Revision ID: c7e4a91b2d53
+Revises: a3f81c6d2e94
+Create Date: 2026-10-19 17:05:12.640187
+
+This migration adds:
+1. preferred_languages column to users (summaries are pretranslated into these languages)
+2. translations table (stored translations of meeting/book/video fields)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e4a91b2d53'
+down_revision = 'a3f81c6d2e94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database schema"""
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('preferred_languages', sa.String(length=200), nullable=True))
+
+    op.create_table(
+        'translations',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('content_type', sa.String(length=20), nullable=False),
+        sa.Column('content_id', sa.Integer(), nullable=False),
+        sa.Column('field', sa.String(length=30), nullable=False),
+        sa.Column('language', sa.String(length=35), nullable=False),
+        sa.Column('source_hash', sa.String(length=64), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('content_type', 'content_id', 'field', 'language', name='uq_translations_target'),
+    )
+    op.create_index('ix_translations_source_language', 'translations', ['source_hash', 'language'], unique=False)
+
+
+def downgrade():
+    """Downgrade database schema"""
+
+    op.drop_index('ix_translations_source_language', table_name='translations')
+    op.drop_table('translations')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('preferred_languages')
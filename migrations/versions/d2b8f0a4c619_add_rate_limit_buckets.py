@@ -0,0 +1,37 @@
+"""add_rate_limit_buckets
+
+Revision ID: d2b8f0a4c619
+Revises: c7e4a91b2d53
+Create Date: 2026-10-19 18:21:37.902514
+
+This migration adds:
+1. rate_limit_buckets table (token buckets of the rate limiter, shared by all workers)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b8f0a4c619'
+down_revision = 'c7e4a91b2d53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database schema"""
+
+    op.create_table(
+        'rate_limit_buckets',
+        sa.Column('key', sa.String(length=120), primary_key=True),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.Float(), nullable=False),
+    )
+    op.create_index('ix_rate_limit_buckets_updated_at', 'rate_limit_buckets', ['updated_at'], unique=False)
+
+
+def downgrade():
+    """Downgrade database schema"""
+
+    op.drop_index('ix_rate_limit_buckets_updated_at', table_name='rate_limit_buckets')
+    op.drop_table('rate_limit_buckets')
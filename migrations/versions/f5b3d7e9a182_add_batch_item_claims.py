@@ -0,0 +1,35 @@
+"""add_batch_item_claims
+
+Revision ID: f5b3d7e9a182
+Revises: d2b8f0a4c619
+Create Date: 2026-10-20 09:14:52.318406
+
+This migration adds:
+1. claimed_at column to batch_items (heartbeat of the worker processing an item)
+2. index on batch_items.status (workers claim queued items from the table)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b3d7e9a182'
+down_revision = 'd2b8f0a4c619'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database schema"""
+
+    with op.batch_alter_table('batch_items') as batch_op:
+        batch_op.add_column(sa.Column('claimed_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_batch_items_status', ['status'], unique=False)
+
+
+def downgrade():
+    """Downgrade database schema"""
+
+    with op.batch_alter_table('batch_items') as batch_op:
+        batch_op.drop_index('ix_batch_items_status')
+        batch_op.drop_column('claimed_at')
@@ -1,7 +1,7 @@
 """
 Models package for NoteFlow
 """
-from .meeting import db, Meeting, Book, Video
+from .meeting import db, Meeting, Book, Video, Batch, BatchItem, Translation
 from .user import User
 
-__all__ = ['db', 'User', 'Meeting', 'Book', 'Video']
+__all__ = ['db', 'User', 'Meeting', 'Book', 'Video', 'Batch', 'BatchItem', 'Translation']
@@ -48,6 +48,9 @@ class Book(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=True)
+    author = db.Column(db.String(200), nullable=True)
+    language = db.Column(db.String(35), nullable=True)  # As declared by the file, e.g. 'en-US'
+    page_count = db.Column(db.Integer, nullable=True)  # PDF pages (DOCX: as last saved by Word)
     book_filename = db.Column(db.String(255), nullable=False)
     file_type = db.Column(db.String(10), nullable=False)  # pdf, epub, txt, docx
     full_text = db.Column(db.Text, nullable=False)
@@ -56,15 +59,21 @@ class Book(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Relationship to chapters
+    chapters = db.relationship('BookChapter', backref='book', lazy=True, cascade='all, delete-orphan', order_by='BookChapter.position')
+
     def __repr__(self):
         return f'<Book {self.id}: {self.title or "Untitled"}>'
 
-    def to_dict(self):
+    def to_dict(self, include_chapters=False):
         """Convert book to dictionary"""
-        return {
+        result = {
             'id': self.id,
             'user_id': self.user_id,
             'title': self.title,
+            'author': self.author,
+            'language': self.language,
+            'page_count': self.page_count,
             'book_filename': self.book_filename,
             'file_type': self.file_type,
             'full_text': self.full_text,
@@ -74,6 +83,46 @@ class Book(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+        if include_chapters:
+            result['chapters'] = [chapter.to_dict() for chapter in self.chapters]
+
+        return result
+
+
+class BookChapter(db.Model):
+    """
+    Chapter of a book (PDF outline entry, EPUB table of contents entry, DOCX heading,
+    or a fixed-size part when the book has no structure). The summary is generated
+    on first request and cached here.
+    """
+
+    __tablename__ = 'book_chapters'
+
+    id = db.Column(db.Integer, primary_key=True)
+    book_id = db.Column(db.Integer, db.ForeignKey('books.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(300), nullable=True)
+    text = db.deferred(db.Column(db.Text, nullable=False))  # Loaded only when summarizing
+    char_count = db.Column(db.Integer, nullable=False, default=0)  # Length of the extracted chapter text
+    summary = db.Column(db.Text, nullable=True)  # None until first requested
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    summarized_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<BookChapter {self.id}: {self.title or self.position}>'
+
+    def to_dict(self):
+        """Convert chapter to dictionary (without its text)"""
+        return {
+            'id': self.id,
+            'book_id': self.book_id,
+            'position': self.position,
+            'title': self.title,
+            'char_count': self.char_count,
+            'summary': self.summary,
+            'summarized_at': self.summarized_at.isoformat() if self.summarized_at else None
+        }
+
 
 class Video(db.Model):
     """YouTube video summary model"""
@@ -120,6 +169,8 @@ class Conversation(db.Model):
     title = db.Column(db.String(200), nullable=True)
     context_type = db.Column(db.String(20), nullable=True)  # 'audio', 'video', 'book', or None
     context_id = db.Column(db.Integer, nullable=True)  # ID of related content
+    memory_summary = db.Column(db.Text, nullable=True)  # Rolling summary of turns older than the memory window
+    summarized_message_count = db.Column(db.Integer, nullable=False, default=0)  # Messages folded into memory_summary
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -171,3 +222,139 @@ class ChatMessage(db.Model):
             'content': self.content,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+
+class Batch(db.Model):
+    """Bulk processing request grouping many files/URLs"""
+
+    __tablename__ = 'batches'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationship to items
+    items = db.relationship('BatchItem', backref='batch', lazy=True, cascade='all, delete-orphan', order_by='BatchItem.position')
+
+    def __repr__(self):
+        return f'<Batch {self.id}>'
+
+    def progress(self):
+        """Aggregate item counts by status"""
+        counts = {status: 0 for status in BatchItem.STATUSES}
+        for item in self.items:
+            counts[item.status] = counts.get(item.status, 0) + 1
+        total = len(self.items)
+        finished = counts['done'] + counts['failed']
+        return {
+            'total': total,
+            'finished': finished,
+            'percent': round(100 * finished / total) if total else 100,
+            'counts': counts,
+            'complete': finished == total
+        }
+
+    def to_dict(self, include_items=True):
+        """Convert batch to dictionary"""
+        result = {
+            'id': self.id,
+            'user_id': self.user_id,
+            'progress': self.progress(),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+        if include_items:
+            result['items'] = [item.to_dict() for item in self.items]
+
+        return result
+
+
+class BatchItem(db.Model):
+    """Single file or URL inside a batch"""
+
+    __tablename__ = 'batch_items'
+
+    STATUSES = ('queued', 'processing', 'done', 'failed')
+
+    id = db.Column(db.Integer, primary_key=True)
+    batch_id = db.Column(db.Integer, db.ForeignKey('batches.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(20), nullable=True)  # 'audio', 'video', 'book', 'youtube'
+    source = db.Column(db.String(500), nullable=False)  # Original filename or URL
+    stored_filename = db.Column(db.String(255), nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True, index=True)  # sha256 of file content / video id
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey('batch_items.id'), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)  # Heartbeat of the worker processing the item
+    result_type = db.Column(db.String(20), nullable=True)  # 'meeting', 'book', 'video'
+    result_id = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<BatchItem {self.id}: {self.status}>'
+
+    def to_dict(self):
+        """Convert batch item to dictionary"""
+        return {
+            'id': self.id,
+            'position': self.position,
+            'kind': self.kind,
+            'source': self.source,
+            'status': self.status,
+            'duplicate_of': self.duplicate_of_id,
+            'result_type': self.result_type,
+            'result_id': self.result_id,
+            'error': self.error,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class Translation(db.Model):
+    """Stored translation of a meeting, book or video text field"""
+
+    __tablename__ = 'translations'
+    __table_args__ = (
+        db.UniqueConstraint('content_type', 'content_id', 'field', 'language', name='uq_translations_target'),
+        db.Index('ix_translations_source_language', 'source_hash', 'language'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_type = db.Column(db.String(20), nullable=False)  # 'meeting', 'book', 'video'
+    content_id = db.Column(db.Integer, nullable=False)
+    field = db.Column(db.String(30), nullable=False, default='summary')
+    language = db.Column(db.String(35), nullable=False)  # Normalized name, e.g. 'Arabic'
+    source_hash = db.Column(db.String(64), nullable=False)  # sha256 of the text that was translated
+    text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Translation {self.content_type} {self.content_id} {self.field}: {self.language}>'
+
+    def to_dict(self):
+        """Convert translation to dictionary"""
+        return {
+            'content_type': self.content_type,
+            'content_id': self.content_id,
+            'field': self.field,
+            'language': self.language,
+            'translated_text': self.text,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class RateLimitBucket(db.Model):
+    """Token bucket of the rate limiter (utils/rate_limit.py), shared by all workers"""
+
+    __tablename__ = 'rate_limit_buckets'
+
+    key = db.Column(db.String(120), primary_key=True)  # '<route class>:user:<id>' or '<route class>:ip:<address>'
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False, index=True)  # Unix time the tokens were last counted
+
+    def __repr__(self):
+        return f'<RateLimitBucket {self.key}: {self.tokens:.1f}>'
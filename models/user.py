@@ -20,12 +20,14 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime, nullable=True)
     is_active = db.Column(db.Boolean, default=True)
+    preferred_languages = db.Column(db.String(200), nullable=True)  # Comma-separated, e.g. 'Arabic,English'
 
     # Relationships to user's content
     meetings = db.relationship('Meeting', backref='user', lazy=True, cascade='all, delete-orphan')
     books = db.relationship('Book', backref='user', lazy=True, cascade='all, delete-orphan')
     videos = db.relationship('Video', backref='user', lazy=True, cascade='all, delete-orphan')
     conversations = db.relationship('Conversation', backref='user', lazy=True, cascade='all, delete-orphan')
+    batches = db.relationship('Batch', backref='user', lazy=True, cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<User {self.email}>'
@@ -38,6 +40,11 @@ class User(UserMixin, db.Model):
         """Check if provided password matches hash"""
         return check_password_hash(self.password_hash, password)
 
+    @property
+    def preferred_language_list(self):
+        """Languages new summaries are translated into in the background"""
+        return [language for language in (self.preferred_languages or '').split(',') if language]
+
     def update_last_login(self):
         """Update last login timestamp"""
         self.last_login = datetime.utcnow()
@@ -50,7 +57,8 @@ class User(UserMixin, db.Model):
             'username': self.username,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'last_login': self.last_login.isoformat() if self.last_login else None,
-            'is_active': self.is_active
+            'is_active': self.is_active,
+            'preferred_languages': self.preferred_language_list
         }
 
     # Flask-Login required methods (UserMixin provides most of these)
@@ -0,0 +1,37 @@
+"""
+Admin-only routes (operators listed in ADMIN_EMAILS)
+"""
+from flask import Blueprint, current_app, jsonify, send_file, abort
+from flask_login import login_required, current_user
+from functools import wraps
+from utils.profiling import request_profiler
+
+admin = Blueprint('admin', __name__, url_prefix='/admin')
+
+
+def admin_required(f):
+    """Allow only logged-in users whose email is listed in ADMIN_EMAILS"""
+    @wraps(f)
+    @login_required
+    def decorated_function(*args, **kwargs):
+        if current_user.email.lower() not in current_app.config['ADMIN_EMAILS']:
+            abort(403)
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+@admin.route('/profiles')
+@admin_required
+def list_profiles():
+    """API endpoint to list captured request profiles, newest first"""
+    return jsonify(request_profiler.list_profiles())
+
+
+@admin.route('/profiles/<profile_id>')
+@admin_required
+def download_profile(profile_id):
+    """Download a profile in collapsed-stack format (flamegraph.pl / speedscope)"""
+    path = request_profiler.profile_path(profile_id)
+    if not path:
+        abort(404)
+    return send_file(path, mimetype='text/plain', as_attachment=True, download_name=f'{profile_id}.folded')
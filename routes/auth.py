@@ -1,18 +1,23 @@
 """
 Authentication routes for user signup, login, and logout
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import check_password_hash
 from models.meeting import db
 from models.user import User
+from services.translation import normalize_language
 from email_validator import validate_email, EmailNotValidError
 from authlib.integrations.flask_client import OAuth
 from functools import wraps
 import os
+import re
 
 auth = Blueprint('auth', __name__)
 
+# Language names accepted as preferred languages, e.g. 'Arabic', 'Chinese (Traditional)'
+LANGUAGE_NAME = re.compile(r'^[A-Za-z][A-Za-z ()-]{0,34}$')
+
 # Initialize OAuth
 oauth = OAuth()
 
@@ -120,6 +125,31 @@ def get_profile():
     return jsonify(current_user.to_dict())
 
 
+@auth.route('/api/user/preferences', methods=['PUT'])
+@login_required
+def update_preferences():
+    """API endpoint to set the languages new summaries are pretranslated into"""
+    data = request.get_json(silent=True) or {}
+    languages = data.get('preferred_languages')
+    if not isinstance(languages, list) or not all(isinstance(language, str) for language in languages):
+        return jsonify({'success': False, 'message': 'preferred_languages must be a list of language names'}), 400
+
+    normalized = []
+    for language in languages:
+        language = normalize_language(language)
+        if not LANGUAGE_NAME.match(language):
+            return jsonify({'success': False, 'message': f'Invalid language: {language[:40]}'}), 400
+        if language not in normalized:
+            normalized.append(language)
+    max_languages = current_app.config['MAX_PREFERRED_LANGUAGES']
+    if len(normalized) > max_languages:
+        return jsonify({'success': False, 'message': f'At most {max_languages} preferred languages'}), 400
+
+    current_user.preferred_languages = ','.join(normalized) or None
+    db.session.commit()
+    return jsonify({'success': True, 'user': current_user.to_dict()})
+
+
 @auth.route('/api/login', methods=['POST'])
 def api_login():
     """API endpoint for login via AJAX"""
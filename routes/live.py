@@ -0,0 +1,110 @@
+"""
+Live transcription routes: the browser recorder streams PCM chunks while recording
+
+    POST /api/live                      start a session            {"sample_rate": 16000}
+    POST /api/live/<id>/audio?offset=N  append a chunk (raw 16-bit mono PCM body),
+                                        returns new transcript turns and the current partial
+    POST /api/live/<id>/finish          final transcript + summary, stored as a Meeting
+"""
+from datetime import datetime
+from flask import Blueprint, current_app, jsonify, request
+from flask_login import login_required, current_user
+from services import live_transcription
+from services.processing import process_live_recording
+from utils.rate_limit import rate_limited
+
+live = Blueprint('live', __name__, url_prefix='/api/live')
+
+# Larger chunks than this (seconds of audio) are rejected: the recorder sends ~1 s
+MAX_CHUNK_SECONDS = 10
+
+
+def _own_session(session_id):
+    """State of the current user's live session, or None"""
+    state = live_transcription.read_state(current_app.config['UPLOAD_FOLDER'], session_id)
+    if state is None or state['user_id'] != current_user.id:
+        return None
+    return state
+
+
+@live.route('', methods=['POST'])
+@login_required
+@rate_limited('processing')
+def start_live_session():
+    """Open a live transcription session"""
+    data = request.get_json(silent=True) or {}
+    try:
+        sample_rate = int(data.get('sample_rate', 16000))
+    except (TypeError, ValueError):
+        sample_rate = 0
+    if not 8000 <= sample_rate <= 48000:
+        return jsonify({'success': False, 'message': 'sample_rate must be between 8000 and 48000'}), 400
+
+    try:
+        session_id = live_transcription.start_session(current_app.config['UPLOAD_FOLDER'], current_user.id, sample_rate)
+    except Exception as e:
+        print(f"Could not open a live transcription stream: {e}")
+        return jsonify({'success': False, 'message': 'Live transcription is unavailable right now'}), 503
+    if session_id is None:
+        return jsonify({'success': False, 'message': 'Live transcription is disabled'}), 404
+
+    return jsonify({'success': True, 'session_id': session_id})
+
+
+@live.route('/<session_id>/audio', methods=['POST'])
+@login_required
+def live_audio(session_id):
+    """
+    Append a PCM chunk at `offset` (bytes sent so far). A chunk at the wrong offset gets
+    409 with the offset the server expects, so a retried or lost chunk can be resent.
+    Returns the transcript turns after the client's `turns` count and the current partial.
+    """
+    state = _own_session(session_id)
+    if state is None:
+        return jsonify({'success': False, 'message': 'Live session not found'}), 404
+    if state['status'] != 'streaming':
+        return jsonify({'success': False, 'message': state.get('error') or 'Live session has ended'}), 410
+
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    received = live_transcription.received_bytes(upload_folder, session_id)
+    offset = request.args.get('offset', type=int)
+    if offset != received:
+        return jsonify({'success': False, 'message': 'Unexpected chunk offset', 'received': received}), 409
+
+    bytes_per_second = state['sample_rate'] * live_transcription.SAMPLE_WIDTH
+    pcm = request.get_data(cache=False)
+    if len(pcm) > MAX_CHUNK_SECONDS * bytes_per_second:
+        return jsonify({'success': False, 'message': 'Audio chunk is too large'}), 413
+    if received + len(pcm) > current_app.config['LIVE_MAX_MINUTES'] * 60 * bytes_per_second:
+        return jsonify({'success': False, 'message': 'Recording is too long for live transcription'}), 413
+
+    if pcm:
+        live_transcription.append_audio(upload_folder, session_id, pcm)
+    known_turns = request.args.get('turns', 0, type=int)
+    return jsonify({
+        'success': True,
+        'received': received + len(pcm),
+        'turns': state['turns'][known_turns:],
+        'partial': state['partial']
+    })
+
+
+@live.route('/<session_id>/finish', methods=['POST'])
+@login_required
+def finish_live_session(session_id):
+    """Stop the session, summarize the transcript and store it as a Meeting"""
+    if _own_session(session_id) is None:
+        return jsonify({'success': False, 'message': 'Live session not found'}), 404
+
+    data = request.get_json(silent=True) or {}
+    title = (data.get('title') or '').strip()[:200] or f"Live recording {datetime.utcnow():%Y-%m-%d %H:%M}"
+    try:
+        meeting = process_live_recording(current_app.config['UPLOAD_FOLDER'], session_id, title, current_user.id)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+    return jsonify({
+        'success': True,
+        'meeting_id': meeting.id,
+        'message': 'Audio processed successfully'
+    })
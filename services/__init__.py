@@ -1,7 +1,19 @@
 """
 Services package for NoteFlow
+
+Exports resolve lazily so `import services` doesn't pull in the AI SDKs.
 """
-from .transcription import transcribe_audio
-from .summarization import generate_summary
+import importlib
+
+_EXPORTS = {
+    'transcribe_audio': 'services.transcription',
+    'generate_summary': 'services.summarization',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['transcribe_audio', 'generate_summary']
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'services' has no attribute {name!r}")
@@ -0,0 +1,380 @@
+"""
+Bulk batch processing: bounded worker pool with per-user fairness and deduplication by hash
+
+Items are queued in the batch_items table and claimed by the worker threads of any process.
+"""
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, or_, select, true, update
+from sqlalchemy.orm import aliased
+from models.meeting import db, Batch, BatchItem
+from services.processing import (
+    save_uploaded_file, process_audio_file, process_book_file, process_video_file, process_youtube_url
+)
+from services.video_extraction import extract_video_id
+from utils.video_utils import cleanup_file
+from utils.audio_probe import audio_upload_error
+from utils import metrics
+
+# Queued items read per claim (the oldest first)
+CLAIM_SCAN = 200
+
+
+class BatchScheduler:
+    """
+    Bounded pool of worker threads claiming queued batch items from the database.
+
+    The queue is the batch_items table: a worker claims an item with a conditional UPDATE
+    (queued -> processing), so queued work survives worker restarts and any process can
+    pick it up. Users are served round-robin and each user has at most `max_per_user`
+    items processing at once (checked at claim time, across processes).
+
+    While an item runs, this process refreshes its claimed_at every lease/4 seconds;
+    'processing' items whose claim is older than the lease were left by a dead process and
+    are queued again. Duplicates of an item that finished are resolved at the same time.
+    Threads start on the first submit or request in each process (safe with gunicorn --preload).
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.num_workers = 2
+        self.max_per_user = 1
+        self.poll_interval = 10
+        self.lease = 120
+        self._pid = None
+        self._cond = threading.Condition()
+        self._wakeups = 0  # Bumped by wake(): workers recheck the table instead of sleeping
+        self._active = set()  # Item ids processing in this process
+        self._last_user = None  # Round-robin position
+        self._threads = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Bind the scheduler to the Flask app (workers need an app context)"""
+        self.app = app
+        self.num_workers = max(1, app.config.get('BATCH_WORKERS', 2))
+        self.max_per_user = max(1, app.config.get('BATCH_MAX_PER_USER', 1))
+        self.poll_interval = app.config.get('BATCH_POLL_INTERVAL', 10)
+        self.lease = app.config.get('BATCH_LEASE_SECONDS', 120)
+        app.before_request(self.start)
+        app.extensions['batch_scheduler'] = self
+
+    def start(self):
+        """Start this process's worker and heartbeat threads (once per process)"""
+        if self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._pid == os.getpid():
+                return
+            self._threads = [threading.Thread(target=self._work, name=f'batch-worker-{i}', daemon=True)
+                             for i in range(self.num_workers)]
+            self._threads.append(threading.Thread(target=self._heartbeat, name='batch-heartbeat', daemon=True))
+            for thread in self._threads:
+                thread.start()
+            self._pid = os.getpid()
+
+    def wake(self):
+        """Tell idle workers that new items were queued"""
+        self.start()
+        with self._cond:
+            self._wakeups += 1
+            self._cond.notify_all()
+
+    def _claim(self):
+        """
+        Claim the next queued item round-robin by user, skipping users at their cap
+
+        Returns:
+            int or None: id of the item now 'processing' for this process
+        """
+        candidates = db.session.execute(
+            select(BatchItem.id, Batch.user_id).join(Batch)
+            .where(BatchItem.status == 'queued', BatchItem.duplicate_of_id.is_(None))
+            .order_by(BatchItem.id).limit(CLAIM_SCAN)
+        ).all()
+        if not candidates:
+            db.session.rollback()
+            return None
+
+        running = dict(db.session.execute(
+            select(Batch.user_id, func.count()).select_from(BatchItem).join(Batch)
+            .where(BatchItem.status == 'processing').group_by(Batch.user_id)
+        ).all())
+        items = {}  # user id -> queued item ids, users in order of their oldest item
+        for item_id, user_id in candidates:
+            items.setdefault(user_id, []).append(item_id)
+        users = list(items)
+        if self._last_user in items:
+            start = users.index(self._last_user) + 1
+            users = users[start:] + users[:start]
+
+        for user_id in users:
+            if running.get(user_id, 0) >= self.max_per_user:
+                continue
+            for item_id in items[user_id]:
+                claimed = db.session.execute(
+                    update(BatchItem).where(BatchItem.id == item_id, BatchItem.status == 'queued')
+                    .values(status='processing', claimed_at=datetime.utcnow())
+                ).rowcount
+                db.session.commit()
+                if claimed:
+                    self._last_user = user_id
+                    with self._cond:
+                        self._active.add(item_id)
+                    return item_id
+        db.session.rollback()
+        return None
+
+    def _work(self):
+        """Worker loop"""
+        while True:
+            with self._cond:
+                wakeups = self._wakeups
+            item_id = None
+            try:
+                with self.app.app_context():
+                    item_id = self._claim()
+            except Exception as e:
+                print(f"Batch claim failed: {e}")
+
+            if item_id is None:
+                with self._cond:
+                    if self._wakeups == wakeups:
+                        self._cond.wait(self.poll_interval)
+                continue
+
+            try:
+                with self.app.app_context():
+                    run_batch_item(item_id)
+            except Exception as e:
+                print(f"Batch item {item_id} crashed: {e}")
+            finally:
+                with self._cond:
+                    self._active.discard(item_id)
+                    self._wakeups += 1  # A user slot is free again
+                    self._cond.notify_all()
+
+    def _heartbeat(self):
+        """Keep this process's claims fresh, requeue stale claims and finish orphaned duplicates"""
+        while True:
+            try:
+                with self.app.app_context():
+                    self._refresh_claims()
+            except Exception as e:
+                print(f"Batch heartbeat failed: {e}")
+            time.sleep(max(1, self.lease / 4))
+
+    def _refresh_claims(self):
+        now = datetime.utcnow()
+        with self._cond:
+            active = list(self._active)
+        if active:
+            db.session.execute(update(BatchItem).where(BatchItem.id.in_(active), BatchItem.status == 'processing')
+                               .values(claimed_at=now))
+
+        requeued = db.session.execute(
+            update(BatchItem).where(
+                BatchItem.status == 'processing',
+                BatchItem.id.notin_(active) if active else true(),
+                or_(BatchItem.claimed_at.is_(None), BatchItem.claimed_at < now - timedelta(seconds=self.lease))
+            ).values(status='queued', claimed_at=None)
+        ).rowcount
+        if requeued:
+            print(f"Requeued {requeued} batch item(s) left processing by a stopped worker")
+            metrics.inc('noteflow_batch_requeued_total', requeued)
+
+        original = aliased(BatchItem)
+        for duplicate, source in db.session.execute(
+            select(BatchItem, original).join(original, BatchItem.duplicate_of_id == original.id)
+            .where(BatchItem.status == 'queued', original.status.in_(('done', 'failed')))
+        ).all():
+            _copy_outcome(duplicate, source)
+        db.session.commit()
+
+        if requeued:
+            self.wake()
+
+
+batch_scheduler = BatchScheduler()
+
+
+def _copy_outcome(item, original):
+    """Give an item the outcome of the item it duplicates"""
+    item.status = original.status
+    item.result_type = original.result_type
+    item.result_id = original.result_id
+    item.error = original.error
+
+
+def _classify_file(filename):
+    """Return the pipeline kind for a filename based on its extension, or None"""
+    if '.' not in filename:
+        return None
+    ext = filename.rsplit('.', 1)[1].lower()
+    config = current_app.config
+    # Audio first: webm is allowed both as audio and as video
+    if ext in config['ALLOWED_EXTENSIONS']:
+        return 'audio'
+    if ext in config['ALLOWED_VIDEO_EXTENSIONS']:
+        return 'video'
+    if ext in config['ALLOWED_BOOK_EXTENSIONS']:
+        return 'book'
+    return None
+
+
+def _find_previous(user_id, item):
+    """Find an earlier item of this user with the same content that is done or still in flight"""
+    return BatchItem.query.join(Batch).filter(
+        Batch.user_id == user_id,
+        BatchItem.id != item.id,
+        BatchItem.content_hash == item.content_hash,
+        BatchItem.duplicate_of_id.is_(None),
+        BatchItem.status != 'failed'
+    ).order_by(BatchItem.id.desc()).first()
+
+
+def _mark_duplicate(item, original):
+    """Point an item at the item that already holds (or will hold) its result"""
+    metrics.inc('noteflow_cache_hits_total', cache='batch_dedup')
+    item.duplicate_of_id = original.id
+    if original.status == 'done':
+        item.status = 'done'
+        item.result_type = original.result_type
+        item.result_id = original.result_id
+
+
+def create_batch(user_id, files, urls, allow_urls=True):
+    """
+    Save all inputs, deduplicate them by hash and queue the rest on the worker pool
+
+    Args:
+        user_id: Owner of the batch
+        files: List of werkzeug FileStorage objects
+        urls: List of YouTube URLs
+        allow_urls: False when URL processing is disabled on this server
+
+    Returns:
+        Batch: The committed batch
+    """
+    batch = Batch(user_id=user_id)
+    db.session.add(batch)
+    db.session.flush()  # Get the batch ID
+
+    seen = {}  # content hash -> first item in this batch
+    position = 0
+
+    for file in files:
+        item = BatchItem(batch_id=batch.id, position=position, source=file.filename[:500], kind=_classify_file(file.filename))
+        position += 1
+        db.session.add(item)
+
+        if item.kind is None:
+            item.status = 'failed'
+            item.error = 'Invalid file type'
+            continue
+
+        if item.kind == 'audio':
+            rejection = audio_upload_error(file, current_app.config['MAX_AUDIO_UPLOAD_MB'] * 1024 * 1024)
+            if rejection:
+                item.status = 'failed'
+                item.error = rejection[0]
+                continue
+
+        filename, filepath, content_hash = save_uploaded_file(
+            file, current_app.config['UPLOAD_FOLDER'], prefix=f"b{batch.id}_{item.position}"
+        )
+        item.stored_filename = filename
+        item.content_hash = content_hash
+        db.session.flush()
+
+        original = seen.get(content_hash) or _find_previous(user_id, item)
+        if original is not None:
+            _mark_duplicate(item, original)
+            cleanup_file(filepath)  # Identical content is already stored
+        else:
+            metrics.inc('noteflow_cache_misses_total', cache='batch_dedup')
+            seen[content_hash] = item
+
+    for url in urls:
+        url = url.strip()
+        item = BatchItem(batch_id=batch.id, position=position, source=url[:500], kind='youtube')
+        position += 1
+        db.session.add(item)
+
+        video_id = extract_video_id(url)
+        if not allow_urls:
+            item.status = 'failed'
+            item.error = '⚠️ YouTube URL is disabled on this server. Use Video file upload instead.'
+            continue
+        if not video_id:
+            item.status = 'failed'
+            item.error = 'Invalid YouTube URL format'
+            continue
+
+        item.content_hash = f"youtube:{video_id}"
+        db.session.flush()
+
+        original = seen.get(item.content_hash) or _find_previous(user_id, item)
+        if original is not None:
+            _mark_duplicate(item, original)
+        else:
+            metrics.inc('noteflow_cache_misses_total', cache='batch_dedup')
+            seen[item.content_hash] = item
+
+    db.session.commit()
+
+    for item in batch.items:
+        if item.status == 'queued' and item.duplicate_of_id is not None:
+            # The original may have finished between lookup and commit
+            original = db.session.get(BatchItem, item.duplicate_of_id)
+            if original.status in ('done', 'failed'):
+                _copy_outcome(item, original)
+    db.session.commit()
+    batch_scheduler.wake()
+
+    return batch
+
+
+def run_batch_item(item_id):
+    """
+    Process one claimed ('processing') batch item inside an app context and propagate the
+    result to its duplicates
+    """
+    item = db.session.get(BatchItem, item_id)
+    if item is None or item.status != 'processing':
+        return
+
+    user_id = item.batch.user_id
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    filepath = os.path.join(upload_folder, item.stored_filename) if item.stored_filename else None
+
+    try:
+        if item.kind == 'audio':
+            result, result_type = process_audio_file(filepath, item.stored_filename, item.source, user_id), 'meeting'
+        elif item.kind == 'video':
+            result, result_type = process_video_file(filepath, item.stored_filename, item.source, user_id), 'video'
+        elif item.kind == 'book':
+            result, result_type = process_book_file(filepath, item.stored_filename, item.source, user_id), 'book'
+        else:
+            result, result_type = process_youtube_url(item.source, user_id), 'video'
+
+        item.status = 'done'
+        item.result_type = result_type
+        item.result_id = result.id
+    except Exception as e:
+        db.session.rollback()
+        item = db.session.get(BatchItem, item_id)
+        item.status = 'failed'
+        item.error = str(e)
+
+    item.claimed_at = None
+
+    # Duplicates share the outcome of the item they point at
+    for duplicate in BatchItem.query.filter_by(duplicate_of_id=item.id).all():
+        _copy_outcome(duplicate, item)
+
+    db.session.commit()
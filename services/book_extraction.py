@@ -1,16 +1,69 @@
 """
 Book text extraction service for various file formats
 """
+import io
 import os
-from pypdf import PdfReader
-import ebooklib
-from ebooklib import epub
-from docx import Document
-from bs4 import BeautifulSoup
+import mmap
+import codecs
+import shutil
+import zipfile
+import subprocess
+import posixpath
+from collections import namedtuple
+from html.parser import HTMLParser
+from urllib.parse import unquote
+from xml.etree import ElementTree
+
+# pypdf is imported on first use; EPUB and DOCX are read straight from their zip archives
+
+# A chapter of a book: title (None when the source has none), its plain text and the length
+# of its full text (set by extract_chapters_from_book, whose text may be cut short)
+Chapter = namedtuple('Chapter', ['title', 'text', 'char_count'], defaults=[None])
+# Metadata embedded in a book file; any field may be None
+BookMetadata = namedtuple('BookMetadata', ['title', 'author', 'language', 'page_count'])
+
+_CONTAINER_NS = 'urn:oasis:names:tc:opendocument:xmlns:container'
+_OPF_NS = 'http://www.idpf.org/2007/opf'
+_NCX_NS = 'http://www.daisy.org/z3986/2005/ncx/'
+_XHTML_NS = 'http://www.w3.org/1999/xhtml'
+_EPUB_NS = 'http://www.idpf.org/2007/ops'
+_DC_NS = 'http://purl.org/dc/elements/1.1/'
+_DOCX_APP_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties'
+_EPUB_DOCUMENT_TYPES = ('application/xhtml+xml', 'text/html')
+_EPUB_READ_CHARS = 64 * 1024
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_BODY, _W_P, _W_T, _W_TAB, _W_BR, _W_CR = (f'{_W}{tag}' for tag in ('body', 'p', 't', 'tab', 'br', 'cr'))
+_W_TBL, _W_TR, _W_TC = (f'{_W}{tag}' for tag in ('tbl', 'tr', 'tc'))
+_W_PSTYLE, _W_OUTLINE_LVL, _W_VAL, _W_STYLE_ID = f'{_W}pStyle', f'{_W}outlineLvl', f'{_W}val', f'{_W}styleId'
+_W_STYLE, _W_NAME, _W_PPR = f'{_W}style', f'{_W}name', f'{_W}pPr'
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'),  # Before UTF-16: same first bytes
+    (codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+TXT_SNIFF_BYTES = 64 * 1024
+TXT_CHUNK_BYTES = 1024 * 1024
+TXT_MAX_LINE_CHARS = 64 * 1024
+
+_OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # Word 97-2003 (compound file)
+
+# Size of the parts a book without chapters is split into (about 6k tokens each)
+BOOK_PART_CHARS = 25000
+FRONT_MATTER_MAX_CHARS = 2000
+# Characters at the start of a book searched for a title when its metadata has none
+TITLE_SCAN_CHARS = 2000
+
+_SKIP_TAGS = {'head', 'script', 'style', 'svg', 'math', 'template'}
+_HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+_BLOCK_TAGS = _HEADING_TAGS | {
+    'p', 'div', 'br', 'hr', 'li', 'ul', 'ol', 'dl', 'dt', 'dd', 'tr', 'td', 'th', 'table',
+    'section', 'article', 'aside', 'header', 'footer', 'blockquote', 'pre', 'figure', 'figcaption',
+}
 
 
 def extract_text_from_pdf(filepath):
     """Extract text from PDF file"""
+    from pypdf import PdfReader
     try:
         reader = PdfReader(filepath)
         text = ""
@@ -21,43 +74,563 @@ def extract_text_from_pdf(filepath):
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 
-def extract_text_from_epub(filepath):
-    """Extract text from EPUB file"""
+def _iter_pdf_chapters(filepath):
+    """Stream a PDF's chapters from its top-level outline (bookmarks); one untitled chapter without one"""
+    from pypdf import PdfReader
+    reader = PdfReader(filepath)
+    starts = dict(_pdf_outline_starts(reader))
+
+    title, pages = None, []
+    for index, page in enumerate(reader.pages):
+        if index in starts:
+            if pages:
+                yield Chapter(title, '\n'.join(pages).strip())
+            title, pages = starts[index], []
+        pages.append(page.extract_text() or '')
+    if pages:
+        yield Chapter(title, '\n'.join(pages).strip())
+
+
+def _pdf_outline_starts(reader):
+    """(page index, title) of each top-level outline entry, sorted by page"""
     try:
-        book = epub.read_epub(filepath)
-        text = ""
+        outline = reader.outline
+    except Exception:
+        return []
+    # A single top-level entry (usually the book title) wrapping everything: use its children
+    if len(outline) == 2 and isinstance(outline[1], list):
+        outline = outline[1]
 
-        for item in book.get_items():
-            if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                # Parse HTML content
-                soup = BeautifulSoup(item.get_content(), 'html.parser')
-                text += soup.get_text() + "\n"
+    starts = {}
+    for entry in outline:
+        if isinstance(entry, list):
+            continue  # Nested entries are sections of the previous chapter
+        try:
+            page = reader.get_destination_page_number(entry)
+        except Exception:
+            continue
+        if page is not None and page >= 0 and entry.title:
+            starts.setdefault(page, ' '.join(entry.title.split()))
+    return sorted(starts.items())
 
-        return text.strip()
+
+def iter_epub_chapters(filepath):
+    """
+    Stream an EPUB's chapters in reading order
+
+    Reads the OPF spine straight from the zip and strips each XHTML document with a
+    lightweight HTMLParser, one document at a time, so memory is bounded by the largest
+    chapter rather than the whole book. Chapters follow the table of contents (EPUB 3 nav
+    or EPUB 2 NCX): spine documents without an entry of their own continue the previous
+    chapter. Without a table of contents every document is a chapter.
+
+    Args:
+        filepath: Path to the EPUB file
+
+    Yields:
+        Chapter: (title, text); the title comes from the table of contents, else the
+        document's first heading (or <title>), None if there is neither
+    """
+    with zipfile.ZipFile(filepath) as archive:
+        spine, toc = _epub_package(archive)
+        title, parts = None, []
+        for index, name in enumerate(spine):
+            try:
+                heading, text = _strip_epub_document(archive, name)
+            except KeyError:
+                continue  # Spine entry without a file in the archive
+
+            if index == 0 or not toc or name in toc:
+                if parts:
+                    yield Chapter(title, '\n'.join(parts))
+                title, parts = toc.get(name) or heading, []
+            if text:
+                parts.append(text)
+        if parts:
+            yield Chapter(title, '\n'.join(parts))
+
+
+def _strip_epub_document(archive, name):
+    """(first heading, text) of one XHTML document of the archive"""
+    parser = _HTMLTextExtractor()
+    with io.TextIOWrapper(archive.open(name), encoding='utf-8', errors='replace') as stream:
+        while True:
+            data = stream.read(_EPUB_READ_CHARS)
+            if not data:
+                break
+            parser.feed(data)
+    parser.close()
+    text = parser.get_text()
+    return parser.title, text
+
+
+def extract_text_from_epub(filepath):
+    """Extract text from EPUB file"""
+    try:
+        return '\n\n'.join(chapter.text for chapter in iter_epub_chapters(filepath)).strip()
     except Exception as e:
         raise Exception(f"Error extracting text from EPUB: {str(e)}")
 
 
-def extract_text_from_docx(filepath):
-    """Extract text from DOCX file"""
+def _epub_package(archive):
+    """
+    Read the OPF package
+
+    Returns:
+        tuple: (archive paths of the spine's (X)HTML documents in reading order, navigation
+        document excluded; {archive path: chapter title} from the table of contents)
+    """
+    rootfile, package = _epub_opf(archive)
+    base = posixpath.dirname(rootfile)
+
+    manifest = {item.get('id'): item for item in package.iter(f'{{{_OPF_NS}}}item')}
+    spine, nav = [], None
+    for item in manifest.values():
+        if 'nav' in (item.get('properties') or '').split():
+            nav = item
+    for itemref in package.iter(f'{{{_OPF_NS}}}itemref'):
+        item = manifest.get(itemref.get('idref'))
+        if item is None or item is nav or item.get('media-type') not in _EPUB_DOCUMENT_TYPES:
+            continue
+        spine.append(_epub_path(base, item.get('href', '')))
+
+    toc = {}
+    spine_element = package.find(f'{{{_OPF_NS}}}spine')
+    ncx = manifest.get(spine_element.get('toc')) if spine_element is not None else None
     try:
-        doc = Document(filepath)
-        text = ""
+        if nav is not None:
+            toc = _epub_nav_toc(archive, _epub_path(base, nav.get('href', '')))
+        if not toc and ncx is not None:
+            toc = _epub_ncx_toc(archive, _epub_path(base, ncx.get('href', '')))
+    except (KeyError, ElementTree.ParseError):
+        toc = {}  # Broken table of contents: fall back to one chapter per document
+    return spine, toc
 
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
 
-        return text.strip()
+def _epub_opf(archive):
+    """(archive path, parsed root) of the OPF package document named by META-INF/container.xml"""
+    container = ElementTree.fromstring(archive.read('META-INF/container.xml'))
+    rootfile = container.find(f'.//{{{_CONTAINER_NS}}}rootfile').get('full-path')
+    return rootfile, ElementTree.fromstring(archive.read(rootfile))
+
+
+def _epub_path(base, href):
+    """Archive path of an href relative to `base`, without its #fragment"""
+    return posixpath.normpath(posixpath.join(base, unquote(href.split('#', 1)[0])))
+
+
+def _epub_nav_toc(archive, path):
+    """{archive path: title} of the top-level entries of an EPUB 3 navigation document"""
+    root = ElementTree.fromstring(archive.read(path))
+    base = posixpath.dirname(path)
+    for nav in root.iter(f'{{{_XHTML_NS}}}nav'):
+        if nav.get(f'{{{_EPUB_NS}}}type') == 'toc':
+            break
+    else:
+        return {}
+
+    entries = nav.findall(f'{{{_XHTML_NS}}}ol/{{{_XHTML_NS}}}li')
+    # A single top-level entry (usually the book title) wrapping everything: use its children
+    if len(entries) == 1 and entries[0].find(f'{{{_XHTML_NS}}}ol') is not None:
+        entries = entries[0].findall(f'{{{_XHTML_NS}}}ol/{{{_XHTML_NS}}}li')
+
+    toc = {}
+    for entry in entries:
+        link = entry.find(f'{{{_XHTML_NS}}}a')
+        title = ' '.join(''.join(link.itertext()).split()) if link is not None else ''
+        if title and link.get('href'):
+            toc.setdefault(_epub_path(base, link.get('href')), title)
+    return toc
+
+
+def _epub_ncx_toc(archive, path):
+    """{archive path: title} of the top-level navPoints of an EPUB 2 NCX file"""
+    root = ElementTree.fromstring(archive.read(path))
+    base = posixpath.dirname(path)
+    nav_map = root.find(f'{{{_NCX_NS}}}navMap')
+    if nav_map is None:
+        return {}
+
+    points = nav_map.findall(f'{{{_NCX_NS}}}navPoint')
+    if len(points) == 1 and points[0].find(f'{{{_NCX_NS}}}navPoint') is not None:
+        points = points[0].findall(f'{{{_NCX_NS}}}navPoint')
+
+    toc = {}
+    for point in points:
+        label = point.find(f'{{{_NCX_NS}}}navLabel/{{{_NCX_NS}}}text')
+        content = point.find(f'{{{_NCX_NS}}}content')
+        title = ' '.join((label.text or '').split()) if label is not None else ''
+        if title and content is not None and content.get('src'):
+            toc.setdefault(_epub_path(base, content.get('src')), title)
+    return toc
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Tag stripper: keeps text, turns block elements into line breaks, drops <head>/<script>/<style>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.title = None
+        self._skip_depth = 0
+        self._heading = None  # Text parts of the first heading while inside it
+        self._title_tag = None  # Text parts of <title>
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            if tag == 'head':
+                self._title_tag = self._title_tag or []
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+        if tag in _HEADING_TAGS and self.title is None and self._heading is None:
+            self._heading = []
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+        if tag in _HEADING_TAGS and self._heading is not None:
+            self.title = ' '.join(''.join(self._heading).split()) or None
+            self._heading = None
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            if self._title_tag is not None and self.lasttag == 'title':
+                self._title_tag.append(data)
+            return
+        self.parts.append(data)
+        if self._heading is not None:
+            self._heading.append(data)
+
+    def get_text(self):
+        """Collected text: whitespace collapsed within lines, empty lines dropped"""
+        if self.title is None and self._title_tag:
+            self.title = ' '.join(''.join(self._title_tag).split()) or None
+        lines = (' '.join(line.split()) for line in ''.join(self.parts).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+
+def iter_docx_paragraphs(filepath):
+    """
+    Stream a DOCX's paragraphs and tables in document order
+
+    Parses word/document.xml incrementally straight from the zip and discards each body
+    element once its text is out, so memory stays flat however long the document is.
+    Table rows come out as one line with their cells joined by ' | ' (nested tables are
+    flattened into their cell); deleted tracked changes and field codes are skipped.
+
+    Args:
+        filepath: Path to the DOCX file
+
+    Yields:
+        tuple: (text, heading level) where the level is 1 for 'Heading 1' paragraphs
+        (by style name or outline level), 2 for 'Heading 2' and so on, None otherwise
+    """
+    with zipfile.ZipFile(filepath) as archive:
+        style_levels = _docx_style_levels(archive)
+
+        body = None
+        paragraph = []  # Text runs of the current paragraph
+        level = None
+        rows = []  # Stack (one per open table) of the current row's cell texts
+        cells = []  # Stack (one per open cell) of the cell's paragraph texts
+
+        with archive.open('word/document.xml') as stream:
+            for event, elem in ElementTree.iterparse(stream, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == _W_BODY:
+                        body = elem
+                    elif tag == _W_TBL:
+                        rows.append([])
+                    elif tag == _W_TC:
+                        cells.append([])
+                    continue
+
+                if tag == _W_T:
+                    paragraph.append(elem.text or '')
+                elif tag == _W_TAB:
+                    paragraph.append('\t')
+                elif tag in (_W_BR, _W_CR):
+                    paragraph.append(' ')
+                elif tag == _W_PSTYLE:
+                    level = style_levels.get(elem.get(_W_VAL), level)
+                elif tag == _W_OUTLINE_LVL:
+                    level = _outline_level(elem.get(_W_VAL))
+                elif tag == _W_P:
+                    text = ' '.join(''.join(paragraph).split())
+                    if text:
+                        if cells:
+                            cells[-1].append(text)
+                        else:
+                            yield text, level
+                    paragraph, level = [], None
+                elif tag == _W_TC:
+                    rows[-1].append(' '.join(cells.pop()))
+                elif tag == _W_TR:
+                    row = ' | '.join(cell for cell in rows[-1] if cell)
+                    rows[-1] = []
+                    if row:
+                        if cells:
+                            cells[-1].append(row)  # Nested table: part of the outer cell
+                        else:
+                            yield row, None
+                elif tag == _W_TBL:
+                    rows.pop()
+
+                # Done with a top-level paragraph or table: drop it from the tree
+                if tag in (_W_P, _W_TBL) and not rows and body is not None:
+                    body.clear()
+
+
+def _docx_style_levels(archive):
+    """{style id: heading level} from word/styles.xml ('heading N' names or outline levels)"""
+    try:
+        root = ElementTree.fromstring(archive.read('word/styles.xml'))
+    except KeyError:
+        return {}
+    levels = {}
+    for style in root.iter(_W_STYLE):
+        name = style.find(_W_NAME)
+        name = (name.get(_W_VAL) or '').lower() if name is not None else ''
+        outline = style.find(f'{_W_PPR}/{_W_OUTLINE_LVL}')
+        level = _outline_level(outline.get(_W_VAL)) if outline is not None else None
+        if name.startswith('heading ') and name[8:].isdigit():
+            level = int(name[8:])
+        if level is not None:
+            levels[style.get(_W_STYLE_ID)] = level
+    return levels
+
+
+def _outline_level(value):
+    """Heading level of a w:outlineLvl value (0-based; 9 means body text)"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value + 1 if 0 <= value < 9 else None
+
+
+def extract_text_from_docx(filepath):
+    """Extract text (paragraphs and tables) from DOCX file"""
+    try:
+        return '\n'.join(text for text, _ in iter_docx_paragraphs(filepath))
     except Exception as e:
         raise Exception(f"Error extracting text from DOCX: {str(e)}")
 
 
+def _iter_docx_chapters(filepath):
+    """Stream a DOCX's chapters split at level 1 headings"""
+    title, lines = None, []
+    for text, level in iter_docx_paragraphs(filepath):
+        if level == 1:
+            if lines:
+                yield Chapter(title, '\n'.join(lines))
+            title, lines = text, []
+        lines.append(text)
+    if lines:
+        yield Chapter(title, '\n'.join(lines))
+
+
+def extract_text_from_doc(filepath):
+    """
+    Extract text from a .doc file: a DOCX saved under the old extension is read as DOCX,
+    Word 97-2003 binary documents need `antiword` or `catdoc` on the server
+    """
+    with open(filepath, 'rb') as f:
+        magic = f.read(8)
+
+    if magic.startswith(b'PK'):
+        return extract_text_from_docx(filepath)
+    if magic.startswith(b'{\\rtf'):
+        raise Exception("This .doc file is an RTF document; please save it as DOCX or PDF")
+    if magic != _OLE_MAGIC:
+        raise Exception("Unrecognized .doc file; please save it as DOCX or PDF")
+
+    for command in (['antiword', '-m', 'UTF-8.txt'], ['catdoc', '-d', 'utf-8', '-w']):
+        executable = shutil.which(command[0])
+        if not executable:
+            continue
+        try:
+            result = subprocess.run([executable] + command[1:] + [filepath], capture_output=True, timeout=120)
+        except subprocess.TimeoutExpired:
+            continue
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.decode('utf-8', errors='replace').strip()
+    raise Exception("Word 97-2003 (.doc) files are not supported on this server; please save the book as DOCX or PDF")
+
+
+def sniff_encoding(sample):
+    """
+    Guess the encoding of a text file from a bounded sample of its first bytes
+
+    BOMs win; otherwise UTF-8 when the sample decodes strictly (a character cut at the
+    end of the sample is fine). Legacy 8-bit text is decoded both ways and its words are
+    scored (_legacy_word_votes): Windows-1256 when more words read as Arabic than as
+    accented Latin, else Windows-1252 (Latin-1 when it uses bytes Windows-1252 leaves
+    undefined). Accented Latin letters mostly decode to Arabic letters under Windows-1256,
+    so counting Arabic characters alone would take German or Spanish text for Arabic.
+
+    Args:
+        sample (bytes): Start of the file (TXT_SNIFF_BYTES is plenty)
+
+    Returns:
+        str: Python codec name
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    arabic, latin = _legacy_word_votes(sample)
+    if arabic > latin:
+        return 'cp1256'
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def _is_arabic_letter(char):
+    return '\u0621' <= char <= '\u064a' or '\u0671' <= char <= '\u06d3'
+
+
+def _legacy_word_votes(sample):
+    """
+    (Arabic words under Windows-1256, accented Latin words under Windows-1252) in a sample
+
+    An Arabic word is all high bytes, so under Windows-1256 it has Arabic letters and no
+    ASCII letters. An accented Latin word has ASCII letters with at most two accented
+    letters in a row under Windows-1252; the same bytes under Windows-1256 put Arabic
+    letters between ASCII ones ("Größe" -> "Grِكe"), which is no Arabic word.
+    """
+    arabic = 0
+    for word in sample.decode('cp1256', errors='replace').split():
+        if any(_is_arabic_letter(char) for char in word) and not any(char.isascii() and char.isalpha() for char in word):
+            arabic += 1
+
+    latin = 0
+    for word in sample.decode('cp1252', errors='replace').split():
+        if not any(char.isascii() and char.isalpha() for char in word):
+            continue
+        run = longest = 0
+        for char in word:
+            run = run + 1 if not char.isascii() else 0
+            longest = max(longest, run)
+        if 0 < longest <= 2:
+            latin += 1
+    return arabic, latin
+
+
+def iter_txt_chunks(filepath, chunk_bytes=None):
+    """
+    Stream a text file as decoded, whitespace-normalized chunks
+
+    The file is memory-mapped and decoded incrementally (encoding from sniff_encoding()
+    on its first TXT_SNIFF_BYTES), so only one chunk of decoded text exists at a time.
+    Normalization happens in the same pass: line endings become '\n', runs of spaces and
+    tabs collapse to one space, lines are stripped and blank lines collapse to a single
+    paragraph break. Concatenating the chunks gives the normalized text.
+
+    Args:
+        filepath: Path to the text file
+        chunk_bytes: Bytes decoded per step (default TXT_CHUNK_BYTES)
+
+    Yields:
+        str: Normalized text, each chunk ending at a line break
+    """
+    chunk_bytes = chunk_bytes or TXT_CHUNK_BYTES
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            encoding = sniff_encoding(data[:TXT_SNIFF_BYTES])
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            normalizer = _LineNormalizer()
+            # BOMs are consumed by the utf-8-sig/utf-16/utf-32 decoders
+            for offset in range(0, len(data), chunk_bytes):
+                text = normalizer.feed(decoder.decode(data[offset:offset + chunk_bytes]))
+                if text:
+                    yield text
+            text = normalizer.feed(decoder.decode(b'', final=True), final=True)
+            if text:
+                yield text
+
+
+class _LineNormalizer:
+    """Incremental whitespace normalizer: holds back the last, incomplete line of each chunk"""
+
+    def __init__(self):
+        self.pending = ''
+        self.blank = False  # The last line fed was blank
+        self.started = False  # Some text was already returned
+
+    def feed(self, text, final=False):
+        text = self.pending + text
+        if not final and text.endswith('\r'):
+            text, self.pending = text[:-1], '\r'  # Might be the first half of '\r\n'
+        else:
+            self.pending = ''
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+        if not final:
+            cut = text.rfind('\n')
+            if cut == -1 and len(text) > TXT_MAX_LINE_CHARS:
+                cut = text.rfind(' ')  # A huge line without breaks: wrap it at a space
+            if cut == -1:
+                self.pending = text + self.pending
+                return ''
+            text, self.pending = text[:cut], text[cut + 1:] + self.pending
+
+        # Collapse whitespace within lines, then reduce runs of blank lines to one paragraph break
+        text = '\n'.join([' '.join(line.split()) for line in text.split('\n')])
+        body = text.strip('\n')
+        if not body:
+            self.blank = self.blank or self.started
+            return ''
+        separator = '\n' if self.started and (self.blank or text.startswith('\n')) else ''
+        self.blank, self.started = text.endswith('\n'), True
+        while '\n\n\n' in body:  # str.replace is far faster than a regex here
+            body = body.replace('\n\n\n', '\n\n')
+        return separator + body + '\n'
+
+
+def iter_txt_parts(filepath, max_chars=None):
+    """
+    Split a text file into Chapter('Part N', ...) pieces of at most `max_chars` characters
+    (cut at a line break) straight from iter_txt_chunks(), without building the whole text
+    """
+    max_chars = max_chars or BOOK_PART_CHARS
+    number, buffer = 0, ''
+    for chunk in iter_txt_chunks(filepath):
+        buffer += chunk
+        start = 0
+        while len(buffer) - start >= max_chars:
+            cut = buffer.rfind('\n', start + max_chars // 2, start + max_chars)
+            if cut == -1:
+                cut = start + max_chars
+            part = buffer[start:cut].strip()
+            start = cut
+            if part:
+                number += 1
+                yield Chapter(f'Part {number}', part)
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield Chapter(f'Part {number + 1}', buffer.strip())
+
+
 def extract_text_from_txt(filepath):
-    """Extract text from TXT file"""
+    """Extract text from TXT file (encoding detected, whitespace normalized)"""
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            text = f.read()
-        return text.strip()
+        return ''.join(iter_txt_chunks(filepath)).strip()
     except Exception as e:
         raise Exception(f"Error extracting text from TXT: {str(e)}")
 
@@ -79,7 +652,7 @@ def extract_text_from_book(filepath, file_type):
         'pdf': extract_text_from_pdf,
         'epub': extract_text_from_epub,
         'docx': extract_text_from_docx,
-        'doc': extract_text_from_docx,  # Try DOCX extractor for DOC files
+        'doc': extract_text_from_doc,
         'txt': extract_text_from_txt
     }
 
@@ -95,20 +668,212 @@ def extract_text_from_book(filepath, file_type):
     return text
 
 
+def extract_chapters_from_book(filepath, file_type, max_chars=None):
+    """
+    Extract a book's chapters from its structure: PDF outline, EPUB table of contents
+    or DOCX 'Heading 1' paragraphs. Books without usable structure (and TXT/DOC files)
+    are split into parts of about BOOK_PART_CHARS characters at line breaks.
+
+    Chapters are consumed from the extractor one at a time and each is cut to `max_chars`
+    as it arrives, so the book's full text is never held at once; only the first chapter
+    is kept whole until a second one shows it is not the whole book.
+
+    Args:
+        filepath: Path to the book file
+        file_type: Type of file (pdf, epub, docx, txt)
+        max_chars: Characters of text kept per chapter (default: all)
+
+    Returns:
+        list: Chapter (title, text, char_count) tuples in reading order, char_count being
+        the length of the chapter's full text
+    """
+    file_type = file_type.lower()
+
+    if file_type == 'pdf':
+        source = _labelled_errors(_iter_pdf_chapters(filepath), 'PDF')
+    elif file_type == 'epub':
+        source = _labelled_errors(iter_epub_chapters(filepath), 'EPUB')
+    elif file_type == 'docx' or (file_type == 'doc' and zipfile.is_zipfile(filepath)):
+        source = _labelled_errors(_iter_docx_chapters(filepath), 'DOCX')
+    elif file_type == 'txt':
+        source = _labelled_errors(iter_txt_parts(filepath), 'TXT')
+    else:
+        source = iter([Chapter(None, extract_text_from_book(filepath, file_type))])
+
+    held, chapters, total, merged = None, [], 0, False
+    for chapter in source:
+        if not chapter.text:
+            continue
+        total += len(chapter.text)
+        if held is None and not chapters:
+            held = chapter
+            continue
+        if held is not None:
+            # Untitled front matter (title page, copyright) is not worth a chapter of its own
+            if not merged and held.title is None and len(held.text) < FRONT_MATTER_MAX_CHARS:
+                held, merged = Chapter(chapter.title, held.text + '\n' + chapter.text), True
+                continue
+            chapters.append(_cut_chapter(held, max_chars))
+            held = None
+        chapters.append(_cut_chapter(chapter, max_chars))
+    if total < 50:
+        raise Exception("No text content found in the file")
+
+    if held is not None:  # A single chapter is the whole book: split it into parts
+        return [_cut_chapter(part, max_chars) for part in split_into_parts(held.text)]
+    return chapters
+
+
+def _labelled_errors(chapters, label):
+    """Pass chapters through, naming the format in any extraction error"""
+    try:
+        yield from chapters
+    except Exception as e:
+        raise Exception(f"Error extracting text from {label}: {str(e)}")
+
+
+def _cut_chapter(chapter, max_chars):
+    """The chapter with its text cut to `max_chars` and char_count set to its full length"""
+    char_count = chapter.char_count if chapter.char_count is not None else len(chapter.text)
+    return Chapter(chapter.title, chapter.text[:max_chars] if max_chars else chapter.text, char_count)
+
+
+def split_into_parts(text, max_chars=None):
+    """
+    Split unstructured text into Chapter('Part N', ...) pieces of at most `max_chars`,
+    cutting at a line break in the second half of each piece where possible
+
+    Returns:
+        list: one untitled Chapter when the text fits in a single part
+    """
+    max_chars = max_chars or BOOK_PART_CHARS
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [Chapter(None, text)]
+
+    parts, start = [], 0
+    while start < len(text):
+        end = min(len(text), start + max_chars)
+        if end < len(text):
+            cut = text.rfind('\n', start + max_chars // 2, end)
+            if cut > start:
+                end = cut
+        part = text[start:end].strip()
+        if part:
+            parts.append(part)
+        start = end
+    return [Chapter(f'Part {number}', part) for number, part in enumerate(parts, 1)]
+
+
+def extract_book_metadata(filepath, file_type):
+    """
+    Read the metadata embedded in a book file: PDF document info, EPUB OPF <metadata>,
+    DOCX core/app properties. TXT files have none. Never raises: unreadable or missing
+    metadata just leaves fields as None.
+
+    Args:
+        filepath: Path to the book file
+        file_type: Type of file (pdf, epub, docx, txt)
+
+    Returns:
+        BookMetadata: title, author, language, page_count (each None when unknown)
+    """
+    file_type = file_type.lower()
+    try:
+        if file_type == 'pdf':
+            metadata = _pdf_metadata(filepath)
+        elif file_type == 'epub':
+            metadata = _epub_metadata(filepath)
+        elif file_type in ('docx', 'doc') and zipfile.is_zipfile(filepath):
+            metadata = _docx_metadata(filepath)
+        else:
+            metadata = BookMetadata(None, None, None, None)
+    except Exception as e:
+        print(f"Could not read {file_type} metadata: {e}")
+        metadata = BookMetadata(None, None, None, None)
+
+    return metadata._replace(title=_clean_metadata_title(metadata.title),
+                             author=_clean_metadata_value(metadata.author, 200),
+                             language=_clean_metadata_value(metadata.language, 35))
+
+
+def _pdf_metadata(filepath):
+    from pypdf import PdfReader
+    reader = PdfReader(filepath)
+    info = reader.metadata
+    language = reader.trailer['/Root'].get('/Lang')
+    return BookMetadata(
+        title=info.title if info else None,
+        author=info.author if info else None,
+        language=str(language) if language else None,
+        page_count=len(reader.pages),
+    )
+
+
+def _epub_metadata(filepath):
+    with zipfile.ZipFile(filepath) as archive:
+        _, package = _epub_opf(archive)
+    metadata = package.find(f'{{{_OPF_NS}}}metadata')
+    if metadata is None:
+        return BookMetadata(None, None, None, None)
+
+    def first(tag):
+        elem = metadata.find(f'{{{_DC_NS}}}{tag}')
+        return elem.text if elem is not None else None
+
+    return BookMetadata(title=first('title'), author=first('creator'), language=first('language'), page_count=None)
+
+
+def _docx_metadata(filepath):
+    with zipfile.ZipFile(filepath) as archive:
+        names = set(archive.namelist())
+        core = ElementTree.fromstring(archive.read('docProps/core.xml')) if 'docProps/core.xml' in names else None
+        app = ElementTree.fromstring(archive.read('docProps/app.xml')) if 'docProps/app.xml' in names else None
+
+    def first(tag):
+        elem = core.find(f'{{{_DC_NS}}}{tag}') if core is not None else None
+        return elem.text if elem is not None else None
+
+    pages = app.find(f'{{{_DOCX_APP_NS}}}Pages') if app is not None else None
+    page_count = int(pages.text) if pages is not None and (pages.text or '').isdigit() else None
+    return BookMetadata(title=first('title'), author=first('creator'), language=first('language'),
+                        page_count=page_count or None)
+
+
+def _clean_metadata_value(value, max_length):
+    value = ' '.join(str(value).split()) if value else ''
+    return value[:max_length] or None
+
+
+def _clean_metadata_title(title):
+    """Drop placeholder titles word processors and PDF printers fill in"""
+    title = _clean_metadata_value(title, 200)
+    if not title:
+        return None
+    for prefix in ('Microsoft Word - ', 'Microsoft PowerPoint - '):
+        if title.startswith(prefix):
+            title = title[len(prefix):]
+    if title.lower() in ('untitled', 'unknown', 'title', 'document') or \
+            os.path.splitext(title)[1].lower() in ('.doc', '.docx', '.pdf', '.txt', '.epub', '.rtf', '.odt'):
+        return None
+    return title
+
+
 def get_book_title_from_text(text, filename):
     """
-    Try to extract book title from text or use filename
+    Try to extract book title from the start of the text or use filename
+
+    Only the first TITLE_SCAN_CHARS characters are looked at, so passing a whole book is cheap.
 
     Args:
-        text: Full book text
+        text: Book text (or its beginning)
         filename: Original filename
 
     Returns:
         Book title
     """
     # Try to get title from first few lines
-    lines = text.split('\n')
-    for line in lines[:10]:
+    for line in text[:TITLE_SCAN_CHARS].split('\n', 10)[:10]:
         line = line.strip()
         if line and len(line) < 100:  # Likely a title
             return line
@@ -0,0 +1,93 @@
+"""
+Database side of a chat turn, shared by the Flask route and the ASGI entry point
+
+Both helpers take plain ids and return plain values, so the async route can run them
+on a worker thread with its own app context and keep no ORM objects across the AI call.
+"""
+from datetime import datetime
+from models.meeting import db, Meeting, Book, Video, Conversation, ChatMessage
+from services.conversation_memory import get_conversation_memory, memory_folder
+
+
+def load_chat_state(user_id, context_type=None, context_id=None, conversation_id=None):
+    """
+    Load the content context and conversation memory for a chat turn
+
+    Args:
+        user_id: Current user's ID, or None for anonymous chat
+        context_type (str): 'audio', 'video' or 'book' (optional)
+        context_id: ID of the meeting, video or book (optional)
+        conversation_id: Existing conversation ID (optional)
+
+    Returns:
+        dict: summary, transcript, conversation_id (None if not found), memory_summary, history
+    """
+    state = {'summary': None, 'transcript': None, 'conversation_id': None, 'memory_summary': None, 'history': []}
+    if user_id is None:
+        return state
+
+    if context_id and context_type:
+        if context_type == 'audio':
+            meeting = Meeting.query.filter_by(id=context_id, user_id=user_id).first()
+            if meeting:
+                state['summary'] = meeting.summary
+                state['transcript'] = meeting.transcript
+        elif context_type == 'video':
+            video = Video.query.filter_by(id=context_id, user_id=user_id).first()
+            if video:
+                state['summary'] = video.summary
+                state['transcript'] = video.transcript
+        elif context_type == 'book':
+            book = Book.query.filter_by(id=context_id, user_id=user_id).first()
+            if book:
+                state['summary'] = book.summary
+                state['transcript'] = book.full_text
+
+    # Load existing conversation and its bounded memory (recent turns + rolling summary)
+    conversation = None
+    if conversation_id:
+        conversation = Conversation.query.filter_by(id=conversation_id, user_id=user_id).first()
+    if conversation:
+        state['conversation_id'] = conversation.id
+    state['memory_summary'], state['history'] = get_conversation_memory(conversation)
+    return state
+
+
+def save_chat_turn(user_id, conversation_id, user_message, ai_response, context_type=None, context_id=None):
+    """
+    Store a user message and the AI reply, creating the conversation if needed
+
+    Returns:
+        int: The conversation ID
+    """
+    conversation = None
+    if conversation_id:
+        conversation = Conversation.query.filter_by(id=conversation_id, user_id=user_id).first()
+
+    if not conversation:
+        # Create new conversation
+        # Generate title from first message (first 50 chars)
+        title = user_message[:50] + ('...' if len(user_message) > 50 else '')
+        conversation = Conversation(
+            user_id=user_id,
+            title=title,
+            context_type=context_type,
+            context_id=context_id
+        )
+        db.session.add(conversation)
+        db.session.flush()  # Get the conversation ID
+
+    # Save user message
+    db.session.add(ChatMessage(conversation_id=conversation.id, role='user', content=user_message))
+
+    # Save AI response
+    db.session.add(ChatMessage(conversation_id=conversation.id, role='assistant', content=ai_response))
+
+    # Update conversation timestamp
+    conversation.updated_at = datetime.utcnow()
+    db.session.commit()
+
+    # Fold turns that left the verbatim window into the rolling summary, off the request path
+    memory_folder.submit(conversation.id)
+
+    return conversation.id
@@ -0,0 +1,146 @@
+"""
+Conversation memory: the last N turns verbatim plus a rolling summary of older turns
+
+Folding evicted turns into the summary costs an LLM call, so it runs on a background
+thread (memory_folder) after the reply has been stored, never inside the chat request.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func
+from config import Config
+from models.meeting import db, Conversation, ChatMessage
+from services.summarization import summarize_conversation
+from utils.db_pool import released_connection
+
+
+def _window_size():
+    """Number of messages kept verbatim (one turn = user message + assistant reply)"""
+    return max(Config.CHAT_MEMORY_TURNS, 0) * 2
+
+
+def get_conversation_memory(conversation):
+    """
+    Load the bounded memory for a conversation
+
+    Args:
+        conversation: Conversation instance (or None for a new conversation)
+
+    Returns:
+        tuple: (rolling summary or None, list of recent messages as dicts with 'role' and 'content')
+    """
+    if conversation is None:
+        return None, []
+
+    window = _window_size()
+    history = []
+    if window:
+        recent = ChatMessage.query.filter_by(conversation_id=conversation.id) \
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()) \
+            .limit(window).all()
+        history = [{'role': msg.role, 'content': msg.content} for msg in reversed(recent)]
+
+    return conversation.memory_summary, history
+
+
+def update_conversation_memory(conversation_id):
+    """
+    Fold messages that slid out of the verbatim window into the rolling summary.
+    Only the newly evicted messages are sent to the LLM, so the cost per reply stays constant.
+
+    summarized_message_count is the summary's version: the new summary is stored with a
+    conditional update on the count it was built from, so when two folds of the same
+    messages race (two workers, two quick turns), only the first one is kept.
+
+    Args:
+        conversation_id: ID of the conversation whose latest messages are committed
+
+    Returns:
+        bool: True if this call stored a new summary (committed)
+    """
+    conversation = db.session.get(Conversation, conversation_id)
+    if conversation is None:
+        return False
+    total = ChatMessage.query.filter_by(conversation_id=conversation_id).count()
+    evict_until = total - _window_size()
+    already_summarized = conversation.summarized_message_count or 0
+
+    if evict_until <= already_summarized:
+        return False
+
+    evicted = ChatMessage.query.filter_by(conversation_id=conversation_id) \
+        .order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc()) \
+        .offset(already_summarized).limit(evict_until - already_summarized).all()
+
+    messages = [{'role': msg.role, 'content': msg.content} for msg in evicted]
+    previous_summary = conversation.memory_summary
+    with released_connection(db.session):
+        new_summary = summarize_conversation(
+            previous_summary,
+            messages,
+            max_chars=Config.CHAT_MEMORY_SUMMARY_MAX_CHARS
+        )
+
+    updated = Conversation.query.filter(
+        Conversation.id == conversation_id,
+        func.coalesce(Conversation.summarized_message_count, 0) == already_summarized
+    ).update({'memory_summary': new_summary, 'summarized_message_count': evict_until}, synchronize_session=False)
+    db.session.commit()
+    return updated == 1
+
+
+class MemoryFolder:
+    """
+    Background thread pool folding evicted chat turns into conversation summaries.
+    The pool is started lazily on first submit (safe with gunicorn --preload); a
+    conversation is queued at most once at a time.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.num_workers = 1
+        self._executor = None
+        self._lock = threading.Lock()
+        self._queued = set()  # Conversation ids submitted and not finished yet
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Bind the folder to the Flask app (workers need an app context)"""
+        self.app = app
+        self.num_workers = app.config.get('CHAT_MEMORY_WORKERS', 1)
+        app.extensions['memory_folder'] = self
+
+    def submit(self, conversation_id):
+        """Fold the conversation's evicted turns in the background (inline without a pool)"""
+        if self.app is None or self.num_workers < 1:
+            self._fold(conversation_id)
+            return
+        with self._lock:
+            if conversation_id in self._queued:
+                return
+            self._queued.add(conversation_id)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix='chat-memory')
+        self._executor.submit(self._run, conversation_id)
+
+    def _run(self, conversation_id):
+        with self.app.app_context():
+            try:
+                self._fold(conversation_id)
+            finally:
+                with self._lock:
+                    self._queued.discard(conversation_id)
+                db.session.remove()
+
+    def _fold(self, conversation_id):
+        # A failure must not lose anything: the next turn submits the fold again
+        try:
+            # Turns stored while a fold ran are folded right after it
+            while update_conversation_memory(conversation_id):
+                pass
+        except Exception as e:
+            db.session.rollback()
+            print(f"Conversation memory update of {conversation_id} failed: {e}")
+
+
+memory_folder = MemoryFolder()
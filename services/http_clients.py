@@ -0,0 +1,114 @@
+"""
+Shared, pooled HTTP clients for the upstream APIs (Groq, AssemblyAI, YouTube Data API)
+
+Groq and YouTube get one long-lived httpx client per process, created on first use through
+services.registry (async clients: one per event loop, their pools are loop-bound), so calls
+reuse keep-alive connections instead of opening a new TLS connection each time. HTTP/2 is
+negotiated when HTTP2_ENABLED is on and the h2 package is installed. The AssemblyAI SDK
+keeps its own pooled client; one Transcriber on it is shared and instrument()ed.
+
+Every request and every newly opened connection is counted per upstream in /metrics
+(noteflow_upstream_requests_total, noteflow_upstream_connections_total); requests minus
+connections is the number served on a reused connection.
+
+    http = http_client('youtube')            # httpx.Client
+    http = async_http_client('groq')         # httpx.AsyncClient of the running loop
+    instrument(sdk.http_client, 'assemblyai')  # count an SDK's own client
+"""
+import asyncio
+import importlib.util
+from config import Config
+from services import registry
+from utils import metrics
+
+# Upstream -> (timeout seconds, connect timeout seconds)
+UPSTREAMS = {
+    'groq': (600.0, 5.0),  # OpenAI SDK defaults; calls pass their own deadline
+    'youtube': (30.0, 10.0),
+}
+
+_async_clients = {}  # upstream -> (event loop, httpx.AsyncClient)
+
+
+def http2_enabled():
+    """HTTP/2 when configured and the h2 package is importable"""
+    return Config.HTTP2_ENABLED and importlib.util.find_spec('h2') is not None
+
+
+def _limits():
+    import httpx
+    return httpx.Limits(max_connections=Config.HTTP_POOL_MAX_CONNECTIONS,
+                        max_keepalive_connections=Config.HTTP_POOL_MAX_KEEPALIVE,
+                        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY)
+
+
+def _timeout(upstream):
+    import httpx
+    read, connect = UPSTREAMS[upstream]
+    return httpx.Timeout(read, connect=connect)
+
+
+def _count_request(upstream):
+    metrics.inc('noteflow_upstream_requests_total', upstream=upstream)
+
+
+def _count_connection(upstream, event):
+    if event == 'connection.connect_tcp.complete':
+        metrics.inc('noteflow_upstream_connections_total', upstream=upstream)
+
+
+def instrument(client, upstream):
+    """
+    Count requests and new connections of an httpx.Client (e.g. one an SDK created itself)
+
+    The httpcore trace extension reports each TCP connect, so pooled requests are the ones
+    without a connect event.
+    """
+    def trace(event, info):
+        _count_connection(upstream, event)
+
+    def on_request(request):
+        _count_request(upstream)
+        request.extensions['trace'] = trace
+
+    client.event_hooks['request'].append(on_request)
+    return client
+
+
+def _instrument_async(client, upstream):
+    async def trace(event, info):
+        _count_connection(upstream, event)
+
+    async def on_request(request):
+        _count_request(upstream)
+        request.extensions['trace'] = trace
+
+    client.event_hooks['request'].append(on_request)
+    return client
+
+
+def _create_client(upstream):
+    import httpx
+    return instrument(httpx.Client(http2=http2_enabled(), limits=_limits(), timeout=_timeout(upstream),
+                                   follow_redirects=True), upstream)
+
+
+for _upstream in UPSTREAMS:
+    registry.register(f'http:{_upstream}', lambda upstream=_upstream: _create_client(upstream))
+
+
+def http_client(upstream):
+    """The process-wide httpx.Client for an upstream ('groq', 'youtube')"""
+    return registry.get(f'http:{upstream}')
+
+
+def async_http_client(upstream):
+    """The httpx.AsyncClient for an upstream on the running event loop"""
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(upstream)
+    if entry is None or entry[0] is not loop:
+        import httpx
+        client = _instrument_async(httpx.AsyncClient(http2=http2_enabled(), limits=_limits(),
+                                                     timeout=_timeout(upstream), follow_redirects=True), upstream)
+        entry = _async_clients[upstream] = (loop, client)
+    return entry[1]
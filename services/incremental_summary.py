@@ -0,0 +1,111 @@
+"""
+Incremental meeting summary: notes on each section while the transcript is still arriving
+
+Live transcription feeds finalized text in as it comes (add()); every ~INCREMENTAL_SECTION_CHARS
+of transcript is summarized on a background thread, and when the notes grow past
+INCREMENTAL_NOTES_MAX_CHARS the two oldest are condensed into one. finish() then only merges
+the notes with the short stretch of transcript after the last section, so the time from the
+end of a recording to its summary does not grow with the length of the meeting.
+"""
+import threading
+import time
+from collections import deque
+from config import Config
+from services.transcript_compaction import compact_transcript
+from services.summarization import (
+    summarize_transcript_section, condense_section_summaries, merge_section_summaries
+)
+
+
+def split_section(text, section_chars):
+    """
+    Cut a section of about `section_chars` characters from the start of `text`, at the
+    last sentence end (or space) before the limit
+
+    Returns:
+        tuple: (section, rest), section is '' while text is shorter than section_chars
+    """
+    if len(text) < section_chars:
+        return '', text
+    cut = max(text.rfind(end, section_chars // 2, section_chars) for end in ('. ', '? ', '! '))
+    if cut == -1:
+        cut = text.rfind(' ', section_chars // 2, section_chars)
+    cut = cut + 1 if cut != -1 else section_chars
+    return text[:cut].strip(), text[cut:].lstrip()
+
+
+class IncrementalSummarizer:
+    """Running section-level summary of a transcript that arrives in pieces"""
+
+    def __init__(self, section_chars=None, notes_max_chars=None):
+        self.section_chars = section_chars or Config.INCREMENTAL_SECTION_CHARS
+        self.notes_max_chars = notes_max_chars or Config.INCREMENTAL_NOTES_MAX_CHARS
+        self.buffer = ''  # Transcript not yet cut into a section
+        self.sections = 0
+        self.notes = []
+        self.pending = deque()  # Sections waiting for the background thread
+        self.error = None
+        self.condition = threading.Condition()
+        self.worker = None
+
+    def add(self, text):
+        """Append finalized transcript text; full sections are queued for summarization"""
+        with self.condition:
+            self.buffer = f"{self.buffer} {text}" if self.buffer else text
+            while True:
+                section, self.buffer = split_section(self.buffer, self.section_chars)
+                if not section:
+                    break
+                self.sections += 1
+                self.pending.append((self.sections, section))
+            if self.pending and self.worker is None:
+                self.worker = threading.Thread(target=self._run, name='incremental-summary', daemon=True)
+                self.worker.start()
+            self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if not self.pending:
+                    self.worker = None
+                    self.condition.notify_all()
+                    return
+                number, section = self.pending[0]
+            try:
+                notes = summarize_transcript_section(compact_transcript(section, 'live').text, number)
+                with self.condition:
+                    self.notes.append(notes)
+                while sum(len(n) for n in self.notes) > self.notes_max_chars and len(self.notes) > 1:
+                    combined = condense_section_summaries(self.notes[0], self.notes[1])
+                    with self.condition:
+                        self.notes[:2] = [combined]
+            except Exception as e:
+                print(f"Incremental summary failed on section {number}: {e}")
+                with self.condition:
+                    self.error = e
+                    self.pending.clear()
+                    self.worker = None
+                    self.condition.notify_all()
+                return
+            with self.condition:
+                self.pending.popleft()
+
+    def finish(self, timeout=None):
+        """
+        Wait for queued sections and merge everything into the final meeting notes
+
+        Returns:
+            str: Meeting notes, or None when a section failed or did not finish in time
+            (the caller then summarizes the full transcript)
+        """
+        deadline = time.monotonic() + (timeout or Config.LIVE_FINISH_TIMEOUT)
+        with self.condition:
+            while self.worker is not None and self.error is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+            if self.error is not None:
+                return None
+            notes, tail = list(self.notes), self.buffer
+        return merge_section_summaries(notes, compact_transcript(tail, 'live').text)
@@ -0,0 +1,388 @@
+"""
+Live transcription of in-browser recordings
+
+The recorder posts 16-bit mono PCM in ~1 s chunks while the user is still talking and
+gets the partial transcript back in each response, so the transcript is complete a
+moment after recording stops instead of after a full upload and batch transcription.
+
+Sessions work with several gunicorn workers: whichever worker receives a chunk appends
+it to the session's spool WAV file; the worker that started the session runs a pump
+thread that tails the file into the streaming backend and writes the transcript so far
+to a small state file any worker can answer from. The same pump feeds finalized turns to
+an IncrementalSummarizer, so the meeting notes are mostly written by the time recording stops.
+
+    <UPLOAD_FOLDER>/live/<session id>.wav    spool (16-bit PCM, header patched on finish)
+    <UPLOAD_FOLDER>/live/<session id>.json   state: status, finalized turns, current partial, summary
+    <UPLOAD_FOLDER>/live/<session id>.done   written by the finish request
+
+Backends (LIVE_TRANSCRIPTION_BACKEND), behind the 'live_transcription' registry entry:
+    assemblyai  AssemblyAI streaming API (v3)
+    fake        FakeStreamingBackend: deterministic words from the audio length (tests, benchmarks)
+    off         live mode disabled; the recorder falls back to a normal upload
+"""
+import os
+import json
+import time
+import secrets
+import struct
+import threading
+from config import Config
+from services import registry
+from services.incremental_summary import IncrementalSummarizer
+from utils import metrics
+
+WAV_HEADER_BYTES = 44
+SAMPLE_WIDTH = 2  # 16-bit PCM
+PUMP_INTERVAL = 0.05  # Seconds between checks of the spool file when idle
+STATE_WRITE_INTERVAL = 0.2  # Partial transcripts are written at most this often
+
+
+class FakeStreamingBackend:
+    """
+    Streaming backend for tests and benchmarks: every `word_ms` of audio becomes one word
+    (taken from WORDS in order), and a turn is finalized every `turn_words` words
+    """
+
+    WORDS = ('we', 'reviewed', 'the', 'roadmap', 'and', 'agreed', 'to', 'ship', 'the',
+             'new', 'recorder', 'next', 'week', 'after', 'testing', 'it', 'with', 'users')
+
+    def __init__(self, word_ms=250, turn_words=12):
+        self.word_ms = word_ms
+        self.turn_words = turn_words
+
+    def open(self, sample_rate, on_partial, on_final):
+        return _FakeStream(self, sample_rate, on_partial, on_final)
+
+
+class _FakeStream:
+    def __init__(self, backend, sample_rate, on_partial, on_final):
+        self.bytes_per_word = sample_rate * SAMPLE_WIDTH * backend.word_ms // 1000
+        self.turn_words = backend.turn_words
+        self.on_partial, self.on_final = on_partial, on_final
+        self.received = 0
+        self.words = 0
+        self.turn = []
+
+    def send(self, pcm):
+        self.received += len(pcm)
+        while (self.words + 1) * self.bytes_per_word <= self.received:
+            self.turn.append(FakeStreamingBackend.WORDS[self.words % len(FakeStreamingBackend.WORDS)])
+            self.words += 1
+            if len(self.turn) == self.turn_words:
+                self.on_final(' '.join(self.turn).capitalize() + '.')
+                self.turn = []
+            else:
+                self.on_partial(' '.join(self.turn))
+
+    def finish(self):
+        if self.turn:
+            self.on_final(' '.join(self.turn).capitalize() + '.')
+            self.turn = []
+
+
+class AssemblyAIStreamingBackend:
+    """AssemblyAI streaming (v3) over its WebSocket API, one connection per session"""
+
+    def open(self, sample_rate, on_partial, on_final):
+        from assemblyai.streaming.v3 import (
+            StreamingClient, StreamingClientOptions, StreamingEvents, StreamingParameters
+        )
+
+        client = StreamingClient(StreamingClientOptions(api_key=Config.ASSEMBLYAI_API_KEY))
+        errors = []
+
+        def on_turn(_, event):
+            if not event.end_of_turn:
+                on_partial(event.transcript)
+            elif event.turn_is_formatted:
+                on_final(event.transcript)
+
+        client.on(StreamingEvents.Turn, on_turn)
+        client.on(StreamingEvents.Error, lambda _, error: errors.append(error))
+        client.connect(StreamingParameters(sample_rate=sample_rate, format_turns=True))
+        if errors:
+            raise Exception(str(errors[0]))
+        return _AssemblyAIStream(client, errors)
+
+
+class _AssemblyAIStream:
+    def __init__(self, client, errors):
+        self.client = client
+        self.errors = errors
+
+    def send(self, pcm):
+        self.client.stream(pcm)
+
+    def finish(self):
+        # Waits for the final turn and the termination message
+        self.client.disconnect(terminate=True)
+        if self.errors:
+            raise Exception(str(self.errors[0]))
+
+
+def _create_live_backend():
+    """Streaming backend named by LIVE_TRANSCRIPTION_BACKEND (None when live mode is off)"""
+    name = Config.LIVE_TRANSCRIPTION_BACKEND
+    if name == 'fake':
+        return FakeStreamingBackend()
+    if name == 'assemblyai':
+        return AssemblyAIStreamingBackend()
+    return None
+
+
+registry.register('live_transcription', _create_live_backend)
+
+
+def _paths(upload_folder, session_id):
+    base = os.path.join(upload_folder, 'live', session_id)
+    return {'spool': base + '.wav', 'state': base + '.json', 'done': base + '.done'}
+
+
+def _wav_header(sample_rate, data_bytes=0):
+    """44-byte header of a mono 16-bit PCM WAV file"""
+    return struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + data_bytes, b'WAVE', b'fmt ', 16, 1, 1,
+                       sample_rate, sample_rate * SAMPLE_WIDTH, SAMPLE_WIDTH, 8 * SAMPLE_WIDTH,
+                       b'data', data_bytes)
+
+
+def _write_state(path, state):
+    """Replace the state file atomically (readers in other workers never see a partial write)"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def read_state(upload_folder, session_id):
+    """State of a live session, or None when it does not exist"""
+    if not session_id.replace('-', '').replace('_', '').isalnum():
+        return None
+    try:
+        with open(_paths(upload_folder, session_id)['state']) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def received_bytes(upload_folder, session_id):
+    """PCM bytes received so far (the offset the next chunk must start at)"""
+    return os.path.getsize(_paths(upload_folder, session_id)['spool']) - WAV_HEADER_BYTES
+
+
+def append_audio(upload_folder, session_id, pcm):
+    """Append a chunk of 16-bit PCM to the session's spool file"""
+    with open(_paths(upload_folder, session_id)['spool'], 'ab') as f:
+        f.write(pcm)
+
+
+class _SessionPump:
+    """Tails a session's spool file into a backend stream and publishes the transcript"""
+
+    def __init__(self, paths, state, stream_factory):
+        self.paths = paths
+        self.state = state
+        self.lock = threading.Lock()
+        self.last_write = 0.0
+        self.summarizer = IncrementalSummarizer()
+        self.stream = stream_factory(self.on_partial, self.on_final)
+
+    def on_partial(self, text):
+        with self.lock:
+            self.state['partial'] = text
+            if time.monotonic() - self.last_write >= STATE_WRITE_INTERVAL:
+                self._publish()
+
+    def on_final(self, text):
+        with self.lock:
+            if text:
+                self.state['turns'].append(text)
+            self.state['partial'] = ''
+            self._publish()
+        if text:
+            self.summarizer.add(text)
+
+    def _handed_off(self):
+        """finish_session() is through with the session (it removes the state file last)"""
+        return not os.path.exists(self.paths['state'])
+
+    def _publish(self):
+        # A pump that outlived finish_session's timeout must not recreate the state file
+        if self._handed_off():
+            return
+        _write_state(self.paths['state'], self.state)
+        self.last_write = time.monotonic()
+
+    def _finish(self, status, error=None):
+        with self.lock:
+            self.state['status'] = status
+            self.state['error'] = error
+            self.state['partial'] = ''
+            self._publish()
+
+    def _close_quietly(self):
+        try:
+            self.stream.finish()
+        except Exception:
+            pass
+
+    def run(self):
+        sample_rate = self.state['sample_rate']
+        # Backends take 50 ms to 1 s of audio per message (AssemblyAI v3 rejects anything else)
+        max_chunk = sample_rate * SAMPLE_WIDTH
+        min_chunk = sample_rate * SAMPLE_WIDTH // 20
+        position = WAV_HEADER_BYTES
+        idle_since = time.monotonic()
+        try:
+            with open(self.paths['spool'], 'rb') as spool:
+                while True:
+                    # Checked before the size: once .done exists, the spool is complete
+                    done = os.path.exists(self.paths['done'])
+                    # Whole samples only: a chunk may still be being written
+                    available = (os.path.getsize(self.paths['spool']) - position) & ~1
+                    if available >= min_chunk or (done and available):
+                        spool.seek(position)
+                        pcm = spool.read(min(available, max_chunk))
+                        position += len(pcm)
+                        if len(pcm) < min_chunk:
+                            pcm += bytes(min_chunk - len(pcm))  # Tail of the recording, padded with silence
+                        self.stream.send(pcm)
+                        idle_since = time.monotonic()
+                        continue
+                    if done:
+                        break
+                    if self._handed_off():
+                        self._close_quietly()
+                        return
+                    if time.monotonic() - idle_since > Config.LIVE_IDLE_TIMEOUT:
+                        self._close_quietly()
+                        self._finish('expired', 'No audio received, the live session expired')
+                        metrics.inc('noteflow_live_sessions_total', outcome='expired')
+                        return
+                    time.sleep(PUMP_INTERVAL)
+            self.stream.finish()
+            with self.lock:
+                self.state['summarizing'] = True
+            self._finish('final')
+        except Exception as e:
+            print(f"Live transcription failed: {e}")
+            self._finish('failed', str(e))
+            return
+
+        # The transcript is out; the notes only need the sections still queued and a merge
+        try:
+            summary = self.summarizer.finish()
+        except Exception as e:
+            print(f"Live summary merge failed: {e}")
+            summary = None
+        with self.lock:
+            self.state['summary'] = summary
+            self.state['summarizing'] = False
+            self._publish()
+
+
+def start_session(upload_folder, user_id, sample_rate):
+    """
+    Open a live session and its backend stream, and start the pump thread in this worker
+
+    Args:
+        upload_folder: Upload directory (shared by all workers)
+        user_id: Owner of the session
+        sample_rate: Sample rate of the PCM the recorder will send
+
+    Returns:
+        str: session ID, or None when live mode is off
+    """
+    backend = registry.get('live_transcription')
+    if backend is None:
+        return None
+
+    os.makedirs(os.path.join(upload_folder, 'live'), exist_ok=True)
+    _purge_stale(os.path.join(upload_folder, 'live'))
+
+    session_id = secrets.token_urlsafe(16)
+    paths = _paths(upload_folder, session_id)
+    with open(paths['spool'], 'wb') as f:
+        f.write(_wav_header(sample_rate))
+    state = {'user_id': user_id, 'sample_rate': sample_rate, 'status': 'streaming',
+             'turns': [], 'partial': '', 'error': None, 'summary': None, 'summarizing': False,
+             'started_at': time.time()}
+    _write_state(paths['state'], state)
+
+    try:
+        pump = _SessionPump(paths, state, lambda on_partial, on_final: backend.open(sample_rate, on_partial, on_final))
+    except Exception:
+        _remove(paths['spool'], paths['state'])
+        metrics.inc('noteflow_live_sessions_total', outcome='backend_error')
+        raise
+    threading.Thread(target=pump.run, name=f'live-{session_id[:8]}', daemon=True).start()
+    return session_id
+
+
+def finish_session(upload_folder, session_id, timeout=None):
+    """
+    Stop a session and wait for its final transcript and incremental summary
+
+    When the pump does not deliver the transcript in time (its worker restarted, the
+    backend failed), the spooled recording is transcribed in one batch instead.
+
+    Returns:
+        tuple: (transcript, recording path, summary) - the recording is moved out of the
+        live directory into the upload folder as a playable WAV file; summary is None when
+        the incremental summary is not available (summarize the transcript instead)
+    """
+    from services.transcription import transcribe_audio
+
+    paths = _paths(upload_folder, session_id)
+    started = time.monotonic()
+    with open(paths['done'], 'w'):
+        pass
+
+    deadline = started + (timeout or Config.LIVE_FINISH_TIMEOUT)
+    state = read_state(upload_folder, session_id)
+    while state and state['status'] == 'streaming' and time.monotonic() < deadline:
+        time.sleep(PUMP_INTERVAL)
+        state = read_state(upload_folder, session_id)
+
+    data_bytes = received_bytes(upload_folder, session_id)
+    with open(paths['spool'], 'r+b') as f:
+        f.write(_wav_header(state['sample_rate'] if state else 16000, data_bytes))
+    recording = os.path.join(upload_folder, f"{int(time.time())}_live_{session_id}.wav")
+    os.replace(paths['spool'], recording)
+
+    summary = None
+    if state and state['status'] == 'final':
+        transcript = ' '.join(state['turns'])
+        metrics.inc('noteflow_live_sessions_total', outcome='final')
+        deadline = time.monotonic() + (timeout or Config.LIVE_FINISH_TIMEOUT)
+        while state.get('summarizing') and time.monotonic() < deadline:
+            time.sleep(PUMP_INTERVAL)
+            state = read_state(upload_folder, session_id) or {}
+        summary = state.get('summary')
+    else:
+        print(f"Live session {session_id} has no final transcript ({state and state['status']}), transcribing the recording")
+        transcript = transcribe_audio(recording)
+        metrics.inc('noteflow_live_sessions_total', outcome='batch_fallback')
+    metrics.observe('noteflow_live_finalize_seconds', time.monotonic() - started)
+
+    _remove(paths['state'], paths['done'])
+    return transcript, recording, summary
+
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _purge_stale(live_dir):
+    """Delete files of sessions abandoned longer than LIVE_SESSION_MAX_AGE ago"""
+    cutoff = time.time() - Config.LIVE_SESSION_MAX_AGE
+    for name in os.listdir(live_dir):
+        path = os.path.join(live_dir, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
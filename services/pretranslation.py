@@ -0,0 +1,88 @@
+"""
+Background pretranslation: new summaries are translated into their owner's preferred
+languages and stored, so choosing one of those languages is a database read
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from models.meeting import db, Translation
+from models.user import User
+from services.translation import (
+    CONTENT_MODELS, translate_document, save_translation, source_hash, normalize_language
+)
+from utils import metrics
+from utils.db_pool import released_connection
+
+
+class Pretranslator:
+    """
+    Small thread pool translating stored summaries after they are created.
+    The pool is started lazily on first submit (safe with gunicorn --preload).
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.num_workers = 2
+        self._executor = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Bind the pretranslator to the Flask app (workers need an app context)"""
+        self.app = app
+        self.num_workers = app.config.get('PRETRANSLATION_WORKERS', 2)
+        app.extensions['pretranslator'] = self
+
+    def submit(self, content_type, content_id, user_id):
+        """Queue the summary of a new meeting/book/video for the user's preferred languages"""
+        if self.app is None or self.num_workers < 1:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix='pretranslate')
+        self._executor.submit(self._run, content_type, content_id, user_id)
+
+    def _run(self, content_type, content_id, user_id):
+        with self.app.app_context():
+            try:
+                pretranslate(content_type, content_id, user_id)
+            except Exception as e:
+                print(f"Pretranslation of {content_type} {content_id} failed: {e}")
+            finally:
+                db.session.remove()
+
+
+def pretranslate(content_type, content_id, user_id, field='summary'):
+    """
+    Translate a content field into each of the user's preferred languages that has no
+    translation of the current text yet
+
+    Returns:
+        int: Number of translations stored
+    """
+    user = db.session.get(User, user_id)
+    content = db.session.get(CONTENT_MODELS[content_type], content_id)
+    languages = user.preferred_language_list if user else []
+    source = getattr(content, field, None) if content else None
+    if not languages or not source:
+        return 0
+
+    current = {
+        language for language, in Translation.query.filter_by(
+            content_type=content_type, content_id=content_id, field=field, source_hash=source_hash(source)
+        ).with_entities(Translation.language)
+    }
+
+    stored = 0
+    for language in languages:
+        if normalize_language(language) in current:
+            continue
+        with released_connection(db.session), metrics.timed('noteflow_stage_seconds', stage='pretranslate'):
+            translated = translate_document(source, language)
+        save_translation(content_type, content_id, field, language, source, translated)
+        metrics.inc('noteflow_pretranslations_total', content_type=content_type)
+        stored += 1
+    return stored
+
+
+pretranslator = Pretranslator()
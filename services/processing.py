@@ -0,0 +1,255 @@
+"""
+Processing pipelines shared by the upload routes and the batch worker pool
+"""
+import os
+import time
+import hashlib
+from datetime import datetime
+from werkzeug.utils import secure_filename
+from models.meeting import db, Meeting, Book, BookChapter, Video
+from services.transcription import transcribe_audio
+from services.live_transcription import finish_session
+from services.summarization import generate_summary, summarize_book, summarize_book_overview, summarize_book_chapter
+from services.book_extraction import extract_book_metadata, extract_chapters_from_book, get_book_title_from_text
+from services.video_extraction import get_youtube_transcript, get_video_title_from_url
+from services.pretranslation import pretranslator
+from services.transcript_compaction import compact_transcript
+from utils.video_utils import extract_audio_from_video, cleanup_file
+from utils import metrics
+from utils.db_pool import released_connection
+
+# Characters of book text stored on Book.full_text and per BookChapter
+BOOK_TEXT_MAX_CHARS = 50000
+
+
+def save_uploaded_file(file, upload_folder, prefix=None):
+    """
+    Save an uploaded file under a timestamped name, hashing it while writing
+
+    Args:
+        file: werkzeug FileStorage
+        upload_folder: Destination directory
+        prefix: Optional extra prefix (e.g. batch position) to keep names unique
+
+    Returns:
+        tuple: (stored filename, full path, sha256 hex digest of the content)
+    """
+    filename = secure_filename(file.filename)
+    # Add timestamp to avoid filename conflicts
+    timestamp = str(int(time.time()))
+    filename = f"{timestamp}_{prefix}_{filename}" if prefix is not None else f"{timestamp}_{filename}"
+    filepath = os.path.join(upload_folder, filename)
+
+    sha256 = hashlib.sha256()
+    with metrics.timed('noteflow_stage_seconds', stage='file_save'), open(filepath, 'wb') as out:
+        while True:
+            chunk = file.stream.read(1024 * 1024)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            out.write(chunk)
+
+    return filename, filepath, sha256.hexdigest()
+
+
+def process_audio_file(filepath, filename, title, user_id):
+    """Transcribe and summarize an audio file, store it as a Meeting"""
+    # No DB connection is held while waiting on AssemblyAI and Groq
+    with released_connection(db.session):
+        transcript = transcribe_audio(filepath)
+        summary = generate_summary(compact_transcript(transcript, 'assemblyai').text)
+
+    meeting = Meeting(
+        title=title,
+        audio_filename=filename,
+        transcript=transcript,
+        summary=summary,
+        user_id=user_id
+    )
+    db.session.add(meeting)
+    db.session.commit()
+    pretranslator.submit('meeting', meeting.id, user_id)
+    return meeting
+
+
+def process_live_recording(upload_folder, session_id, title, user_id):
+    """
+    Finish a live transcription session and store it as a Meeting
+
+    The transcript is already (almost) complete when recording stops and the notes were
+    summarized section by section while recording, so this is the final turn plus a merge
+    instead of an upload, a batch transcription and a full summary.
+    """
+    with released_connection(db.session):
+        transcript, recording, summary = finish_session(upload_folder, session_id)
+        if not transcript.strip():
+            cleanup_file(recording)
+            raise Exception("No speech was detected in the recording")
+        if not summary:
+            summary = generate_summary(compact_transcript(transcript, 'live').text)
+
+    meeting = Meeting(
+        title=title,
+        audio_filename=os.path.basename(recording),
+        transcript=transcript,
+        summary=summary,
+        user_id=user_id
+    )
+    db.session.add(meeting)
+    db.session.commit()
+    pretranslator.submit('meeting', meeting.id, user_id)
+    return meeting
+
+
+def process_book_file(filepath, filename, original_filename, user_id):
+    """
+    Extract a book file into chapters, summarize it, store it as a Book with its BookChapters
+
+    Title, author, language and page count come from the file's embedded metadata; only
+    when it has no usable title is the start of the text scanned for one.
+
+    Books with several chapters get one overview call (table of contents plus an excerpt
+    of each chapter); chapter summaries are generated on demand by summarize_chapter().
+    """
+    file_type = original_filename.rsplit('.', 1)[1].lower()
+
+    with released_connection(db.session):
+        metadata = extract_book_metadata(filepath, file_type)
+        chapters = extract_chapters_from_book(filepath, file_type, max_chars=BOOK_TEXT_MAX_CHARS)
+        full_text = _leading_text(chapters, BOOK_TEXT_MAX_CHARS)
+        book_title = metadata.title or get_book_title_from_text(full_text, original_filename)
+        if len(chapters) > 1:
+            summary = summarize_book_overview(book_title, chapters)
+        else:
+            summary = summarize_book(full_text)
+
+    book = Book(
+        title=book_title,
+        author=metadata.author,
+        language=metadata.language,
+        page_count=metadata.page_count,
+        book_filename=filename,
+        file_type=file_type,
+        full_text=full_text,
+        summary=summary,
+        user_id=user_id
+    )
+    book.chapters = [
+        BookChapter(position=position, title=chapter.title[:300] if chapter.title else None,
+                    text=chapter.text, char_count=chapter.char_count)
+        for position, chapter in enumerate(chapters)
+    ]
+    db.session.add(book)
+    db.session.commit()
+    pretranslator.submit('book', book.id, user_id)
+    return book
+
+
+def summarize_chapter(chapter):
+    """
+    Return a chapter's summary, generating and caching it on first request
+
+    When two requests race, the first stored summary wins and both return it.
+    """
+    if chapter.summary:
+        return chapter.summary
+
+    text, chapter_title, book_title = chapter.text, chapter.title, chapter.book.title
+    with released_connection(db.session):
+        summary = summarize_book_chapter(text, chapter_title=chapter_title, book_title=book_title)
+
+    BookChapter.query.filter(BookChapter.id == chapter.id, BookChapter.summary.is_(None)).update(
+        {'summary': summary, 'summarized_at': datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+    db.session.refresh(chapter)
+    return chapter.summary
+
+
+def _leading_text(chapters, max_chars):
+    """The first `max_chars` characters of the chapters joined by blank lines (without joining the whole book)"""
+    parts, size = [], 0
+    for chapter in chapters:
+        part = chapter.text[:max_chars - size]
+        parts.append(part)
+        size += len(part) + 2
+        if size >= max_chars:
+            break
+    return '\n\n'.join(parts)[:max_chars]
+
+
+def process_video_file(video_filepath, filename, title, user_id):
+    """Extract audio from a video file, transcribe and summarize it, store it as a Video"""
+    audio_filepath = None
+    try:
+        with released_connection(db.session):
+            audio_filepath = extract_audio_from_video(video_filepath)
+            transcript = transcribe_audio(audio_filepath)
+            summary = summarize_book(compact_transcript(transcript, 'assemblyai').text)
+
+        video = Video(
+            title=title,  # Original filename as title
+            video_url=filename,  # Store filename in video_url field
+            video_id='file_upload',
+            transcript=transcript[:50000],
+            summary=summary,
+            user_id=user_id
+        )
+        db.session.add(video)
+        db.session.commit()
+        pretranslator.submit('video', video.id, user_id)
+        return video
+    finally:
+        # Cleanup: Delete extracted audio file to save space
+        if audio_filepath:
+            cleanup_file(audio_filepath)
+        # Optionally delete original video file to save space
+        # Uncomment the line below if you don't need to keep video files
+        # cleanup_file(video_filepath)
+
+
+def process_youtube_url(video_url, user_id):
+    """
+    Fetch a YouTube transcript, summarize it, store it as a Video
+
+    Raises:
+        ValueError: With a user-facing message when the transcript can't be retrieved
+    """
+    with released_connection(db.session):
+        result = get_youtube_transcript(video_url)
+    return store_youtube_transcript(result, video_url, user_id)
+
+
+def store_youtube_transcript(result, video_url, user_id):
+    """
+    Summarize a fetched YouTube transcript and store it as a Video (second half of process_youtube_url)
+
+    Args:
+        result (dict): Return value of get_youtube_transcript / get_youtube_transcript_async
+
+    Raises:
+        ValueError: With a user-facing message when the transcript couldn't be retrieved
+    """
+    if not result['success']:
+        err = result.get('error', 'Unknown error')
+        # Use error as-is when it's already user-friendly (e.g. starts with ⚠️)
+        raise ValueError(err if err.strip().startswith('⚠️') else f"Failed to get transcript: {err}")
+
+    transcript = result['transcript']
+    video_id = result['video_id']
+    video_title = get_video_title_from_url(video_url)
+    with released_connection(db.session):
+        summary = summarize_book(compact_transcript(transcript, 'captions').text)
+
+    video = Video(
+        title=video_title,
+        video_url=video_url,
+        video_id=video_id,
+        transcript=transcript[:50000],  # Store first 50k chars
+        summary=summary,
+        user_id=user_id
+    )
+    db.session.add(video)
+    db.session.commit()
+    pretranslator.submit('video', video.id, user_id)
+    return video
@@ -0,0 +1,62 @@
+"""
+Lazy service registry: SDK clients and heavy libraries are created on first use, not at import
+
+Service modules register a factory at import time (cheap) and resolve it when work
+actually needs it, so gunicorn workers, `flask db ...` and scripts only pay for the
+SDKs they use.
+
+    register('groq', _create_groq_client)
+    client = get('groq')        # imported and constructed once, thread-safe
+    override('groq', fake)      # benchmarks/tests: replace a service
+"""
+import time
+import threading
+
+_factories = {}  # name -> zero-argument factory
+_instances = {}  # name -> created service
+_load_seconds = {}  # name -> time the factory took (imports + construction)
+_lock = threading.RLock()
+
+
+def register(name, factory):
+    """Register (or replace) the factory for a service; nothing is imported yet"""
+    with _lock:
+        _factories[name] = factory
+        _instances.pop(name, None)
+
+
+def get(name):
+    """Return the service, creating it on first use"""
+    try:
+        return _instances[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _instances:
+            if name not in _factories:
+                raise KeyError(f"Unknown service: {name}")
+            started = time.perf_counter()
+            _instances[name] = _factories[name]()
+            _load_seconds[name] = time.perf_counter() - started
+        return _instances[name]
+
+
+def override(name, instance):
+    """Use `instance` for a service instead of calling its factory"""
+    with _lock:
+        _instances[name] = instance
+
+
+def reset(name=None):
+    """Forget created services (all, or one) so the next get() calls the factory again"""
+    with _lock:
+        if name is None:
+            _instances.clear()
+        else:
+            _instances.pop(name, None)
+
+
+def loaded():
+    """Services created so far in this process, with their load time in milliseconds"""
+    with _lock:
+        return {name: round(_load_seconds.get(name, 0.0) * 1000, 1) for name in _instances}
@@ -1,15 +1,62 @@
 """
 AI summarization service for meeting notes using Groq
 """
-from openai import OpenAI
+import asyncio
 from config import Config
+from services import registry
+from services.http_clients import http_client, async_http_client
+from utils import metrics, deadlines
 import re
 
-# Groq uses OpenAI-compatible API
-client = OpenAI(
-    api_key=Config.GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1"
-)
+
+def _create_groq_client():
+    # Groq uses OpenAI-compatible API (the openai package is imported on first use)
+    from openai import OpenAI
+    return OpenAI(
+        api_key=Config.GROQ_API_KEY,
+        base_url=Config.GROQ_BASE_URL,
+        http_client=http_client('groq')  # Shared keep-alive pool
+    )
+
+
+registry.register('groq', _create_groq_client)
+
+# Async client for the ASGI entry point, created per event loop (its connection pool is loop-bound)
+_async_client = {'loop': None, 'client': None}
+
+
+def get_async_client():
+    """Return the AsyncOpenAI client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    if _async_client['loop'] is not loop:
+        from openai import AsyncOpenAI
+        _async_client['client'] = AsyncOpenAI(api_key=Config.GROQ_API_KEY, base_url=Config.GROQ_BASE_URL,
+                                               http_client=async_http_client('groq'))
+        _async_client['loop'] = loop
+    return _async_client['client']
+
+
+def classify_api_error(error):
+    """
+    Classify an API error into a coarse category (used for messages and error metrics)
+
+    Args:
+        error: Exception from API call
+
+    Returns:
+        str: One of 'rate_limit', 'quota', 'auth', 'timeout', 'other'
+    """
+    error_str = str(error).lower()
+
+    if 'rate_limit' in error_str or '429' in error_str:
+        return 'rate_limit'
+    if 'quota' in error_str or 'insufficient' in error_str:
+        return 'quota'
+    if 'auth' in error_str or '401' in error_str or '403' in error_str:
+        return 'auth'
+    if 'timeout' in error_str:
+        return 'timeout'
+    return 'other'
 
 
 def format_api_error(error):
@@ -23,9 +70,11 @@ def format_api_error(error):
         str: User-friendly error message
     """
     error_str = str(error)
+    category = classify_api_error(error)
+    metrics.inc('noteflow_errors_total', source='groq', category=category)
 
     # Check for rate limit error
-    if 'rate_limit' in error_str.lower() or '429' in error_str:
+    if category == 'rate_limit':
         # Extract wait time if available
         wait_time_match = re.search(r'try again in (\d+)m', error_str)
         if wait_time_match:
@@ -35,21 +84,58 @@ def format_api_error(error):
             return "⏳ Rate limit reached. Please wait a few minutes and try again, or upgrade your plan for higher limits."
 
     # Check for quota/billing errors
-    if 'quota' in error_str.lower() or 'insufficient' in error_str.lower():
+    if category == 'quota':
         return "💳 API quota exceeded. Please check your billing at https://console.groq.com/settings/billing"
 
     # Check for authentication errors
-    if 'auth' in error_str.lower() or '401' in error_str or '403' in error_str:
+    if category == 'auth':
         return "🔑 Authentication error. Please check your API key configuration."
 
     # Check for timeout errors
-    if 'timeout' in error_str.lower():
+    if category == 'timeout':
         return "⏱️ Request timed out. Please try again."
 
     # Generic error
     return f"❌ An error occurred: {error_str[:200]}"
 
 
+def _chat_completion(operation, **kwargs):
+    """
+    Call the Groq chat completions API, recording latency and token usage
+
+    Args:
+        operation (str): Metric label for the caller (e.g. 'summary', 'translate')
+        **kwargs: Arguments for chat.completions.create
+
+    Returns:
+        The API response
+    """
+    # Don't wait on Groq past the calling request's deadline (no-op outside requests)
+    timeout = deadlines.remaining()
+    if timeout is not None:
+        kwargs.setdefault('timeout', timeout)
+
+    with metrics.timed('noteflow_groq_request_seconds', operation=operation):
+        response = registry.get('groq').chat.completions.create(**kwargs)
+    _record_usage(operation, response)
+    return response
+
+
+async def _chat_completion_async(operation, **kwargs):
+    """Async variant of _chat_completion on the event loop's AsyncOpenAI client"""
+    with metrics.timed('noteflow_groq_request_seconds', operation=operation):
+        response = await get_async_client().chat.completions.create(**kwargs)
+    _record_usage(operation, response)
+    return response
+
+
+def _record_usage(operation, response):
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        metrics.observe('noteflow_groq_prompt_tokens', usage.prompt_tokens or 0, buckets=metrics.TOKEN_BUCKETS, operation=operation)
+        metrics.observe('noteflow_groq_completion_tokens', usage.completion_tokens or 0, buckets=metrics.TOKEN_BUCKETS, operation=operation)
+
+
 def _remove_empty_sections(summary_text):
     """Remove sections that only contain 'None mentioned in the transcript.' (and the section header)."""
     if not summary_text or "None mentioned" not in summary_text:
@@ -67,22 +153,8 @@ def _remove_empty_sections(summary_text):
     return result.strip()
 
 
-def generate_summary(transcript):
-    """
-    Generate structured meeting notes from transcript
-
-    Args:
-        transcript (str): Meeting transcript text
-
-    Returns:
-        str: Formatted meeting notes with summary, action items, etc.
-    """
-    prompt = f"""
-    You are an AI assistant that converts meeting transcripts into well-organized, structured notes.
-
-    Please analyze the following transcript and create a summary using this EXACT format:
-
-    📝 1. Summary
+# Output format of meeting notes (generate_summary, merge_section_summaries)
+MEETING_NOTES_FORMAT = """📝 1. Summary
 
     Write 2-3 clear sentences summarizing the main topic and purpose. Each sentence should be on its own line.
 
@@ -124,14 +196,33 @@ def generate_summary(transcript):
     - Add blank lines between sections
     - Each sentence and item must be on its own separate line
     - Use hierarchical numbering (1, 2, 3 for main sections; 2.1, 2.2, 3.1, 3.2 for sub-items)
-    - Be clear and concise
+    - Be clear and concise"""
+
+
+def generate_summary(transcript):
+    """
+    Generate structured meeting notes from transcript
+
+    Args:
+        transcript (str): Meeting transcript text
+
+    Returns:
+        str: Formatted meeting notes with summary, action items, etc.
+    """
+    prompt = f"""
+    You are an AI assistant that converts meeting transcripts into well-organized, structured notes.
+
+    Please analyze the following transcript and create a summary using this EXACT format:
+
+    {MEETING_NOTES_FORMAT}
 
     Transcript:
     {transcript}
     """
 
     try:
-        response = client.chat.completions.create(
+        response = _chat_completion(
+            'summary',
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that creates structured meeting notes."},
@@ -149,18 +240,150 @@ def generate_summary(transcript):
         raise Exception(friendly_error)
 
 
-def translate_text(text, target_language):
+def summarize_transcript_section(section_text, section_number, max_chars=1500):
     """
-    Translate text to target language using Groq
+    Compact notes on one section of a transcript that is still being recorded
 
     Args:
-        text (str): Text to translate
-        target_language (str): Target language (e.g., "Spanish", "French", "Arabic")
+        section_text (str): Transcript of the section
+        section_number (int): Position of the section in the meeting (1-based)
+        max_chars (int): Upper bound on the returned notes
 
     Returns:
-        str: Translated text
+        str: Section notes (topics, decisions, action items)
     """
     prompt = f"""
+    The following is part {section_number} of a meeting transcript that is still going on.
+    Write compact notes on this part only; they will be merged with the notes on the other parts.
+
+    Include:
+    - Topics discussed, with the key facts, names and numbers
+    - Decisions made
+    - Action items (with responsible party if mentioned)
+    - Open questions or next steps
+
+    IMPORTANT:
+    - Return ONLY the notes as short "- " bullet lines, no headers or commentary
+    - Skip small talk and filler
+    - Keep it under {max_chars // 6} words
+
+    Transcript part {section_number}:
+    {section_text}
+    """
+
+    try:
+        response = _chat_completion(
+            'summary_section',
+            model="llama-3.3-70b-versatile",
+            messages=[
+                {"role": "system", "content": "You take concise notes on meeting transcripts."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=500
+        )
+
+        return response.choices[0].message.content.strip()[:max_chars]
+    except Exception as e:
+        friendly_error = format_api_error(e)
+        raise Exception(friendly_error)
+
+
+def condense_section_summaries(earlier_notes, later_notes, max_chars=1500):
+    """
+    Combine the notes on two consecutive transcript sections into one, so the notes on a
+    long meeting stay bounded
+
+    Returns:
+        str: Combined notes in the same bullet format
+    """
+    prompt = f"""
+    Combine these notes on two consecutive parts of a meeting into one set of notes.
+
+    Earlier part:
+    {earlier_notes}
+
+    Later part:
+    {later_notes}
+
+    IMPORTANT:
+    - Return ONLY the combined notes as short "- " bullet lines
+    - Keep every decision and action item; merge repeated topics
+    - Keep it under {max_chars // 6} words
+    """
+
+    try:
+        response = _chat_completion(
+            'summary_condense',
+            model="llama-3.3-70b-versatile",
+            messages=[
+                {"role": "system", "content": "You take concise notes on meeting transcripts."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=500
+        )
+
+        return response.choices[0].message.content.strip()[:max_chars]
+    except Exception as e:
+        friendly_error = format_api_error(e)
+        raise Exception(friendly_error)
+
+
+def merge_section_summaries(section_notes, tail_transcript=''):
+    """
+    Final meeting notes from the notes on each section plus the end of the transcript not
+    yet covered by them: reads a few KB of notes instead of the whole transcript
+
+    Args:
+        section_notes (list): Notes on consecutive sections, in order
+        tail_transcript (str): Transcript after the last summarized section
+
+    Returns:
+        str: Meeting notes in the generate_summary format
+    """
+    if not section_notes:
+        return generate_summary(tail_transcript)
+
+    notes = "\n\n".join(f"Part {number}:\n{text}" for number, text in enumerate(section_notes, 1))
+    tail = f"""
+
+    Transcript of the last minutes (not covered by the notes above):
+    {tail_transcript}""" if tail_transcript.strip() else ''
+
+    prompt = f"""
+    You are an AI assistant that converts meeting notes into well-organized, structured notes.
+
+    Below are notes taken on consecutive parts of a meeting. Combine them into a summary of the
+    whole meeting using this EXACT format:
+
+    {MEETING_NOTES_FORMAT}
+
+    Notes:
+    {notes}{tail}
+    """
+
+    try:
+        response = _chat_completion(
+            'summary_merge',
+            model="llama-3.3-70b-versatile",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that creates structured meeting notes."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=1000
+        )
+
+        return _remove_empty_sections(response.choices[0].message.content)
+    except Exception as e:
+        friendly_error = format_api_error(e)
+        raise Exception(friendly_error)
+
+
+def _translation_request(text, target_language):
+    """Chat completion arguments for a translation"""
+    prompt = f"""
     Translate the following text to {target_language}.
 
     IMPORTANT RULES:
@@ -174,16 +397,35 @@ def translate_text(text, target_language):
     {text}
     """
 
+    return dict(
+        model="llama-3.3-70b-versatile",
+        messages=[
+            {"role": "system", "content": f"You are a professional translator. Translate ONLY to {target_language} without including the original text. Return only the translation, nothing else."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=2000
+    )
+
+
+def translate_text(text, target_language, timeout=None):
+    """
+    Translate text to target language using Groq (in one request; long texts go through
+    services.translation.translate_document)
+
+    Args:
+        text (str): Text to translate
+        target_language (str): Target language (e.g., "Spanish", "French", "Arabic")
+        timeout (float): Request timeout, for calls made outside the request's thread
+
+    Returns:
+        str: Translated text
+    """
+    request = _translation_request(text, target_language)
+    if timeout is not None:
+        request['timeout'] = timeout
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": f"You are a professional translator. Translate ONLY to {target_language} without including the original text. Return only the translation, nothing else."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=2000
-        )
+        response = _chat_completion('translate', **request)
 
         translation = response.choices[0].message.content
         return translation
@@ -192,6 +434,15 @@ def translate_text(text, target_language):
         raise Exception(friendly_error)
 
 
+async def translate_text_async(text, target_language):
+    """Async variant of translate_text (same prompt, same errors)"""
+    try:
+        response = await _chat_completion_async('translate', **_translation_request(text, target_language))
+        return response.choices[0].message.content
+    except Exception as e:
+        raise Exception(format_api_error(e))
+
+
 def extract_action_items(transcript):
     """
     Extract specific action items from transcript
@@ -211,7 +462,8 @@ def extract_action_items(transcript):
     """
 
     try:
-        response = client.chat.completions.create(
+        response = _chat_completion(
+            'action_items',
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": "You extract action items from meeting transcripts."},
@@ -265,7 +517,8 @@ def summarize_book(book_text, max_length=10000):
     """
 
     try:
-        response = client.chat.completions.create(
+        response = _chat_completion(
+            'book_summary',
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": "You are an expert at analyzing and summarizing books."},
@@ -281,18 +534,138 @@ def summarize_book(book_text, max_length=10000):
         friendly_error = format_api_error(e)
         raise Exception(friendly_error)
 
-def chat_with_context(user_message, summary=None, transcript=None):
+
+def summarize_book_overview(book_title, chapters, max_length=10000):
     """
-    Handle conversational AI with context from processed content
-    
+    Summarize a whole book in one call from its table of contents and an excerpt of every chapter
+
     Args:
-        user_message (str): User's message/question
-        summary (str): Summary of processed content (optional)
-        transcript (str): Full transcript/text (optional)
-        
+        book_title (str): Title of the book
+        chapters (list): Chapter (title, text, ...) tuples in reading order
+        max_length (int): Characters of chapter excerpts to send in total
+
     Returns:
-        str: AI's response
+        str: Summary in the summarize_book format
+    """
+    excerpt_chars = max(300, max_length // max(1, len(chapters)))
+    contents = []
+    excerpts = []
+    for number, (title, text, *_) in enumerate(chapters, 1):
+        heading = title or f"Chapter {number}"
+        contents.append(f"{number}. {heading}")
+        excerpt = text[:excerpt_chars]
+        excerpts.append(f"[{heading}]\n{excerpt}{'...' if len(text) > excerpt_chars else ''}")
+
+    overview_text = (
+        f"Title: {book_title}\n\nTable of contents:\n" + "\n".join(contents)
+        + "\n\nOpening of each chapter:\n\n" + "\n\n".join(excerpts)
+    )
+    return summarize_book(overview_text, max_length=len(overview_text))
+
+
+def summarize_book_chapter(chapter_text, chapter_title=None, book_title=None, max_length=10000):
+    """
+    Summarize a single chapter of a book
+
+    Args:
+        chapter_text (str): Text of the chapter
+        chapter_title (str): Title of the chapter, if known
+        book_title (str): Title of the book, if known
+        max_length (int): Maximum characters to process (to avoid token limits)
+
+    Returns:
+        str: Chapter summary with key points
+    """
+    if len(chapter_text) > max_length:
+        chapter_text = chapter_text[:max_length] + "..."
+
+    prompt = f"""
+    Summarize the following chapter{f' "{chapter_title}"' if chapter_title else ''}{f' of the book "{book_title}"' if book_title else ''}.
+
+    Please provide:
+
+    📖 SUMMARY
+    Write 1-2 paragraphs covering the chapter's main ideas and arguments.
+
+    🔑 KEY POINTS
+    List 3-6 of the most important points.
+    Format each as: "• Point description"
+
+    Keep the language clear and accessible.
+
+    Chapter text:
+    {chapter_text}
     """
+
+    try:
+        response = _chat_completion(
+            'book_chapter_summary',
+            model="llama-3.3-70b-versatile",
+            messages=[
+                {"role": "system", "content": "You are an expert at analyzing and summarizing books."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=800
+        )
+
+        return response.choices[0].message.content
+    except Exception as e:
+        friendly_error = format_api_error(e)
+        raise Exception(friendly_error)
+
+
+def summarize_conversation(previous_summary, messages, max_chars=2000):
+    """
+    Fold older chat turns into a rolling conversation summary
+
+    Args:
+        previous_summary (str): Current rolling summary (optional)
+        messages (list): Dicts with 'role' and 'content' that are leaving the verbatim window
+        max_chars (int): Upper bound on the returned summary length
+
+    Returns:
+        str: Updated rolling summary
+    """
+    turns = "\n".join(f"{m['role'].capitalize()}: {m['content']}" for m in messages)
+
+    prompt = f"""
+    Update the running summary of a conversation between a user and NoteFlow AI.
+
+    Current summary:
+    {previous_summary or "(empty)"}
+
+    New messages to add:
+    {turns}
+
+    IMPORTANT:
+    - Return ONLY the updated summary, no commentary
+    - Keep facts, names, numbers, decisions and open questions the user may refer back to
+    - Drop greetings and filler
+    - Keep it under {max_chars // 6} words
+    """
+
+    try:
+        response = _chat_completion(
+            'conversation_memory',
+            model="llama-3.3-70b-versatile",
+            messages=[
+                {"role": "system", "content": "You maintain compact running summaries of conversations."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=500
+        )
+
+        summary = response.choices[0].message.content.strip()
+        return summary[:max_chars]
+    except Exception as e:
+        friendly_error = format_api_error(e)
+        raise Exception(friendly_error)
+
+
+def _chat_request(user_message, summary=None, transcript=None, history=None, memory_summary=None):
+    """Chat completion arguments for a conversational turn (see chat_with_context)"""
     # Build context for AI
     context = ""
     if summary:
@@ -329,19 +702,49 @@ Be concise, helpful, and friendly."""
         
         prompt = user_message
     
+    messages = [{"role": "system", "content": system_prompt}]
+    if memory_summary:
+        messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{memory_summary}"})
+    for message in history or []:
+        messages.append({"role": message['role'], "content": message['content']})
+    messages.append({"role": "user", "content": prompt})
+
+    return dict(
+        model="llama-3.3-70b-versatile",
+        messages=messages,
+        temperature=0.7,
+        max_tokens=1000
+    )
+
+
+def chat_with_context(user_message, summary=None, transcript=None, history=None, memory_summary=None):
+    """
+    Handle conversational AI with context from processed content
+    
+    Args:
+        user_message (str): User's message/question
+        summary (str): Summary of processed content (optional)
+        transcript (str): Full transcript/text (optional)
+        history (list): Recent messages as dicts with 'role' and 'content' (optional)
+        memory_summary (str): Rolling summary of older turns of the conversation (optional)
+        
+    Returns:
+        str: AI's response
+    """
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
+        response = _chat_completion('chat', **_chat_request(user_message, summary, transcript, history, memory_summary))
         
         ai_response = response.choices[0].message.content
         return ai_response
     except Exception as e:
         friendly_error = format_api_error(e)
         raise Exception(friendly_error)
+
+
+async def chat_with_context_async(user_message, summary=None, transcript=None, history=None, memory_summary=None):
+    """Async variant of chat_with_context (same prompt, same errors)"""
+    try:
+        response = await _chat_completion_async('chat', **_chat_request(user_message, summary, transcript, history, memory_summary))
+        return response.choices[0].message.content
+    except Exception as e:
+        raise Exception(format_api_error(e))
@@ -0,0 +1,126 @@
+"""
+Transcript compaction before summarization
+
+Speech transcripts (AssemblyAI, live) and YouTube captions carry disfluencies the summary
+doesn't need: fillers ("um", "uh", ", you know,"), stuttered words ("I I think") and, in
+auto-generated captions, phrases repeated across cues. compact_transcript() removes them
+with one precompiled regex and then a single pass over the words that drops any n-gram
+(up to TRANSCRIPT_MAX_NGRAM words) immediately repeating the one before it. Repeats
+containing a number ("the vote was 2 2") and doubles that are correct grammar ("had had")
+are kept. The stored transcript is untouched; only the text sent to the LLM is compacted.
+"""
+import re
+from collections import namedtuple
+from config import Config
+from utils import metrics
+
+# Compacted text and the estimated prompt tokens before and after
+Compaction = namedtuple('Compaction', ['text', 'tokens_before', 'tokens_after'])
+
+# Rough LLM token count: words and punctuation marks
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r'\S+')
+_EDGE_PUNCTUATION = '.,!?;:"\'()[]…-'
+_DIGIT = re.compile(r'\d')
+
+# Numbers are never collapsed: "the vote was 2 2" is a score, not a stutter
+_NUMBER_WORDS = frozenset(
+    'zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen '
+    'sixteen seventeen eighteen nineteen twenty thirty forty fifty sixty seventy eighty ninety '
+    'hundred thousand million billion'.split()
+)
+
+
+def _filler_pattern(words, phrases):
+    """
+    Single regex for all fillers: filler words anywhere (with the commas around them), filler
+    phrases only where they are set off by punctuation (", you know," but not "you know him")
+    """
+    alternatives = []
+    if phrases:
+        alternatives.append(r',\s*(?:%s)(?:,|(?=\s*[.?!]))' % '|'.join(re.escape(p) for p in phrases))
+    if words:
+        alternatives.append(r"(?:,?[ \t]*)(?<![\w'-])(?:%s)(?![\w'-]),?" % '|'.join(re.escape(w) for w in words))
+    return re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+
+
+_FILLERS = _filler_pattern(Config.TRANSCRIPT_FILLERS, Config.TRANSCRIPT_FILLER_PHRASES)
+_KEEP_DOUBLES = frozenset(word.lower() for word in Config.TRANSCRIPT_KEEP_DOUBLES)
+
+
+def estimate_tokens(text):
+    """Approximate prompt tokens of a text (words plus punctuation marks)"""
+    return sum(1 for _ in _TOKEN.finditer(text))
+
+
+def compact_transcript(text, source='transcript', max_ngram=None):
+    """
+    Remove fillers, stutters and repeated phrases from a transcript
+
+    Args:
+        text (str): Transcript
+        source (str): Metrics label ('assemblyai', 'live', 'captions')
+        max_ngram (int): Longest repeated phrase (in words) collapsed, default TRANSCRIPT_MAX_NGRAM
+
+    Returns:
+        Compaction: (text, tokens_before, tokens_after); text is unchanged when
+        TRANSCRIPT_COMPACTION is off
+    """
+    tokens_before = estimate_tokens(text)
+    if not Config.TRANSCRIPT_COMPACTION or not text:
+        return Compaction(text, tokens_before, tokens_before)
+
+    if _FILLERS is not None:
+        text = _FILLERS.sub('', text)
+    compacted = _collapse_repeats(text, max_ngram or Config.TRANSCRIPT_MAX_NGRAM)
+
+    tokens_after = estimate_tokens(compacted)
+    metrics.inc('noteflow_transcript_tokens_total', tokens_before, source=source, stage='raw')
+    metrics.inc('noteflow_transcript_tokens_total', tokens_after, source=source, stage='compacted')
+    return Compaction(compacted, tokens_before, tokens_after)
+
+
+def _is_number(key):
+    return key in _NUMBER_WORDS or _DIGIT.search(key) is not None
+
+
+def _collapse_repeats(text, max_ngram):
+    """
+    One pass over the words: after each word, if the last n words equal the n before them
+    (case and edge punctuation ignored, n <= max_ngram), the repeat is dropped, unless only
+    the first copy ends a sentence, it contains a number, or it is a single word doubled
+    in correct grammar (TRANSCRIPT_KEEP_DOUBLES: "had had", "that that"). Line breaks
+    between kept words are preserved.
+    """
+    words, keys, breaks = [], [], []
+    previous_end = 0
+    for match in _WORD.finditer(text):
+        word = match.group()
+        words.append(word)
+        keys.append(word.strip(_EDGE_PUNCTUATION).lower())
+        breaks.append('\n' in text[previous_end:match.start()])
+        previous_end = match.end()
+
+        count = len(keys)
+        for n in range(1, min(max_ngram, count // 2) + 1):
+            if keys[count - n:] != keys[count - 2 * n:count - n]:
+                continue
+            if any(_is_number(key) for key in keys[count - n:]):
+                continue
+            if n == 1 and keys[-1] in _KEEP_DOUBLES:
+                continue
+            first_ends, second_ends = words[count - n - 1][-1:] in '.!?', words[-1][-1:] in '.!?'
+            if first_ends and not second_ends:
+                continue  # A new sentence starting with the same words: "and Android? Android is behind"
+            if second_ends and not first_ends:
+                # Keep the closing punctuation of the dropped copy ("we agreed, we agreed." -> "we agreed.")
+                words[count - n - 1] = words[count - n - 1].rstrip(_EDGE_PUNCTUATION) + words[-1][-1]
+            del words[count - n:], keys[count - n:], breaks[count - n:]
+            break
+
+    parts = []
+    for i, word in enumerate(words):
+        if i:
+            parts.append('\n' if breaks[i] else ' ')
+        parts.append(word)
+    return ''.join(parts)
@@ -3,13 +3,67 @@
 Audio transcription service using AssemblyAI API
 """
 import time
-import assemblyai as aai
 from config import Config
+from services import registry
+from services.http_clients import instrument
+from utils import metrics
 
-aai.settings.api_key = Config.ASSEMBLYAI_API_KEY
 
-# Longer timeout for upload + polling (SDK default 30s; large files need more)
-aai.settings.http_timeout = 300.0  # 5 minutes
+def _configure_assemblyai():
+    """Import and configure the AssemblyAI SDK (on first transcription)"""
+    import assemblyai as aai
+
+    aai.settings.api_key = Config.ASSEMBLYAI_API_KEY
+
+    # Longer timeout for upload + polling (SDK default 30s; large files need more)
+    aai.settings.http_timeout = 300.0  # 5 minutes
+    aai.settings.polling_interval = Config.ASSEMBLYAI_POLLING_INTERVAL
+    if Config.ASSEMBLYAI_BASE_URL:
+        aai.settings.base_url = Config.ASSEMBLYAI_BASE_URL
+    return aai
+
+
+registry.register('assemblyai', _configure_assemblyai)
+
+
+def _create_transcriber():
+    """One Transcriber on the SDK's default client, reused by every transcription (its pool stays warm)"""
+    aai = registry.get('assemblyai')
+    client = aai.Client.get_default()
+    instrument(client.http_client, 'assemblyai')
+    return aai.Transcriber(client=client)
+
+
+registry.register('assemblyai_transcriber', _create_transcriber)
+
+
+# First characters of every format_transcription_error() message
+_FORMATTED_PREFIXES = ('⏳', '💳', '🔑', '⏱️', '📁', '❌')
+
+
+def classify_transcription_error(error):
+    """
+    Classify an AssemblyAI error into a coarse category (used for messages and error metrics)
+
+    Args:
+        error: Exception from API call
+
+    Returns:
+        str: One of 'rate_limit', 'quota', 'auth', 'timeout', 'file', 'other'
+    """
+    error_str = str(error).lower()
+
+    if 'rate limit' in error_str or '429' in error_str:
+        return 'rate_limit'
+    if 'quota' in error_str or 'insufficient' in error_str or 'credit' in error_str:
+        return 'quota'
+    if 'auth' in error_str or '401' in error_str or '403' in error_str or 'api key' in error_str:
+        return 'auth'
+    if 'timeout' in error_str or 'write operation' in error_str:
+        return 'timeout'
+    if 'file' in error_str or 'upload' in error_str:
+        return 'file'
+    return 'other'
 
 
 def format_transcription_error(error):
@@ -23,31 +77,39 @@ def format_transcription_error(error):
         str: User-friendly error message
     """
     error_str = str(error)
+    category = classify_transcription_error(error)
+    metrics.inc('noteflow_errors_total', source='assemblyai', category=category)
 
     # Check for rate limit error (429)
-    if 'rate limit' in error_str.lower() or '429' in error_str:
+    if category == 'rate_limit':
         return "⏳ AssemblyAI rate limit reached. Please wait a few minutes and try again, or upgrade your plan at https://www.assemblyai.com/pricing for higher limits."
 
     # Check for quota/credit errors
-    if 'quota' in error_str.lower() or 'insufficient' in error_str.lower() or 'credit' in error_str.lower():
+    if category == 'quota':
         return "💳 AssemblyAI quota exceeded. Please check your account balance at https://www.assemblyai.com/app/account"
 
     # Check for authentication errors
-    if 'auth' in error_str.lower() or '401' in error_str or '403' in error_str or 'api key' in error_str.lower():
+    if category == 'auth':
         return "🔑 Authentication error. Please check your AssemblyAI API key configuration."
 
     # Check for timeout / write operation timed out (upload or polling)
-    if 'timeout' in error_str.lower() or 'write operation' in error_str.lower():
+    if category == 'timeout':
         return "⏱️ Transcription request timed out. Please try again with a shorter audio file."
 
     # Check for file errors
-    if 'file' in error_str.lower() or 'upload' in error_str.lower():
+    if category == 'file':
         return "📁 Error uploading audio file. Please ensure the file is a valid audio format."
 
     # Generic error
     return f"❌ Transcription error: {error_str[:200]}"
 
 
+def _is_formatted(error):
+    """Whether an error already carries a format_transcription_error() message (classified and counted)"""
+    return str(error).startswith(_FORMATTED_PREFIXES)
+
+
+@metrics.timed('noteflow_stage_seconds', stage='transcribe')
 def transcribe_audio(audio_file_path, max_retries=3):
     """
     Transcribe audio file using AssemblyAI API
@@ -61,13 +123,13 @@ def transcribe_audio(audio_file_path, max_retries=3):
     Returns:
         str: Transcribed text
     """
+    aai = registry.get('assemblyai')
     config = aai.TranscriptionConfig(language_detection=True)
     last_error = None
 
     for attempt in range(max_retries):
         try:
-            transcriber = aai.Transcriber()
-            transcript = transcriber.transcribe(audio_file_path, config=config)
+            transcript = registry.get('assemblyai_transcriber').transcribe(audio_file_path, config=config)
 
             if transcript.status == aai.TranscriptStatus.error:
                 friendly_error = format_transcription_error(Exception(transcript.error))
@@ -83,7 +145,7 @@ def transcribe_audio(audio_file_path, max_retries=3):
                 time.sleep(5 * (attempt + 1))  # 5s, 10s backoff
                 continue
             # If it's already a formatted error, re-raise it
-            if '⏳' in str(e) or '💳' in str(e) or '🔑' in str(e) or '⏱️' in str(e) or '📁' in str(e):
+            if _is_formatted(e):
                 raise
             friendly_error = format_transcription_error(e)
             raise Exception(friendly_error)
@@ -104,9 +166,9 @@ def transcribe_audio_with_timestamps(audio_file_path):
         dict: Transcribed text with timestamps and speaker labels
     """
     try:
+        aai = registry.get('assemblyai')
         config = aai.TranscriptionConfig(speaker_labels=True)
-        transcriber = aai.Transcriber()
-        transcript = transcriber.transcribe(audio_file_path, config=config)
+        transcript = registry.get('assemblyai_transcriber').transcribe(audio_file_path, config=config)
 
         if transcript.status == aai.TranscriptStatus.error:
             # Format the error message
@@ -128,7 +190,7 @@ def transcribe_audio_with_timestamps(audio_file_path):
         }
     except Exception as e:
         # If it's already a formatted error, re-raise it
-        if '⏳' in str(e) or '💳' in str(e) or '🔑' in str(e) or '⏱️' in str(e) or '📁' in str(e):
+        if _is_formatted(e):
             raise
         # Otherwise, format the error
         friendly_error = format_transcription_error(e)
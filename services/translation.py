@@ -0,0 +1,291 @@
+"""
+Segmented translation of long texts
+
+A summary or transcript is split into segments at its emoji-numbered section headers
+("🔑 2. Key Points Discussed") and, for sections longer than TRANSLATION_SEGMENT_CHARS, at
+paragraphs and sentences. Segments are translated concurrently and put back together with
+the original whitespace, so long texts are no longer cut off at the completion limit.
+Every (segment hash, language) translation is kept in a per-process LRU cache: repeated
+segments and re-requests cost nothing.
+
+Translations of stored meetings, books and videos are persisted in the translations table,
+keyed by (content type, content id, field, language) and checked against the hash of the
+current source text; changing a source field deletes its translations.
+"""
+import re
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import delete, event, inspect as sa_inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from config import Config
+from models.meeting import db, Meeting, Book, Video, Translation
+from services.summarization import translate_text, translate_text_async
+from utils import metrics, deadlines
+from utils.db_pool import released_connection
+
+# A line starting a numbered section: emoji, section number, title ("📝 1. Summary")
+_SECTION_HEADER = re.compile(r'^[ \t]*[^\w\s\x00-\x7f]+[ \t]*\d+\.[ \t]+\S', re.MULTILINE)
+_PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n')
+_SENTENCE_END = re.compile(r'(?<=[.!?؟。])\s+')
+_LETTER = re.compile(r'[^\W\d_]')
+
+# Models whose text fields have stored translations, by Translation.content_type
+CONTENT_MODELS = {'meeting': Meeting, 'book': Book, 'video': Video}
+TRANSLATABLE_FIELDS = {'meeting': ('summary', 'transcript'), 'book': ('summary',), 'video': ('summary', 'transcript')}
+
+
+class _SegmentCache:
+    """Thread-safe LRU of translations keyed by (segment hash, language)"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+segment_cache = _SegmentCache(Config.TRANSLATION_CACHE_SIZE)
+
+
+def split_segments(text, max_chars=None):
+    """
+    Split text into translation segments whose concatenation is exactly `text`
+
+    Cuts before every emoji-numbered section header; sections longer than `max_chars`
+    are cut again at paragraph breaks, paragraphs longer than that at sentence ends.
+
+    Returns:
+        list: str segments (each keeps its surrounding whitespace)
+    """
+    max_chars = max_chars or Config.TRANSLATION_SEGMENT_CHARS
+    starts = [match.start() for match in _SECTION_HEADER.finditer(text) if match.start() > 0]
+    sections = [text[start:end] for start, end in zip([0] + starts, starts + [len(text)])]
+
+    segments = []
+    for section in sections:
+        if len(section) <= max_chars:
+            segments.append(section)
+        else:
+            segments.extend(_pack(_split_keeping(section, _PARAGRAPH_BREAK, max_chars), max_chars))
+    return [segment for segment in segments if segment]
+
+
+def _split_keeping(text, separator, max_chars):
+    """Pieces of `text` cut after each separator match; pieces still too long are cut at sentences"""
+    pieces, start = [], 0
+    for match in separator.finditer(text):
+        pieces.append(text[start:match.end()])
+        start = match.end()
+    pieces.append(text[start:])
+
+    if separator is _SENTENCE_END:
+        return pieces
+    result = []
+    for piece in pieces:
+        if len(piece) > max_chars:
+            result.extend(_pack(_split_keeping(piece, _SENTENCE_END, max_chars), max_chars))
+        else:
+            result.append(piece)
+    return result
+
+
+def _pack(pieces, max_chars):
+    """Join consecutive pieces into segments of at most max_chars (a longer piece stays alone)"""
+    segments, current = [], ''
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            segments.append(current)
+            current = ''
+        current += piece
+    if current:
+        segments.append(current)
+    return segments
+
+
+def source_hash(text):
+    """sha256 hex digest identifying a translated text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def normalize_language(language):
+    """Language name as stored, e.g. ' arabic ' -> 'Arabic'"""
+    return ' '.join(language.split()).title()
+
+
+def _cache_key(segment, language):
+    return source_hash(segment), normalize_language(language)
+
+
+def _plan(text, target_language):
+    """
+    Segments of `text` with their whitespace, cached translations, and the distinct
+    segments still to translate
+    """
+    parts = []  # (leading whitespace, stripped segment, trailing whitespace)
+    for segment in split_segments(text):
+        core = segment.strip()
+        lead = segment[:len(segment) - len(segment.lstrip())]
+        trail = segment[len(lead) + len(core):]
+        parts.append((lead, core, trail))
+
+    translations, missing = {}, []
+    for _, core, _ in parts:
+        if core in translations or core in missing:
+            continue
+        if not _LETTER.search(core):
+            translations[core] = core  # Numbers, emoji, punctuation: nothing to translate
+            continue
+        cached = segment_cache.get(_cache_key(core, target_language))
+        if cached is not None:
+            metrics.inc('noteflow_cache_hits_total', cache='translation_segment')
+            translations[core] = cached
+        else:
+            metrics.inc('noteflow_cache_misses_total', cache='translation_segment')
+            missing.append(core)
+    return parts, translations, missing
+
+
+def _assemble(parts, translations, missing, results, target_language):
+    for core, translated in zip(missing, results):
+        translated = translated.strip()
+        segment_cache.put(_cache_key(core, target_language), translated)
+        translations[core] = translated
+    return ''.join(f"{lead}{translations[core]}{trail}" for lead, core, trail in parts)
+
+
+def translate_document(text, target_language):
+    """
+    Translate a text of any length: segments are translated concurrently (at most
+    TRANSLATION_MAX_PARALLEL at a time) and cached per (segment, language)
+
+    Args:
+        text (str): Text to translate
+        target_language (str): Target language (e.g., "Spanish", "Arabic")
+
+    Returns:
+        str: Translated text with the original layout
+    """
+    parts, translations, missing = _plan(text, target_language)
+    if len(missing) <= 1:
+        results = [translate_text(core, target_language) for core in missing]
+    else:
+        # Worker threads have no request context: pass the request's remaining budget along
+        timeout = deadlines.remaining()
+        with ThreadPoolExecutor(max_workers=min(len(missing), Config.TRANSLATION_MAX_PARALLEL)) as pool:
+            results = list(pool.map(lambda core: translate_text(core, target_language, timeout=timeout), missing))
+    return _assemble(parts, translations, missing, results, target_language)
+
+
+async def translate_document_async(text, target_language):
+    """Async variant of translate_document on the event loop"""
+    parts, translations, missing = _plan(text, target_language)
+    limit = asyncio.Semaphore(Config.TRANSLATION_MAX_PARALLEL)
+
+    async def translate(core):
+        async with limit:
+            return await translate_text_async(core, target_language)
+
+    results = await asyncio.gather(*(translate(core) for core in missing))
+    return _assemble(parts, translations, missing, results, target_language)
+
+
+def stored_translation(text, target_language):
+    """
+    Persisted translation of exactly this text, or None
+
+    Returns:
+        str or None
+    """
+    row = Translation.query.filter_by(
+        source_hash=source_hash(text), language=normalize_language(target_language)
+    ).with_entities(Translation.text).first()
+    metrics.inc('noteflow_cache_hits_total' if row else 'noteflow_cache_misses_total', cache='translation_stored')
+    return row.text if row else None
+
+
+def save_translation(content_type, content_id, field, target_language, source_text, translated_text):
+    """Store (or replace) the translation of a content field; a concurrent insert of the same one wins"""
+    language = normalize_language(target_language)
+    translation = Translation.query.filter_by(
+        content_type=content_type, content_id=content_id, field=field, language=language
+    ).first()
+    if translation is None:
+        translation = Translation(content_type=content_type, content_id=content_id, field=field, language=language)
+        db.session.add(translation)
+    translation.source_hash = source_hash(source_text)
+    translation.text = translated_text
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+    return translation
+
+
+def translate_content(content_type, content, field, target_language):
+    """
+    Translation of a stored content field: the persisted one when it was made from the
+    field's current text, otherwise translated now and stored
+
+    Args:
+        content_type (str): 'meeting', 'book' or 'video'
+        content: The Meeting/Book/Video
+        field (str): One of TRANSLATABLE_FIELDS[content_type]
+
+    Returns:
+        tuple: (translated text, True when it came from the database)
+    """
+    source = getattr(content, field) or ''
+    row = Translation.query.filter_by(
+        content_type=content_type, content_id=content.id, field=field, language=normalize_language(target_language)
+    ).with_entities(Translation.source_hash, Translation.text).first()
+    if row is not None and row.source_hash == source_hash(source):
+        metrics.inc('noteflow_cache_hits_total', cache='translation_content')
+        return row.text, True
+
+    metrics.inc('noteflow_cache_misses_total', cache='translation_content')
+    with released_connection(db.session):
+        translated = translate_document(source, target_language)
+    save_translation(content_type, content.id, field, target_language, source, translated)
+    return translated, False
+
+
+def track_source_changes():
+    """Delete the stored translations of content fields that are changed or deleted (on flush)"""
+    @event.listens_for(Session, 'before_flush')
+    def _drop_stale_translations(session, flush_context, instances):
+        for obj in list(session.dirty) + list(session.deleted):
+            content_type = next((name for name, model in CONTENT_MODELS.items() if isinstance(obj, model)), None)
+            if content_type is None or obj.id is None:
+                continue
+            if obj in session.deleted:
+                fields = TRANSLATABLE_FIELDS[content_type]
+            else:
+                state = sa_inspect(obj)
+                fields = [field for field in TRANSLATABLE_FIELDS[content_type] if state.attrs[field].history.has_changes()]
+            if fields:
+                session.execute(delete(Translation).where(
+                    Translation.content_type == content_type,
+                    Translation.content_id == obj.id,
+                    Translation.field.in_(fields)
+                ))
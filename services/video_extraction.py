@@ -1,19 +1,62 @@
-try:
-    from youtube_transcript_api import YouTubeTranscriptApi
-    from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
-except ImportError:
-    # Fallback for older versions
-    from youtube_transcript_api import YouTubeTranscriptApi
-    TranscriptsDisabled = Exception
-    NoTranscriptFound = Exception
-    VideoUnavailable = Exception
 import re
 import os
 import tempfile
 import glob
 import base64
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import time
+import asyncio
+from types import SimpleNamespace
+from services import registry
+from services.http_clients import http_client, async_http_client
+from services.youtube_session import youtube_session
+from utils import metrics
+
+
+def _load_transcript_api():
+    """youtube_transcript_api and its error types (imported on first transcript request)"""
+    try:
+        from youtube_transcript_api import YouTubeTranscriptApi
+        from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
+    except ImportError:
+        # Fallback for older versions
+        from youtube_transcript_api import YouTubeTranscriptApi
+        TranscriptsDisabled = Exception
+        NoTranscriptFound = Exception
+        VideoUnavailable = Exception
+    return SimpleNamespace(
+        YouTubeTranscriptApi=YouTubeTranscriptApi,
+        TranscriptsDisabled=TranscriptsDisabled,
+        NoTranscriptFound=NoTranscriptFound,
+        VideoUnavailable=VideoUnavailable
+    )
+
+
+registry.register('youtube_transcript_api', _load_transcript_api)
+
+
+def _run_strategy(strategy, func, *args):
+    """Run one transcript strategy, recording its duration and outcome"""
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        result = func(*args)
+        outcome = 'success' if result else 'empty'
+        return result
+    finally:
+        metrics.observe('noteflow_youtube_strategy_seconds', time.perf_counter() - start, strategy=strategy, outcome=outcome)
+
+
+async def _run_strategy_async(strategy, func, *args):
+    """Async variant of _run_strategy for coroutine strategies"""
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        result = await func(*args)
+        outcome = 'success' if result else 'empty'
+        return result
+    finally:
+        metrics.observe('noteflow_youtube_strategy_seconds', time.perf_counter() - start, strategy=strategy, outcome=outcome)
+
 
 def extract_video_id(url):
     """Extract YouTube video ID from various URL formats"""
@@ -35,65 +78,102 @@ def extract_video_id(url):
     return None
 
 
+def _youtube_api_base():
+    """Data API host (YOUTUBE_API_ENDPOINT overrides it, e.g. for local fakes)"""
+    return (os.getenv('YOUTUBE_API_ENDPOINT') or 'https://www.googleapis.com').rstrip('/')
+
+
 def get_transcript_via_youtube_api(video_id):
     """
     Get transcript using official YouTube Data API v3
     More reliable in production environments
+
+    Calls the REST endpoints on the shared keep-alive client (services/http_clients.py)
+    rather than building a googleapiclient service, which re-parsed the discovery
+    document on every request.
     """
     api_key = os.getenv('YOUTUBE_API_KEY')
 
     if not api_key:
         return None  # Fall back to transcript API
 
-    try:
-        # Build YouTube API client
-        youtube = build('youtube', 'v3', developerKey=api_key)
+    import httpx
 
+    base_url = _youtube_api_base()
+    http = http_client('youtube')
+    try:
         # Get caption tracks for the video
-        captions_response = youtube.captions().list(
-            part='snippet',
-            videoId=video_id
-        ).execute()
-
-        if not captions_response.get('items'):
+        response = http.get(f'{base_url}/youtube/v3/captions', params={'part': 'snippet', 'videoId': video_id, 'key': api_key})
+        response.raise_for_status()
+        caption_id = _pick_caption_id(response.json().get('items'))
+        if not caption_id:
             return None
 
-        # Find English caption or first available
-        caption_id = None
-        for item in captions_response['items']:
-            lang = item['snippet']['language']
-            if lang in ['en', 'en-US', 'en-GB']:
-                caption_id = item['id']
-                break
+        # Download the caption in SubRip format
+        response = http.get(f'{base_url}/youtube/v3/captions/{caption_id}', params={'tfmt': 'srt', 'key': api_key})
+        response.raise_for_status()
+        return _srt_to_text(response.text)
+
+    except httpx.HTTPStatusError as e:
+        # API quota exceeded or other API error
+        if e.response.status_code == 403:
+            print(f"YouTube API quota exceeded or permissions issue: {e}")
+        metrics.inc('noteflow_errors_total', source='youtube', category='data_api')
+        return None
+    except Exception as e:
+        print(f"YouTube Data API error: {e}")
+        metrics.inc('noteflow_errors_total', source='youtube', category='data_api')
+        return None
 
-        if not caption_id and captions_response['items']:
-            caption_id = captions_response['items'][0]['id']
 
-        if not caption_id:
-            return None
+def _pick_caption_id(items):
+    """Find English caption or first available"""
+    if not items:
+        return None
+    for item in items:
+        if item['snippet']['language'] in ['en', 'en-US', 'en-GB']:
+            return item['id']
+    return items[0]['id']
+
+
+def _srt_to_text(srt):
+    """Remove timing and numbering from SRT and join the caption lines"""
+    text = re.sub(r'\d+\n\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}\n', '', srt)
+    text = re.sub(r'^\d+$', '', text, flags=re.MULTILINE)
+    return ' '.join(text.split())
+
+
+async def get_transcript_via_youtube_api_async(video_id):
+    """Async variant of get_transcript_via_youtube_api on the event loop's shared client"""
+    api_key = os.getenv('YOUTUBE_API_KEY')
+
+    if not api_key:
+        return None  # Fall back to transcript API
 
-        # Download the caption
-        caption_response = youtube.captions().download(
-            id=caption_id,
-            tfmt='srt'  # SubRip format
-        ).execute()
+    import httpx
 
-        # Parse SRT format and extract text
-        import re
-        # Remove timing and numbering from SRT
-        text = re.sub(r'\d+\n\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}\n', '', caption_response)
-        text = re.sub(r'^\d+$', '', text, flags=re.MULTILINE)
-        text = ' '.join(text.split())
+    base_url = _youtube_api_base()
+    http = async_http_client('youtube')
+    try:
+        response = await http.get(f'{base_url}/youtube/v3/captions', params={'part': 'snippet', 'videoId': video_id, 'key': api_key})
+        response.raise_for_status()
+        caption_id = _pick_caption_id(response.json().get('items'))
+        if not caption_id:
+            return None
 
-        return text
+        response = await http.get(f'{base_url}/youtube/v3/captions/{caption_id}', params={'tfmt': 'srt', 'key': api_key})
+        response.raise_for_status()
+        return _srt_to_text(response.text)
 
-    except HttpError as e:
+    except httpx.HTTPStatusError as e:
         # API quota exceeded or other API error
-        if e.resp.status == 403:
+        if e.response.status_code == 403:
             print(f"YouTube API quota exceeded or permissions issue: {e}")
+        metrics.inc('noteflow_errors_total', source='youtube', category='data_api')
         return None
     except Exception as e:
         print(f"YouTube Data API error: {e}")
+        metrics.inc('noteflow_errors_total', source='youtube', category='data_api')
         return None
 
 
@@ -103,7 +183,7 @@ def _transcripts_disabled_message(video_id):
     Tries list_transcripts() to distinguish "no captions" vs "access restricted".
     """
     try:
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        transcript_list = registry.get('youtube_transcript_api').YouTubeTranscriptApi.list_transcripts(video_id)
         available = list(transcript_list)
         if available:
             # Captions exist but we couldn't fetch (e.g. geo/access restriction)
@@ -160,25 +240,6 @@ def _parse_subtitle_file(filepath):
         return None
 
 
-def _ytdlp_cookiefile_opts():
-    """If YOUTUBE_COOKIES_FILE is set and exists, or YOUTUBE_COOKIES_TXT is set, return opts dict with cookiefile for yt-dlp."""
-    path = os.getenv('YOUTUBE_COOKIES_FILE', '').strip()
-    if path and os.path.isfile(path):
-        return {'cookiefile': path}
-    # Fallback: write YOUTUBE_COOKIES_TXT to a file at runtime (use /tmp so it works on read-only Render filesystem)
-    txt = os.getenv('YOUTUBE_COOKIES_TXT', '').strip()
-    if txt:
-        try:
-            cookie_path = os.path.join(tempfile.gettempdir(), 'noteflow_youtube_cookies.txt')
-            with open(cookie_path, 'w', encoding='utf-8') as f:
-                f.write(txt)
-            if os.path.isfile(cookie_path):
-                return {'cookiefile': cookie_path}
-        except Exception:
-            pass
-    return {}
-
-
 def get_transcript_via_ytdlp(video_url):
     """
     Get transcript using yt-dlp (downloads captions / auto-subs).
@@ -186,9 +247,10 @@ def get_transcript_via_ytdlp(video_url):
     Set YOUTUBE_COOKIES_FILE to a cookies file path if YouTube blocks (e.g. on Render).
     """
     try:
-        import yt_dlp
+        import yt_dlp  # noqa: F401 (optional; used through youtube_session)
     except ImportError:
         return None
+    video_id = extract_video_id(video_url) or video_url
 
     with tempfile.TemporaryDirectory() as tmpdir:
         # Use a simple base name so subtitle files are e.g. out.en.vtt, out.a.en.vtt
@@ -202,13 +264,16 @@ def get_transcript_via_ytdlp(video_url):
             'outtmpl': outtmpl,
             'quiet': True,
             'no_warnings': True,
-            **_ytdlp_cookiefile_opts(),
         }
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
+            # Watch page from the session's info cache; only the subtitle files are fetched here
+            info = youtube_session.info(video_id, video_url)
+            with youtube_session.downloader(ydl_opts) as ydl:
+                ydl.process_ie_result(info, download=True)
         except Exception as e:
+            youtube_session.forget(video_id)
             print(f"yt-dlp subtitle download failed: {e}")
+            metrics.inc('noteflow_errors_total', source='youtube', category='ytdlp_subtitles')
             return None
 
         # Find any subtitle file (yt-dlp may name e.g. out.en.vtt, out.a.en.vtt, or out.en.srt)
@@ -236,10 +301,11 @@ def get_transcript_via_assemblyai(video_url):
     Works for videos with no captions (uses your existing AssemblyAI key).
     """
     try:
-        import yt_dlp
+        import yt_dlp  # noqa: F401 (optional; used through youtube_session)
         from services.transcription import transcribe_audio
     except ImportError:
         return None
+    video_id = extract_video_id(video_url) or video_url
 
     with tempfile.TemporaryDirectory() as tmpdir:
         outpath = os.path.join(tmpdir, 'audio.%(ext)s')
@@ -248,13 +314,15 @@ def get_transcript_via_assemblyai(video_url):
             'outtmpl': outpath,
             'postprocessors': [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3', 'preferredquality': '128'}],
             'quiet': True,
-            **_ytdlp_cookiefile_opts(),
         }
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
+            info = youtube_session.info(video_id, video_url)
+            with youtube_session.downloader(ydl_opts) as ydl:
+                ydl.process_ie_result(info, download=True)
         except Exception as e:
+            youtube_session.forget(video_id)
             print(f"yt-dlp audio download failed: {e}")
+            metrics.inc('noteflow_errors_total', source='youtube', category='ytdlp_audio')
             return None
 
         audio_files = glob.glob(os.path.join(tmpdir, 'audio.*'))
@@ -275,8 +343,6 @@ def get_youtube_transcript(video_url):
     2. Fall back to transcript scraping API (works locally)
     3. Support translation from available languages to English
     """
-    import time
-
     try:
         video_id = extract_video_id(video_url)
 
@@ -284,7 +350,7 @@ def get_youtube_transcript(video_url):
             raise ValueError("Invalid YouTube URL format")
 
         # Try official YouTube Data API first (production-safe)
-        transcript_text = get_transcript_via_youtube_api(video_id)
+        transcript_text = _run_strategy('youtube_data_api', get_transcript_via_youtube_api, video_id)
         if transcript_text:
             return {
                 'video_id': video_id,
@@ -293,163 +359,208 @@ def get_youtube_transcript(video_url):
                 'method': 'youtube_data_api'
             }
 
-        # Try yt-dlp early (often works when transcript_api is rate-limited on Render/cloud)
-        transcript_text = get_transcript_via_ytdlp(video_url)
+        return _get_transcript_without_data_api(video_id, video_url)
+
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f"Could not retrieve transcript: {str(e)}"
+        }
+
+
+async def get_youtube_transcript_async(video_url):
+    """
+    Async variant of get_youtube_transcript for the ASGI entry point
+
+    The Data API is queried on the event loop; yt-dlp, youtube_transcript_api and AssemblyAI
+    have no async API, so the fallbacks run on a worker thread.
+    """
+    try:
+        video_id = extract_video_id(video_url)
+
+        if not video_id:
+            raise ValueError("Invalid YouTube URL format")
+
+        transcript_text = await _run_strategy_async('youtube_data_api', get_transcript_via_youtube_api_async, video_id)
         if transcript_text:
             return {
                 'video_id': video_id,
                 'transcript': transcript_text,
                 'success': True,
-                'method': 'ytdlp'
+                'method': 'youtube_data_api'
             }
 
-        # Try multiple language options (including auto-generated)
-        languages_to_try = [
-            ['en'],       # English
-            ['a.en'],     # Auto-generated English
-            ['ar'],       # Arabic
-            ['a.ar'],     # Auto-generated Arabic
-            ['es'],       # Spanish
-            ['fr'],       # French
-            ['de'],       # German
-            ['pt'],       # Portuguese
-            ['ru'],       # Russian
-            ['hi'],       # Hindi
-            ['ja'],       # Japanese
-            ['ko'],       # Korean
-        ]
-
-        transcript_data = None
-        last_error = None
-        max_retries = 3
-        transcripts_disabled = False  # When True, skip more transcript_api retries and try yt-dlp/AssemblyAI
-
-        # Try multiple times with delays
-        for retry in range(max_retries):
-            for languages in languages_to_try:
-                try:
-                    # Try with explicit options first, then fallback to simple call
-                    try:
-                        transcript_list = YouTubeTranscriptApi.get_transcript(
-                            video_id,
-                            languages=languages,
-                            proxies=None,
-                            cookies=None
-                        )
-                        transcript_data = transcript_list
-                        break
-                    except (TranscriptsDisabled, VideoUnavailable):
-                        raise  # Let outer handler deal with these
-                    except Exception:
-                        # Fallback to simple method (e.g. connection/format issues)
-                        transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
-                        transcript_data = transcript_list
-                        break
-                except TranscriptsDisabled:
-                    # Often raised from cloud IPs (e.g. Render) even when captions exist — try yt-dlp/AssemblyAI
-                    transcripts_disabled = True
-                    break
-                except NoTranscriptFound as e:
-                    last_error = e
-                    continue
-                except VideoUnavailable:
-                    return {
-                        'success': False,
-                        'error': "⚠️ This video is unavailable.\n\n"
-                                 "It may be private, deleted, region-restricted, or age-restricted."
-                    }
-                except Exception as e:
-                    last_error = e
-                    continue
-
-            if transcript_data:
-                break
-            if transcripts_disabled:
-                break  # Skip retries and try yt-dlp / AssemblyAI
+        return await asyncio.to_thread(_get_transcript_without_data_api, video_id, video_url)
 
-            # Wait before retrying (exponential backoff)
-            if retry < max_retries - 1:
-                time.sleep(2 ** retry)
-
-        available_captions_note = None
-        if not transcript_data:
-            # Try to list available transcripts and translate to English if needed
-            try:
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                available = []
-                translatable_transcript = None
-
-                for transcript in transcript_list:
-                    available.append(f"• {transcript.language} ({'auto' if transcript.is_generated else 'manual'})")
-
-                    # Find a translatable transcript we can convert to English
-                    if translatable_transcript is None and transcript.is_translatable:
-                        translatable_transcript = transcript
-
-                # If we found a translatable transcript, translate it to English
-                if translatable_transcript:
-                    print(f"Translating {translatable_transcript.language} transcript to English...")
-                    try:
-                        english_transcript = translatable_transcript.translate('en')
-                        transcript_data = english_transcript.fetch()
-                        print(f"Successfully translated to English!")
-                    except Exception as translate_error:
-                        print(f"Translation failed: {translate_error}")
-                        # Continue to error handling below
-
-                if available:
-                    available_captions_note = "\n\nAvailable captions:\n" + "\n".join(available[:5])
-            except Exception as list_error:
-                print(f"Error listing transcripts: {list_error}")
-                pass
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f"Could not retrieve transcript: {str(e)}"
+        }
 
-            # Alternative services: yt-dlp (captions) then AssemblyAI (download audio + transcribe)
-            if not transcript_data:
-                transcript_text_alt = get_transcript_via_ytdlp(video_url)
-                if transcript_text_alt:
-                    return {
-                        'video_id': video_id,
-                        'transcript': transcript_text_alt,
-                        'success': True,
-                        'method': 'ytdlp'
-                    }
-                transcript_text_alt = get_transcript_via_assemblyai(video_url)
-                if transcript_text_alt:
-                    return {
-                        'video_id': video_id,
-                        'transcript': transcript_text_alt,
-                        'success': True,
-                        'method': 'assemblyai'
-                    }
-
-            if not transcript_data:
-                print(f"YouTube transcript: all methods failed for video_id={video_id}")
-                err = "⚠️ Unable to access captions for this video.\n\n"
-                err += "Reliable workaround: Use Video file upload instead of the YouTube URL — download the video on your device, then upload it here. That always works because we transcribe your file directly.\n\n"
-                err += "Why URL fails here: YouTube often blocks automated access from cloud servers. It works locally but not on production.\n\n"
-                err += "Other options: Export fresh cookies from youtube.com and set YOUTUBE_COOKIES_TXT in your deployment; or try again later."
-                if available_captions_note:
-                    err += available_captions_note
-                return {'success': False, 'error': err}
-
-        # Combine all text - handle both dict and object formats
-        transcript_text = " ".join([
-            item.text if hasattr(item, 'text') else item['text']
-            for item in transcript_data
-        ])
 
+def _get_transcript_without_data_api(video_id, video_url):
+    """The yt-dlp / transcript scraping / AssemblyAI fallbacks of get_youtube_transcript"""
+    # Try yt-dlp early (often works when transcript_api is rate-limited on Render/cloud)
+    transcript_text = _run_strategy('ytdlp', get_transcript_via_ytdlp, video_url)
+    if transcript_text:
         return {
             'video_id': video_id,
             'transcript': transcript_text,
             'success': True,
-            'method': 'transcript_api'
+            'method': 'ytdlp'
         }
 
-    except Exception as e:
-        return {
-            'success': False,
-            'error': f"Could not retrieve transcript: {str(e)}"
-        }
+    yta = registry.get('youtube_transcript_api')
+    YouTubeTranscriptApi = yta.YouTubeTranscriptApi
+
+    # Try multiple language options (including auto-generated)
+    languages_to_try = [
+        ['en'],       # English
+        ['a.en'],     # Auto-generated English
+        ['ar'],       # Arabic
+        ['a.ar'],     # Auto-generated Arabic
+        ['es'],       # Spanish
+        ['fr'],       # French
+        ['de'],       # German
+        ['pt'],       # Portuguese
+        ['ru'],       # Russian
+        ['hi'],       # Hindi
+        ['ja'],       # Japanese
+        ['ko'],       # Korean
+    ]
+
+    transcript_data = None
+    last_error = None
+    max_retries = 3
+    transcripts_disabled = False  # When True, skip more transcript_api retries and try yt-dlp/AssemblyAI
+    transcript_api_started = time.perf_counter()
+
+    # Try multiple times with delays
+    for retry in range(max_retries):
+        for languages in languages_to_try:
+            try:
+                # Try with explicit options first, then fallback to simple call
+                try:
+                    transcript_list = YouTubeTranscriptApi.get_transcript(
+                        video_id,
+                        languages=languages,
+                        proxies=None,
+                        cookies=None
+                    )
+                    transcript_data = transcript_list
+                    break
+                except (yta.TranscriptsDisabled, yta.VideoUnavailable):
+                    raise  # Let outer handler deal with these
+                except Exception:
+                    # Fallback to simple method (e.g. connection/format issues)
+                    transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
+                    transcript_data = transcript_list
+                    break
+            except yta.TranscriptsDisabled:
+                # Often raised from cloud IPs (e.g. Render) even when captions exist — try yt-dlp/AssemblyAI
+                transcripts_disabled = True
+                break
+            except yta.NoTranscriptFound as e:
+                last_error = e
+                continue
+            except yta.VideoUnavailable:
+                metrics.observe('noteflow_youtube_strategy_seconds', time.perf_counter() - transcript_api_started,
+                                strategy='transcript_api', outcome='unavailable')
+                return {
+                    'success': False,
+                    'error': "⚠️ This video is unavailable.\n\n"
+                             "It may be private, deleted, region-restricted, or age-restricted."
+                }
+            except Exception as e:
+                last_error = e
+                continue
+
+        if transcript_data:
+            break
+        if transcripts_disabled:
+            break  # Skip retries and try yt-dlp / AssemblyAI
+
+        # Wait before retrying (exponential backoff)
+        if retry < max_retries - 1:
+            time.sleep(2 ** retry)
+
+    metrics.observe('noteflow_youtube_strategy_seconds', time.perf_counter() - transcript_api_started,
+                    strategy='transcript_api', outcome='success' if transcript_data else 'empty')
+
+    available_captions_note = None
+    if not transcript_data:
+        # Try to list available transcripts and translate to English if needed
+        try:
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            available = []
+            translatable_transcript = None
+
+            for transcript in transcript_list:
+                available.append(f"• {transcript.language} ({'auto' if transcript.is_generated else 'manual'})")
+
+                # Find a translatable transcript we can convert to English
+                if translatable_transcript is None and transcript.is_translatable:
+                    translatable_transcript = transcript
+
+            # If we found a translatable transcript, translate it to English
+            if translatable_transcript:
+                print(f"Translating {translatable_transcript.language} transcript to English...")
+                try:
+                    english_transcript = translatable_transcript.translate('en')
+                    transcript_data = english_transcript.fetch()
+                    print(f"Successfully translated to English!")
+                except Exception as translate_error:
+                    print(f"Translation failed: {translate_error}")
+                    # Continue to error handling below
+
+            if available:
+                available_captions_note = "\n\nAvailable captions:\n" + "\n".join(available[:5])
+        except Exception as list_error:
+            print(f"Error listing transcripts: {list_error}")
+            pass
+
+        # Alternative services: yt-dlp (captions) then AssemblyAI (download audio + transcribe)
+        if not transcript_data:
+            transcript_text_alt = _run_strategy('ytdlp', get_transcript_via_ytdlp, video_url)
+            if transcript_text_alt:
+                return {
+                    'video_id': video_id,
+                    'transcript': transcript_text_alt,
+                    'success': True,
+                    'method': 'ytdlp'
+                }
+            transcript_text_alt = _run_strategy('assemblyai', get_transcript_via_assemblyai, video_url)
+            if transcript_text_alt:
+                return {
+                    'video_id': video_id,
+                    'transcript': transcript_text_alt,
+                    'success': True,
+                    'method': 'assemblyai'
+                }
+
+        if not transcript_data:
+            print(f"YouTube transcript: all methods failed for video_id={video_id}")
+            err = "⚠️ Unable to access captions for this video.\n\n"
+            err += "Reliable workaround: Use Video file upload instead of the YouTube URL — download the video on your device, then upload it here. That always works because we transcribe your file directly.\n\n"
+            err += "Why URL fails here: YouTube often blocks automated access from cloud servers. It works locally but not on production.\n\n"
+            err += "Other options: Export fresh cookies from youtube.com and set YOUTUBE_COOKIES_TXT in your deployment; or try again later."
+            if available_captions_note:
+                err += available_captions_note
+            return {'success': False, 'error': err}
+
+    # Combine all text - handle both dict and object formats
+    transcript_text = " ".join([
+        item.text if hasattr(item, 'text') else item['text']
+        for item in transcript_data
+    ])
+
+    return {
+        'video_id': video_id,
+        'transcript': transcript_text,
+        'success': True,
+        'method': 'transcript_api'
+    }
 
 def get_video_title_from_url(video_url):
     """Extract video title from URL (simplified version)"""
@@ -0,0 +1,147 @@
+"""
+Process-wide yt-dlp state shared by the YouTube fallbacks (services/video_extraction.py)
+
+    cookie file  YOUTUBE_COOKIES_FILE when it exists, otherwise YOUTUBE_COOKIES_TXT written once
+                 per process (and again only if the variable changes) with an atomic rename;
+                 yt-dlp only reads it, it no longer writes the jar back after every call
+    extractor    one warmed YoutubeDL per thread (extractors, player JS and cookies loaded) for
+                 the watch page and player requests; never shared between threads
+    video info   the raw extraction result per video id, kept YOUTUBE_INFO_CACHE_TTL seconds,
+                 so subtitle and audio attempts fetch the watch page once
+
+Downloads run on a YoutubeDL built for the call's options from a copy of the cached info:
+
+    with youtube_session.downloader(opts) as ydl:
+        ydl.process_ie_result(youtube_session.info(video_url), download=True)
+"""
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from config import Config
+from services import registry
+from utils import metrics
+
+COOKIE_FILENAME = 'noteflow_youtube_cookies.txt'
+
+
+def _load_youtube_dl():
+    """YoutubeDL that never saves cookies back: the cookie file is shared by threads and processes"""
+    import yt_dlp
+
+    class ReadOnlyCookiesYoutubeDL(yt_dlp.YoutubeDL):
+        def save_cookies(self):
+            pass
+
+    return ReadOnlyCookiesYoutubeDL
+
+
+registry.register('youtube_dl', _load_youtube_dl)
+
+
+def _fresh_copy(info):
+    """
+    Copy of an info dict that processing can mutate (formats, subtitles and thumbnails
+    are annotated in place) without touching the cached one
+    """
+    copy = dict(info)
+    for key in ('formats', 'thumbnails'):
+        if info.get(key):
+            copy[key] = [dict(item) for item in info[key]]
+    for key in ('subtitles', 'automatic_captions'):
+        if info.get(key):
+            copy[key] = {lang: [dict(track) for track in tracks] for lang, tracks in info[key].items()}
+    return copy
+
+
+class YouTubeSession:
+    """Cookie file, per-thread extractors and the video info cache of this process"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.infos = OrderedDict()  # video id -> (expires at, raw info)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.cookie_source = None  # What the current cookie options were made from
+        self.cookie_options = {}
+
+    def cookie_opts(self):
+        """{'cookiefile': path} for yt-dlp, or {} without cookies"""
+        path = os.getenv('YOUTUBE_COOKIES_FILE', '').strip()
+        txt = os.getenv('YOUTUBE_COOKIES_TXT', '').strip()
+        source = (path if path and os.path.isfile(path) else None,
+                  hashlib.sha256(txt.encode('utf-8')).hexdigest() if txt else None)
+        if source == self.cookie_source:
+            return self.cookie_options
+        with self.lock:
+            if source != self.cookie_source:
+                self.cookie_options = self._materialize_cookies(source[0], txt)
+                self.cookie_source = source
+            return self.cookie_options
+
+    def _materialize_cookies(self, path, txt):
+        if path:
+            return {'cookiefile': path}
+        if not txt:
+            return {}
+        # /tmp so it works on the read-only Render filesystem; rename so readers never see half a file
+        directory = tempfile.gettempdir()
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix='.noteflow_cookies_', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(txt)
+            cookie_path = os.path.join(directory, COOKIE_FILENAME)
+            os.replace(temp_path, cookie_path)
+            return {'cookiefile': cookie_path}
+        except OSError as e:
+            print(f"Could not write YouTube cookies file: {e}")
+            return {}
+
+    def extractor(self):
+        """This thread's warmed YoutubeDL for info extraction (rebuilt when the cookies change)"""
+        cookies = self.cookie_opts()
+        ydl = getattr(self.local, 'ydl', None)
+        if ydl is None or self.local.cookies is not cookies:
+            ydl = registry.get('youtube_dl')({'quiet': True, 'no_warnings': True, 'skip_download': True, **cookies})
+            self.local.ydl, self.local.cookies = ydl, cookies
+        return ydl
+
+    def downloader(self, opts):
+        """YoutubeDL for one download with the session's cookies (use as a context manager)"""
+        return registry.get('youtube_dl')({**opts, **self.cookie_opts()})
+
+    def info(self, video_id, video_url):
+        """
+        Copy of the unprocessed extraction result of a video, from the cache when fresh
+
+        Raises:
+            yt_dlp.utils.DownloadError: the watch page could not be extracted
+        """
+        now = time.monotonic()
+        with self.lock:
+            entry = self.infos.get(video_id)
+            if entry is not None and entry[0] > now:
+                self.infos.move_to_end(video_id)
+                metrics.inc('noteflow_cache_hits_total', cache='youtube_info')
+                return _fresh_copy(entry[1])
+        metrics.inc('noteflow_cache_misses_total', cache='youtube_info')
+
+        info = self.extractor().extract_info(video_url, download=False, process=False)
+        if info.get('_type', 'video') == 'video' and not info.get('is_live'):
+            with self.lock:
+                self.infos[video_id] = (now + self.ttl, info)
+                self.infos.move_to_end(video_id)
+                while len(self.infos) > self.max_entries:
+                    self.infos.popitem(last=False)
+        return _fresh_copy(info)
+
+    def forget(self, video_id):
+        """Drop a cached info (e.g. its media URLs expired or were refused)"""
+        with self.lock:
+            self.infos.pop(video_id, None)
+
+
+youtube_session = YouTubeSession(Config.YOUTUBE_INFO_CACHE_SIZE, Config.YOUTUBE_INFO_CACHE_TTL)
@@ -8,9 +8,10 @@ echo "========================================"
 echo "🚀 Starting NoteFlow AI on Render"
 echo "========================================"
 
-# Run database migrations automatically
+# Run database migrations automatically (the only place the schema changes in production;
+# workers start with DB_SCHEMA_MODE=migrations and never call create_all, see utils/schema.py)
 echo "📊 Running database migrations..."
-flask db upgrade
+flask init-db
 
 # Check if migrations succeeded
 if [ $? -eq 0 ]; then
@@ -20,10 +21,19 @@ else
     exit 1
 fi
 
+# SERVER_MODE=asgi: async serving mode (chat/translate/YouTube on an event loop), see asgi.py
+if [ "$SERVER_MODE" = "asgi" ]; then
+    echo "========================================"
+    echo "🌟 Starting Uvicorn (ASGI) server..."
+    echo "========================================"
+    # Uvicorn has no master hook: drop the previous run's metrics files here (utils/metrics.py)
+    python -c "from utils import metrics; metrics.clear_metrics_dir()"
+    exec uvicorn asgi:application --host 0.0.0.0 --port $PORT --workers 2
+fi
+
 echo "========================================"
 echo "🌟 Starting Gunicorn server..."
 echo "========================================"
 
-# Start the application
-# Timeout 300s: YouTube (yt-dlp/AssemblyAI) and long uploads can take a while
-exec gunicorn wsgi:application --bind 0.0.0.0:$PORT --workers 2 --timeout 300
+# Start the application (threaded workers, preloaded app, timeouts: see gunicorn.conf.py)
+exec gunicorn wsgi:application -c gunicorn.conf.py
@@ -0,0 +1,273 @@
+// ============== SPEECH AUDIO CAPTURE ==============
+// Shared by the recorder on the upload page (main.js) and the chat recorder (chat.js).
+// Records mono 16 kHz Opus at a speech bitrate: a long meeting uploads (and goes to
+// AssemblyAI) as a few MB instead of tens of MB of 48 kHz stereo.
+
+const SPEECH_AUDIO = {
+    sampleRate: 16000,
+    channelCount: 1,
+    bitsPerSecond: 24000
+};
+
+// Preferred first: Opus where the browser can record it, Safari falls back to AAC in mp4
+const SPEECH_MIME_TYPES = ['audio/webm;codecs=opus', 'audio/ogg;codecs=opus', 'audio/webm', 'audio/mp4'];
+
+/**
+ * Open the microphone as a mono 16 kHz stream.
+ * Resamples through an AudioContext when the browser ignores the constraints;
+ * falls back to the raw microphone stream where that is not supported.
+ * Returns { stream, context, source, release } - call release() when recording stops;
+ * context/source (the 16 kHz graph, used by LiveTranscriber) are null in the fallback.
+ */
+async function openSpeechStream() {
+    const microphone = await navigator.mediaDevices.getUserMedia({
+        audio: {
+            channelCount: SPEECH_AUDIO.channelCount,
+            sampleRate: SPEECH_AUDIO.sampleRate,
+            echoCancellation: true,
+            noiseSuppression: true,
+            autoGainControl: true
+        }
+    });
+    const stopMicrophone = () => microphone.getTracks().forEach(track => track.stop());
+
+    let context = null;
+    try {
+        context = new AudioContext({ sampleRate: SPEECH_AUDIO.sampleRate });
+        const source = context.createMediaStreamSource(microphone);
+        const destination = context.createMediaStreamDestination();
+        destination.channelCount = SPEECH_AUDIO.channelCount;
+        destination.channelCountMode = 'explicit';
+        source.connect(destination);
+        return {
+            stream: destination.stream,
+            context,
+            source,
+            release() {
+                stopMicrophone();
+                context.close();
+            }
+        };
+    } catch (error) {
+        // e.g. older Firefox can't connect a microphone to a context at another sample rate
+        console.warn('Recording without resampling:', error);
+        if (context) context.close();
+        return { stream: microphone, context: null, source: null, release: stopMicrophone };
+    }
+}
+
+/**
+ * MediaRecorder for a speech stream: Opus at SPEECH_AUDIO.bitsPerSecond when available
+ */
+function createSpeechRecorder(stream) {
+    const mimeType = SPEECH_MIME_TYPES.find(type => MediaRecorder.isTypeSupported(type));
+    const options = { audioBitsPerSecond: SPEECH_AUDIO.bitsPerSecond };
+    if (mimeType) options.mimeType = mimeType;
+    return new MediaRecorder(stream, options);
+}
+
+/**
+ * Average bitrate (bits per second) of a finished recording
+ */
+function recordingBitrate(blob, durationMs) {
+    return durationMs > 0 ? Math.round(blob.size * 8 / (durationMs / 1000)) : 0;
+}
+
+/**
+ * File extension the server accepts for a recording's MIME type
+ */
+function recordingExtension(mimeType) {
+    if (mimeType.includes('mp4')) return 'm4a';
+    if (mimeType.includes('ogg')) return 'ogg';
+    return 'webm';
+}
+
+// ============== LIVE TRANSCRIPTION ==============
+// Streams the recording as 16-bit PCM to /api/live while the user talks (routes/live.py);
+// the transcript is ready moments after recording stops.
+
+const LIVE_CHUNK_MS = 1000;
+const LIVE_MAX_REQUEST_SECONDS = 5;  // The server rejects chunks above 10 s
+const LIVE_FINISH_ATTEMPTS = 5;
+
+const PCM_CAPTURE_WORKLET = `
+class PcmCapture extends AudioWorkletProcessor {
+    process(inputs) {
+        const channel = inputs[0][0];
+        if (channel) this.port.postMessage(channel.slice(0));
+        return true;
+    }
+}
+registerProcessor('pcm-capture', PcmCapture);
+`;
+
+class LiveTranscriber {
+    /**
+     * @param context AudioContext of the speech stream (openSpeechStream)
+     * @param source  its microphone source node
+     * @param onUpdate called with (finalText, partialText) as the transcript grows
+     */
+    constructor(context, source, onUpdate) {
+        this.context = context;
+        this.source = source;
+        this.onUpdate = onUpdate;
+        this.sessionId = null;
+        this.pending = [];      // Int16Array chunks not yet acknowledged by the server
+        this.sent = 0;          // Bytes the server has received
+        this.turns = [];
+        this.partial = '';
+        this.sending = null;
+        this.failed = false;
+        this.node = null;
+        this.timer = null;
+        this.started = Promise.resolve(false);
+    }
+
+    static isSupported(capture) {
+        return Boolean(capture.context && window.AudioWorkletNode);
+    }
+
+    /**
+     * Start capturing and open the server session. Resolves false when live mode is
+     * unavailable (disabled on the server, no backend) - record and upload as usual then.
+     */
+    start() {
+        this.started = this.open();
+        return this.started;
+    }
+
+    async open() {
+        try {
+            const moduleUrl = URL.createObjectURL(new Blob([PCM_CAPTURE_WORKLET], { type: 'application/javascript' }));
+            await this.context.audioWorklet.addModule(moduleUrl);
+            URL.revokeObjectURL(moduleUrl);
+            this.node = new AudioWorkletNode(this.context, 'pcm-capture');
+            this.node.port.onmessage = (event) => this.pending.push(floatToPcm16(event.data));
+            this.source.connect(this.node);
+
+            const response = await fetch('/api/live', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ sample_rate: this.context.sampleRate })
+            });
+            const data = await response.json();
+            if (!data.success) throw new Error(data.message);
+            this.sessionId = data.session_id;
+            this.timer = setInterval(() => this.flush(), LIVE_CHUNK_MS);
+            return true;
+        } catch (error) {
+            console.warn('Live transcription unavailable:', error);
+            this.stopCapture();
+            this.failed = true;
+            return false;
+        }
+    }
+
+    /** Send the buffered audio (one request in flight at a time) */
+    flush() {
+        if (!this.sessionId || this.failed) return Promise.resolve();
+        if (!this.sending) {
+            this.sending = this.sendPending().finally(() => { this.sending = null; });
+        }
+        return this.sending;
+    }
+
+    async sendPending() {
+        // After a stall, catch up in several requests rather than one oversized chunk
+        const maxSamples = this.context.sampleRate * LIVE_MAX_REQUEST_SECONDS;
+        let chunks = 0, samples = 0;
+        while (chunks < this.pending.length && samples < maxSamples) {
+            samples += this.pending[chunks++].length;
+        }
+        const body = concatPcm(this.pending.slice(0, chunks));
+        const url = `/api/live/${this.sessionId}/audio?offset=${this.sent}&turns=${this.turns.length}`;
+        let response;
+        try {
+            response = await fetch(url, { method: 'POST', headers: { 'Content-Type': 'application/octet-stream' }, body });
+        } catch (error) {
+            return; // Network hiccup: the same audio is resent on the next tick
+        }
+        const data = await response.json();
+
+        if (response.status === 409 && data.received >= this.sent && data.received <= this.sent + body.byteLength) {
+            // An earlier response was lost after the server stored the audio: skip what it has
+            this.pending.splice(0, chunks, body.slice((data.received - this.sent) / 2));
+            this.sent = data.received;
+            return;
+        }
+        if (!data.success) {
+            console.warn('Live transcription stopped:', data.message);
+            this.failed = true;
+            this.stopCapture();
+            return;
+        }
+
+        this.pending.splice(0, chunks);
+        this.sent = data.received;
+        this.turns.push(...data.turns);
+        this.partial = data.partial;
+        this.onUpdate(this.turns.join(' '), this.partial);
+    }
+
+    /**
+     * Send the rest of the audio and finish the session.
+     * Resolves with the server response ({ success, meeting_id } like /upload).
+     */
+    async finish() {
+        const started = await this.started;
+        this.stopCapture();
+        if (!started || this.failed) throw new Error('Live transcription failed');
+        await this.flush();
+        for (let attempt = 0; this.pending.length && !this.failed; attempt++) {
+            if (attempt === LIVE_FINISH_ATTEMPTS) throw new Error('Could not send the rest of the recording');
+            await this.flush();
+        }
+        if (this.failed) throw new Error('Live transcription failed');
+
+        const response = await fetch(`/api/live/${this.sessionId}/finish`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({})
+        });
+        return response.json();
+    }
+
+    /** Stop without finishing: the server expires the session after its idle timeout */
+    cancel() {
+        this.stopCapture();
+        this.failed = true;
+    }
+
+    stopCapture() {
+        clearInterval(this.timer);
+        if (this.node) {
+            try {
+                this.source.disconnect(this.node);
+            } catch (error) {
+                // The context is already closed
+            }
+            this.node.port.onmessage = null;
+            this.node = null;
+        }
+    }
+}
+
+function floatToPcm16(samples) {
+    const pcm = new Int16Array(samples.length);
+    for (let i = 0; i < samples.length; i++) {
+        const sample = Math.max(-1, Math.min(1, samples[i]));
+        pcm[i] = sample < 0 ? sample * 0x8000 : sample * 0x7FFF;
+    }
+    return pcm;
+}
+
+function concatPcm(chunks) {
+    const length = chunks.reduce((total, chunk) => total + chunk.length, 0);
+    const pcm = new Int16Array(length);
+    let offset = 0;
+    chunks.forEach(chunk => {
+        pcm.set(chunk, offset);
+        offset += chunk.length;
+    });
+    return pcm;
+}
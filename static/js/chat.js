@@ -25,6 +25,7 @@ const inlineAudioPlayback = document.getElementById('inlineAudioPlayback');
 const inlineTimerDisplay = document.getElementById('inlineTimerDisplay');
 const inlineRecordingTimer = document.getElementById('inlineRecordingTimer');
 const inlineRecordingLabel = document.getElementById('inlineRecordingLabel');
+const inlineLiveTranscript = document.getElementById('inlineLiveTranscript');
 
 // Recording variables
 let mediaRecorder;
@@ -32,6 +33,8 @@ let audioChunks = [];
 let recordingInterval;
 let recordingStartTime;
 let recordedBlob;
+let recordedBitrate = 0;
+let liveTranscriber = null;  // Streams the recording for live transcription (audio_capture.js)
 
 // ============== SOUND EFFECTS ==============
 
@@ -477,7 +480,7 @@ function startProgressSimulation(dataType) {
 
 // ============== FILE PROCESSING ==============
 
-async function processFile(file) {
+async function processFile(file, extraFields = {}, submitRecording = null) {
     // Determine file type first
     const ext = file.name.split('.').pop().toLowerCase();
     const audioExts = ['mp3', 'wav', 'm4a', 'ogg', 'flac', 'webm', 'opus'];
@@ -512,15 +515,19 @@ async function processFile(file) {
     const progressSimulator = startProgressSimulation(dataType);
 
     try {
-        const formData = new FormData();
-        formData.append(formField, file);
-
-        const response = await fetch(endpoint, {
-            method: 'POST',
-            body: formData
-        });
+        const upload = async () => {
+            const formData = new FormData();
+            formData.append(formField, file);
+            Object.entries(extraFields).forEach(([name, value]) => formData.append(name, value));
+
+            const response = await fetch(endpoint, {
+                method: 'POST',
+                body: formData
+            });
+            return response.json();
+        };
 
-        const data = await response.json();
+        const data = submitRecording ? await submitRecording(upload) : await upload();
 
         // Stop progress simulation
         clearInterval(progressSimulator.interval);
@@ -597,6 +604,36 @@ async function processFile(file) {
     chatFileInput.value = '';
 }
 
+// ============== LIVE TRANSCRIPTION ==============
+
+function showLiveTranscript(text, partial) {
+    if (!inlineLiveTranscript) return;
+    inlineLiveTranscript.innerHTML = `${escapeHtml(text)} <span class="live-partial">${escapeHtml(partial)}</span>`;
+    inlineLiveTranscript.style.display = text || partial ? 'block' : 'none';
+    inlineLiveTranscript.scrollTop = inlineLiveTranscript.scrollHeight;
+}
+
+function resetLiveTranscript() {
+    if (liveTranscriber) liveTranscriber.cancel();
+    liveTranscriber = null;
+    if (inlineLiveTranscript) {
+        inlineLiveTranscript.innerHTML = '';
+        inlineLiveTranscript.style.display = 'none';
+    }
+}
+
+// Finish a live session; if live transcription broke down, upload the recording instead
+async function finishLiveRecording(transcriber, upload) {
+    try {
+        const data = await transcriber.finish();
+        if (data.success) return data;
+        console.warn('Live transcription failed, uploading the recording:', data.message);
+    } catch (error) {
+        console.warn('Live transcription failed, uploading the recording:', error);
+    }
+    return upload();
+}
+
 // ============== RESULT MESSAGE ==============
 
 function addResultMessage(data, type) {
@@ -605,6 +642,10 @@ function addResultMessage(data, type) {
     const messageDiv = document.createElement('div');
     messageDiv.className = 'message ai-message result-message';
 
+    // Stored content the summary/transcript translations are requested for (fetchTranslation)
+    const contentType = { audio: 'meeting', video: 'video', book: 'book' }[type];
+    const contentAttributes = contentType && data.id ? `data-content-type="${contentType}" data-content-id="${data.id}"` : '';
+
     let hasTranscript = data.transcript && type !== 'book';
     let title = data.title || 'Result';
 
@@ -641,15 +682,37 @@ function addResultMessage(data, type) {
                     </button>
                 </div>
             </div>
-            <div class="transcript-content" data-original-transcript="${escapeHtml(data.transcript)}">${escapeHtml(data.transcript)}</div>
+            <div class="transcript-content" data-original-transcript="${escapeHtml(data.transcript)}" ${contentAttributes}>${escapeHtml(data.transcript)}</div>
+        </div>
+    ` : '';
+
+    // Books with several chapters: chapter summaries are generated when a chapter is opened
+    let chaptersSection = (type === 'book' && data.chapters && data.chapters.length > 1) ? `
+        <div class="result-section-chat">
+            <h3>📚 Chapters</h3>
+            <ol class="chapter-list">
+                ${data.chapters.map(chapter => `
+                    <li>
+                        <button class="chapter-btn" onclick="toggleChapterSummary(this, ${data.id}, ${chapter.id})">${escapeHtml(chapter.title || `Chapter ${chapter.position + 1}`)}</button>
+                        <div class="chapter-summary" style="display: none;"></div>
+                    </li>
+                `).join('')}
+            </ol>
         </div>
     ` : '';
 
+    // Author and page count from the book file's metadata, when it had them
+    const bookDetails = type === 'book' ? [
+        data.author ? `by ${data.author}` : '',
+        data.page_count ? `${data.page_count} pages` : ''
+    ].filter(Boolean).join(' · ') : '';
+
     messageDiv.innerHTML = `
         <div class="message-avatar">🤖</div>
         <div class="message-content">
             <div class="message-bubble">
                 <p><strong>✅ ${escapeHtml(title)}</strong></p>
+                ${bookDetails ? `<p class="book-details">${escapeHtml(bookDetails)}</p>` : ''}
                 <p>Your content has been processed!</p>
 
                 ${transcriptSection}
@@ -686,8 +749,10 @@ function addResultMessage(data, type) {
                             </button>
                         </div>
                     </div>
-                    <div class="summary-content" data-original-summary="${escapeHtml(data.summary)}">${formatSummary(data.summary)}</div>
+                    <div class="summary-content" data-original-summary="${escapeHtml(data.summary)}" ${contentAttributes}>${formatSummary(data.summary)}</div>
                 </div>
+
+                ${chaptersSection}
             </div>
         </div>
     `;
@@ -704,6 +769,31 @@ function addResultMessage(data, type) {
     }, 100);
 }
 
+async function toggleChapterSummary(button, bookId, chapterId) {
+    const summaryDiv = button.nextElementSibling;
+    if (summaryDiv.dataset.loaded) {
+        summaryDiv.style.display = summaryDiv.style.display === 'none' ? 'block' : 'none';
+        return;
+    }
+
+    button.disabled = true;
+    summaryDiv.style.display = 'block';
+    summaryDiv.textContent = '⏳ Summarizing chapter...';
+    try {
+        const response = await fetch(`/api/book/${bookId}/chapters/${chapterId}`);
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.message || 'Failed to summarize chapter');
+        }
+        summaryDiv.innerHTML = formatSummary(data.chapter.summary);
+        summaryDiv.dataset.loaded = 'true';
+    } catch (error) {
+        summaryDiv.textContent = `❌ ${error.message}`;
+    } finally {
+        button.disabled = false;
+    }
+}
+
 function escapeHtml(text) {
     const div = document.createElement('div');
     div.textContent = text;
@@ -737,6 +827,12 @@ function formatSummary(text) {
 
 // ============== TRANSLATION IN CHAT ==============
 
+// Stored content a result's summary/transcript element belongs to, or null
+function storedContent(element, field) {
+    const { contentType, contentId } = element.dataset;
+    return contentType ? { content_type: contentType, content_id: Number(contentId), field } : null;
+}
+
 async function translateInChat(selectElement) {
     const targetLanguage = selectElement.value;
     const messageContent = selectElement.closest('.message-content');
@@ -752,16 +848,7 @@ async function translateInChat(selectElement) {
         const currentHTML = summaryDiv.innerHTML;
         summaryDiv.textContent = `⏳ Translating to ${targetLanguage}...`;
 
-        const response = await fetch('/api/translate', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                text: originalSummary,
-                language: targetLanguage
-            })
-        });
-
-        const data = await response.json();
+        const data = await fetchTranslation(originalSummary, targetLanguage, storedContent(summaryDiv, 'summary'));
 
         if (data.success) {
             summaryDiv.innerHTML = formatSummary(data.translated_text);
@@ -812,16 +899,7 @@ async function translateTranscriptInChat(selectElement) {
         const currentHTML = transcriptDiv.innerHTML;
         transcriptDiv.textContent = `⏳ Translating to ${targetLanguage}...`;
 
-        const response = await fetch('/api/translate', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                text: originalTranscript,
-                language: targetLanguage
-            })
-        });
-
-        const data = await response.json();
+        const data = await fetchTranslation(originalTranscript, targetLanguage, storedContent(transcriptDiv, 'transcript'));
 
         if (data.success) {
             transcriptDiv.textContent = data.translated_text;
@@ -993,6 +1071,7 @@ closeInlineRecording.addEventListener('click', () => {
         mediaRecorder.stop();
         clearInterval(recordingInterval);
     }
+    resetLiveTranscript();
     // Reset UI
     inlineStartRecordBtn.style.display = 'flex';
     inlineStopRecordBtn.style.display = 'none';
@@ -1005,18 +1084,19 @@ closeInlineRecording.addEventListener('click', () => {
 inlineStartRecordBtn.addEventListener('click', async () => {
     playSound('click'); // Play click sound
     try {
-        const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
-
-        let mimeType = 'audio/webm';
-        if (MediaRecorder.isTypeSupported('audio/webm')) {
-            mimeType = 'audio/webm';
-        } else if (MediaRecorder.isTypeSupported('audio/mp4')) {
-            mimeType = 'audio/mp4';
-        }
+        // Mono 16 kHz Opus at a speech bitrate (audio_capture.js)
+        const capture = await openSpeechStream();
 
-        mediaRecorder = new MediaRecorder(stream, { mimeType: mimeType });
+        mediaRecorder = createSpeechRecorder(capture.stream);
         audioChunks = [];
 
+        // Live mode: transcribe while recording; without it the recording is uploaded when used
+        resetLiveTranscript();
+        if (LiveTranscriber.isSupported(capture)) {
+            liveTranscriber = new LiveTranscriber(capture.context, capture.source, showLiveTranscript);
+            liveTranscriber.start();
+        }
+
         mediaRecorder.ondataavailable = (event) => {
             // Safari/iOS can send empty chunks - only push real data
             if (event.data && event.data.size > 0) {
@@ -1025,13 +1105,15 @@ inlineStartRecordBtn.addEventListener('click', async () => {
         };
 
         mediaRecorder.onstop = () => {
-            const actualMimeType = mediaRecorder.mimeType || mimeType;
+            const actualMimeType = mediaRecorder.mimeType || 'audio/webm';
             recordedBlob = new Blob(audioChunks, { type: actualMimeType });
+            recordedBitrate = recordingBitrate(recordedBlob, Date.now() - recordingStartTime);
 
-            stream.getTracks().forEach(track => track.stop());
+            capture.release();
 
             if (recordedBlob.size === 0) {
                 recordedBlob = null;
+                resetLiveTranscript();
                 showToast('Recording failed', 'No audio was captured. Try again and speak closer to the mic.', 'error');
                 if (inlineRecordingLabel) inlineRecordingLabel.style.display = '';
                 if (inlineRecordingTimer) inlineRecordingTimer.style.display = 'none';
@@ -1096,24 +1178,22 @@ inlineUseRecordingBtn.addEventListener('click', () => {
     chatTextInput.style.display = 'flex';
 
     const mimeType = recordedBlob.type;
-    let extension = 'webm';
-    if (mimeType.includes('mp4')) {
-        extension = 'm4a';
-    } else if (mimeType.includes('ogg')) {
-        extension = 'ogg';
-    }
-
-    const audioFile = new File([recordedBlob], `recording-${Date.now()}.${extension}`, {
+    const audioFile = new File([recordedBlob], `recording-${Date.now()}.${recordingExtension(mimeType)}`, {
         type: mimeType
     });
 
     addUserMessage('Recorded audio', {
         icon: '🎤',
         name: audioFile.name,
-        size: formatFileSize(audioFile.size)
+        size: `${formatFileSize(audioFile.size)} · ${Math.round(recordedBitrate / 1000)} kbps`
     });
 
-    processFile(audioFile);
+    // A live recording is already transcribed: finishing the session replaces the upload
+    const transcriber = liveTranscriber;
+    liveTranscriber = null;
+    processFile(audioFile, { recording_bitrate: recordedBitrate },
+        transcriber ? (upload) => finishLiveRecording(transcriber, upload) : null);
+    if (inlineLiveTranscript) inlineLiveTranscript.style.display = 'none';
 
     // Reset recording
     inlineAudioPreview.style.display = 'none';
@@ -1128,6 +1208,7 @@ inlineUseRecordingBtn.addEventListener('click', () => {
 inlineDiscardRecordingBtn.addEventListener('click', () => {
     playSound('click'); // Play click sound
     recordedBlob = null;
+    resetLiveTranscript();
     audioChunks = [];
     inlineAudioPlayback.src = '';
     inlineAudioPreview.style.display = 'none';
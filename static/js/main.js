@@ -378,19 +378,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 // Recorded audio
                 formData = new FormData();
                 const mimeType = recordedBlob.type;
-                let extension = 'webm';
-                if (mimeType.includes('mp4')) {
-                    extension = 'm4a';
-                } else if (mimeType.includes('ogg')) {
-                    extension = 'ogg';
-                } else if (mimeType.includes('webm')) {
-                    extension = 'webm';
-                }
-
-                const audioFile = new File([recordedBlob], `recording-${Date.now()}.${extension}`, {
+                const audioFile = new File([recordedBlob], `recording-${Date.now()}.${recordingExtension(mimeType)}`, {
                     type: mimeType
                 });
                 formData.append('audio', audioFile);
+                formData.append('recording_bitrate', recordedBitrate);
                 uploadEndpoint = '/upload';
                 isBookUpload = false;
             } else if (selectedFileType === 'book' && bookFileInput && bookFileInput.files && bookFileInput.files.length > 0) {
@@ -510,6 +502,7 @@ document.addEventListener('DOMContentLoaded', function() {
     let recordingInterval;
     let recordingStartTime;
     let recordedBlob;
+    let recordedBitrate = 0;
 
     if (recordBtn) {
         recordBtn.addEventListener('click', async function() {
@@ -525,26 +518,13 @@ document.addEventListener('DOMContentLoaded', function() {
                     return;
                 }
 
-                const stream = await navigator.mediaDevices.getUserMedia({
-                    audio: true
-                });
+                // Mono 16 kHz speech stream (audio_capture.js)
+                const capture = await openSpeechStream();
 
                 showToast('Recording Started', 'Your audio is being recorded', 'success', 3000);
 
-                // Detect supported audio format for this browser
-                let mimeType = 'audio/webm';
-                if (MediaRecorder.isTypeSupported('audio/webm')) {
-                    mimeType = 'audio/webm';
-                } else if (MediaRecorder.isTypeSupported('audio/mp4')) {
-                    mimeType = 'audio/mp4';
-                } else if (MediaRecorder.isTypeSupported('audio/webm;codecs=opus')) {
-                    mimeType = 'audio/webm;codecs=opus';
-                } else if (MediaRecorder.isTypeSupported('audio/ogg;codecs=opus')) {
-                    mimeType = 'audio/ogg;codecs=opus';
-                }
-
-                // Create MediaRecorder with detected format
-                mediaRecorder = new MediaRecorder(stream, { mimeType: mimeType });
+                // Opus at a speech bitrate where the browser supports it
+                mediaRecorder = createSpeechRecorder(capture.stream);
                 audioChunks = [];
 
                 // Handle data available
@@ -554,10 +534,12 @@ document.addEventListener('DOMContentLoaded', function() {
 
                 // Handle recording stop
                 mediaRecorder.onstop = () => {
-                    const actualMimeType = mediaRecorder.mimeType || mimeType;
+                    const actualMimeType = mediaRecorder.mimeType || 'audio/webm';
 
                     // Create blob from chunks with the correct type
                     recordedBlob = new Blob(audioChunks, { type: actualMimeType });
+                    recordedBitrate = recordingBitrate(recordedBlob, Date.now() - recordingStartTime);
+                    console.log(`Recorded ${actualMimeType} at ${Math.round(recordedBitrate / 1000)} kbps (${recordedBlob.size} bytes)`);
 
                     // Create URL for playback
                     const audioUrl = URL.createObjectURL(recordedBlob);
@@ -567,7 +549,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     audioPreview.style.display = 'block';
 
                     // Stop all tracks
-                    stream.getTracks().forEach(track => track.stop());
+                    capture.release();
                 };
 
                 // Start recording
@@ -824,6 +806,28 @@ function showVideoModal(videoId) {
 }
 
 // Translation in Modal - Auto translate on language selection
+/**
+ * Translate text. With `content` ({ content_type, content_id, field }) the text is a field of
+ * a stored meeting/book/video: /api/translations answers from the database when that field
+ * was translated before. Resolves with the JSON response ({ success, translated_text }).
+ */
+async function fetchTranslation(text, language, content = null) {
+    const response = await fetch(content ? '/api/translations' : '/api/translate', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(content ? { ...content, language } : { text, language })
+    });
+    return response.json();
+}
+
+// Stored content shown in the result modal, for fetchTranslation
+function modalContent() {
+    if (currentMeetingData) return { content_type: 'meeting', content_id: currentMeetingData.id, field: 'summary' };
+    if (currentBookData) return { content_type: 'book', content_id: currentBookData.id, field: 'summary' };
+    if (currentVideoData) return { content_type: 'video', content_id: currentVideoData.id, field: 'summary' };
+    return null;
+}
+
 async function translateModalSummary() {
     const select = document.getElementById('modalTargetLanguage');
     const targetLanguage = select.value;
@@ -845,18 +849,7 @@ async function translateModalSummary() {
         const originalContent = summaryContent.textContent;
         summaryContent.textContent = '⏳ Translating to ' + targetLanguage + '...';
 
-        const response = await fetch('/api/translate', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                text: textToTranslate,
-                language: targetLanguage
-            })
-        });
-
-        const data = await response.json();
+        const data = await fetchTranslation(textToTranslate, targetLanguage, modalContent());
 
         if (data.success) {
             // Replace summary content with translated text
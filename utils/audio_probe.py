@@ -0,0 +1,93 @@
+"""
+Fast audio upload probe
+
+Looks at the size of an uploaded file and the container signature in its first bytes,
+without saving or decoding it, so oversized or non-audio uploads are rejected before
+they are written to disk and shipped to AssemblyAI.
+"""
+import os
+from collections import namedtuple
+from utils import metrics
+
+# container: 'wav', 'ogg', 'opus', 'flac', 'webm', 'mp4', 'mp3' or 'aac' (None when unrecognized)
+AudioProbe = namedtuple('AudioProbe', ['container', 'size'])
+
+PROBE_BYTES = 64
+# Allowance for the multipart boundaries and form fields around the file in a request body
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+# Smaller than any real recording: a container header with (almost) no audio in it
+MIN_AUDIO_BYTES = 1024
+
+
+def sniff_container(header):
+    """
+    Identify an audio container from its first bytes
+
+    Args:
+        header (bytes): Start of the file (PROBE_BYTES is plenty)
+
+    Returns:
+        str: container name, or None when the bytes are not a known audio format
+    """
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return 'wav'
+    if header[:4] == b'OggS':
+        return 'opus' if b'OpusHead' in header else 'ogg'
+    if header[:4] == b'fLaC':
+        return 'flac'
+    if header[:4] == b'\x1aE\xdf\xa3':  # EBML: WebM / Matroska
+        return 'webm'
+    if header[4:8] == b'ftyp':  # ISO base media: m4a / mp4
+        return 'mp4'
+    if header[:3] == b'ID3':
+        return 'mp3'
+    if len(header) >= 2 and header[0] == 0xFF:
+        if header[1] & 0xF6 == 0xF0:  # ADTS frame sync, layer 0
+            return 'aac'
+        if header[1] & 0xE0 == 0xE0:  # MPEG audio frame sync
+            return 'mp3'
+    return None
+
+
+def probe_audio(stream):
+    """
+    Measure an upload stream and sniff its container, leaving the position unchanged
+
+    Args:
+        stream: Seekable file object (werkzeug FileStorage.stream)
+
+    Returns:
+        AudioProbe: container (None when unrecognized) and size in bytes
+    """
+    position = stream.tell()
+    header = stream.read(PROBE_BYTES)
+    size = stream.seek(0, os.SEEK_END) - position
+    stream.seek(position)
+    return AudioProbe(sniff_container(header), size)
+
+
+def audio_upload_error(file, max_bytes):
+    """
+    Check an uploaded audio file before it is saved
+
+    Args:
+        file: werkzeug FileStorage
+        max_bytes: Largest accepted upload
+
+    Returns:
+        tuple: (error message, HTTP status) for a rejected upload, or None when it looks fine
+    """
+    probe = probe_audio(file.stream)
+    if probe.size > max_bytes:
+        error = (f'Audio file is too large ({probe.size // (1024 * 1024)} MB, '
+                 f'limit {max_bytes // (1024 * 1024)} MB)', 413, 'too_large')
+    elif probe.size < MIN_AUDIO_BYTES:
+        error = ('Audio file is empty or truncated, please record again', 400, 'empty')
+    elif probe.container is None:
+        error = ('File is not a supported audio format', 400, 'invalid')
+    else:
+        return None
+
+    message, status, reason = error
+    metrics.inc('noteflow_upload_rejected_total', kind='audio', reason=reason)
+    return message, status
@@ -0,0 +1,102 @@
+"""
+Database connection pool: instrumented QueuePool and a scope that keeps connections out of slow external calls
+
+Metrics (per worker, merged by /metrics):
+    noteflow_db_pool_wait_seconds           time spent waiting for a pooled connection
+    noteflow_db_pool_timeouts_total         checkouts that gave up after DB_POOL_TIMEOUT
+    noteflow_db_connection_hold_seconds     checkout -> checkin duration
+    noteflow_db_pool_checked_out            connections currently in use (gauge)
+
+Peak checked_out summed over workers, plus the wait-time tail, is what PostgreSQL's
+max_connections has to cover: workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) is the hard upper bound.
+"""
+import time
+import threading
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from utils import metrics
+
+# Seconds; waits are normally sub-millisecond, anything visible means the pool is too small
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+
+_checked_out = {'count': 0}
+_checked_out_lock = threading.Lock()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.inc('noteflow_db_pool_timeouts_total')
+            raise
+        finally:
+            metrics.observe('noteflow_db_pool_wait_seconds', time.perf_counter() - started, buckets=POOL_WAIT_BUCKETS)
+
+
+def _is_memory_sqlite(uri):
+    return uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in uri
+
+
+def configure_pool(app):
+    """
+    Use the instrumented pool for the app's engine (call before db.init_app)
+
+    In-memory SQLite keeps Flask-SQLAlchemy's StaticPool and gets no pool sizing.
+    """
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if _is_memory_sqlite(app.config.get('SQLALCHEMY_DATABASE_URI', '')):
+        for key in ('pool_size', 'max_overflow', 'pool_timeout', 'pool_use_lifo'):
+            options.pop(key, None)
+    else:
+        options['poolclass'] = InstrumentedQueuePool
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    @event.listens_for(InstrumentedQueuePool, 'checkout')
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checked_out_at'] = time.perf_counter()
+        _track_checked_out(1)
+
+    @event.listens_for(InstrumentedQueuePool, 'checkin')
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop('checked_out_at', None)
+        if started is not None:
+            metrics.observe('noteflow_db_connection_hold_seconds', time.perf_counter() - started)
+            _track_checked_out(-1)
+
+
+def _track_checked_out(delta):
+    with _checked_out_lock:
+        _checked_out['count'] += delta
+        count = _checked_out['count']
+    metrics.set_gauge('noteflow_db_pool_checked_out', count)
+
+
+@contextmanager
+def released_connection(session):
+    """
+    End the session's transaction so its connection goes back to the pool during slow work
+    (transcription, LLM calls, downloads); the next query after the block checks one out again.
+
+    Loaded objects stay attached and keep their values (nothing is expired), and pending
+    changes are committed, so callers can keep using e.g. current_user.id afterwards.
+
+    Usage:
+        with released_connection(db.session):
+            summary = generate_summary(transcript)
+        db.session.add(Meeting(summary=summary, ...))
+        db.session.commit()
+    """
+    sess = session()  # scoped_session -> the request/thread's Session
+    expire_on_commit = sess.expire_on_commit
+    sess.expire_on_commit = False
+    try:
+        sess.commit()
+    finally:
+        sess.expire_on_commit = expire_on_commit
+    yield
@@ -0,0 +1,87 @@
+"""
+Per-route-class request deadlines
+
+Requests are split into two classes with their own time budget:
+    read        GET/HEAD requests (API reads, pages): REQUEST_TIMEOUT_READ, default 30s
+    processing  everything else (uploads, video/batch processing, chat, translate):
+                REQUEST_TIMEOUT_PROCESSING, default 300s
+
+Threads can't be killed, so the budget is enforced where the time is spent: upstream
+calls take their timeout from remaining(), and on PostgreSQL every transaction a read
+request begins gets the remaining budget as its statement_timeout (set when the
+transaction starts, so requests that never query don't touch the pool). Requests that
+still overrun are counted in noteflow_request_deadline_exceeded_total.
+"""
+import time
+from flask import g, request, has_request_context
+from sqlalchemy import event, text
+from utils import metrics
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def route_class(method):
+    """Classify a request as 'read' or 'processing' by its HTTP method"""
+    return 'read' if method in READ_METHODS else 'processing'
+
+
+def remaining(default=None):
+    """
+    Seconds left in the current request's budget (never below 1), or `default`
+    outside a request or when no deadline applies
+    """
+    deadline = g.get('request_deadline') if has_request_context() else None
+    if deadline is None:
+        return default
+    return max(1.0, deadline - time.monotonic())
+
+
+class RequestDeadlines:
+    """Flask extension that assigns every request a deadline by route class"""
+
+    def __init__(self, app=None, db=None):
+        self.timeouts = {'read': 30, 'processing': 300}
+        self.db = db
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None):
+        """Register request hooks"""
+        self.timeouts = {
+            'read': app.config.get('REQUEST_TIMEOUT_READ', 30),
+            'processing': app.config.get('REQUEST_TIMEOUT_PROCESSING', 300),
+        }
+        self.db = db or self.db
+        app.extensions['request_deadlines'] = self
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        if self.db is not None:
+            event.listen(self.db.session, 'after_begin', _bound_read_transaction)
+
+    def _before_request(self):
+        cls = route_class(request.method)
+        g.route_class = cls
+        g.request_deadline = time.monotonic() + self.timeouts[cls]
+
+    def _after_request(self, response):
+        deadline = g.get('request_deadline')
+        if deadline is not None and time.monotonic() > deadline:
+            metrics.inc('noteflow_request_deadline_exceeded_total', route_class=g.route_class,
+                        endpoint=request.endpoint or 'unknown')
+            print(f"Request exceeded its {g.route_class} deadline: {request.method} {request.path}")
+        return response
+
+
+def _bound_read_transaction(session, transaction, connection):
+    """
+    Session after_begin hook: bound the queries of a read request's transaction by what is
+    left of its budget (again for each transaction, e.g. after released_connection commits)
+    """
+    if connection.dialect.name != 'postgresql' or not has_request_context() or g.get('route_class') != 'read':
+        return
+    # SET LOCAL ends with the transaction
+    connection.execute(text(f"SET LOCAL statement_timeout = {int(remaining() * 1000)}"))
+
+
+request_deadlines = RequestDeadlines()
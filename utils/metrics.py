@@ -0,0 +1,381 @@
+"""
+Lightweight Prometheus-style metrics (counters, gauges and histograms) shared across gunicorn workers
+
+Each process keeps its samples in memory and a background thread periodically
+writes them to METRICS_DIR/metrics-<pid>.json (atomic replace). The /metrics
+endpoint merges the files of all workers, so any worker can answer a scrape.
+Gauges are summed over the workers that are still alive.
+
+Under gunicorn (gunicorn.conf.py) the master never runs the flush thread: samples
+recorded while preloading are written once by flush() when the master is ready, each
+forked worker starts with empty samples and a fresh lock, and starts its own flush
+thread on first use. When a worker exits, the master folds its counters and histograms
+into metrics-retired.json and deletes its file, so totals survive restarts and a reused
+pid never overwrites another worker's samples. Outside gunicorn (uvicorn workers, flask
+run) a scrape retires the files of processes that are no longer alive the same way, and
+start.sh clears the directory before uvicorn starts.
+
+Histograms whose buckets differ between files (buckets changed between deploys) are
+re-bucketed onto the first file's buckets: sum and count stay exact, a bucket count takes
+the nearest lower bucket of the other file.
+"""
+import os
+import json
+import time
+import glob
+import atexit
+import tempfile
+import threading
+try:
+    import fcntl
+except ImportError:  # Windows: no retiring from several processes at once
+    fcntl = None
+from functools import wraps
+
+# Seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+# Prompt/completion tokens
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+# Bits per second of browser recordings
+BITRATE_BUCKETS = (8000, 12000, 16000, 24000, 32000, 48000, 64000, 96000, 128000, 256000)
+
+METRICS_DIR = os.environ.get('METRICS_DIR') or os.path.join(tempfile.gettempdir(), 'noteflow_metrics')
+FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+
+_lock = threading.Lock()
+_counters = {}  # (name, labels) -> value
+_gauges = {}  # (name, labels) -> value
+_histograms = {}  # (name, labels) -> {'buckets': [...], 'counts': [...], 'sum': float, 'count': int}
+_state = {'pid': None, 'master_pid': None, 'dirty': False, 'flusher': None}
+
+# Counters and histograms of exited workers, and the lock its writers hold
+RETIRED_FILE = 'metrics-retired.json'
+RETIRED_LOCK = 'metrics-retired.lock'
+
+
+def _labels_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _ensure_flusher():
+    """Start the flush thread of this process on first use (never in the gunicorn master)"""
+    pid = os.getpid()
+    if _state['pid'] == pid or pid == _state['master_pid']:
+        return
+    _state['pid'] = pid
+    thread = threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True)
+    thread.start()
+    _state['flusher'] = thread
+
+
+def mark_master():
+    """
+    Record this process as the gunicorn master (call from gunicorn.conf.py, before the app
+    is preloaded): it records samples but leaves flushing to an explicit flush()
+    """
+    _state['master_pid'] = os.getpid()
+
+
+def _reset_after_fork():
+    """
+    In a forked child: drop the parent's samples (the parent reports them) and replace the
+    lock, which a parent thread may have held at the moment of the fork
+    """
+    global _lock
+    _lock = threading.Lock()
+    _counters.clear()
+    _gauges.clear()
+    _histograms.clear()
+    _state.update(pid=None, dirty=False, flusher=None)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def inc(name, amount=1, **labels):
+    """Increment a counter"""
+    key = (name, _labels_key(labels))
+    with _lock:
+        _ensure_flusher()
+        _counters[key] = _counters.get(key, 0) + amount
+        _state['dirty'] = True
+
+
+def set_gauge(name, value, **labels):
+    """Set a gauge to the current value for this process"""
+    key = (name, _labels_key(labels))
+    with _lock:
+        _ensure_flusher()
+        _gauges[key] = value
+        _state['dirty'] = True
+
+
+def observe(name, value, buckets=DEFAULT_BUCKETS, **labels):
+    """Record a value in a histogram"""
+    key = (name, _labels_key(labels))
+    with _lock:
+        _ensure_flusher()
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = {'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            _histograms[key] = hist
+        for i, bound in enumerate(hist['buckets']):
+            if value <= bound:
+                hist['counts'][i] += 1
+        hist['sum'] += value
+        hist['count'] += 1
+        _state['dirty'] = True
+
+
+class timed:
+    """
+    Time a block or a function into a histogram (seconds)
+
+    Usage:
+        with timed('noteflow_stage_seconds', stage='transcribe'):
+            ...
+
+        @timed('noteflow_stage_seconds', stage='extract_audio')
+        def extract(...):
+            ...
+    """
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(self.name, **self.labels):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def _snapshot():
+    with _lock:
+        return {
+            'pid': os.getpid(),
+            'counters': [[name, list(labels), value] for (name, labels), value in _counters.items()],
+            'gauges': [[name, list(labels), value] for (name, labels), value in _gauges.items()],
+            'histograms': [[name, list(labels), dict(hist, counts=list(hist['counts']))]
+                           for (name, labels), hist in _histograms.items()]
+        }
+
+
+def _write_json(path, data):
+    """Write a metrics file atomically (readers never see a partial file)"""
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=METRICS_DIR, prefix='.tmp-')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def flush():
+    """Write this process's samples to the shared metrics directory"""
+    if not _state['dirty']:
+        return
+    _state['dirty'] = False
+    try:
+        _write_json(os.path.join(METRICS_DIR, f'metrics-{os.getpid()}.json'), _snapshot())
+    except OSError as e:
+        _state['dirty'] = True
+        print(f"Metrics flush failed: {e}")
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush()
+
+
+atexit.register(flush)
+
+
+def retire_worker(pid):
+    """
+    Fold an exited worker's counters and histograms into the retired file and delete its
+    own file (gunicorn child_exit, or a scrape that finds the worker dead). Writers hold a
+    file lock, so two processes never retire the same file twice or lose each other's update.
+    """
+    path = os.path.join(METRICS_DIR, f'metrics-{pid}.json')
+    retired_path = os.path.join(METRICS_DIR, RETIRED_FILE)
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        with open(os.path.join(METRICS_DIR, RETIRED_LOCK), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                return  # Already retired (or never flushed)
+            snapshots = [snapshot]
+            try:
+                with open(retired_path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                pass
+
+            counters, _, histograms = _combine(snapshots, with_gauges=False)
+            _write_json(retired_path, {
+                'pid': None,
+                'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+                'histograms': [[name, list(labels), hist] for (name, labels), hist in histograms.items()],
+            })
+            os.remove(path)
+    except OSError as e:
+        print(f"Could not retire metrics of worker {pid}: {e}")
+
+
+def _retire_dead_workers():
+    """Retire the files of processes that exited without gunicorn's child_exit (uvicorn, flask run)"""
+    for path in glob.glob(os.path.join(METRICS_DIR, 'metrics-*.json')):
+        pid = os.path.basename(path)[len('metrics-'):-len('.json')]
+        if pid.isdigit() and not _pid_alive(int(pid)):
+            retire_worker(int(pid))
+
+
+def clear_metrics_dir():
+    """Remove samples of previous runs (call once before workers start: gunicorn master, start.sh)"""
+    for path in glob.glob(os.path.join(METRICS_DIR, 'metrics-*.json')):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, TypeError):
+        pass
+    return True
+
+
+def _merged():
+    """Merge samples of every worker; this process contributes its live in-memory state"""
+    _retire_dead_workers()
+    snapshots = [_snapshot()]  # First: the running code's histogram buckets win
+    own_file = os.path.join(METRICS_DIR, f'metrics-{os.getpid()}.json')
+    for path in glob.glob(os.path.join(METRICS_DIR, 'metrics-*.json')):
+        if path == own_file:
+            continue
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return _combine(snapshots)
+
+
+def _combine(snapshots, with_gauges=True):
+    """Sum counters and histograms of snapshots, and gauges of the live processes among them"""
+    counters = {}
+    gauges = {}
+    histograms = {}
+
+    for snap in snapshots:
+        for name, labels, value in snap['counters']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0) + value
+        # A dead worker's last gauge values no longer describe anything
+        if with_gauges and snap.get('pid') is not None and _pid_alive(snap['pid']):
+            for name, labels, value in snap.get('gauges', []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                gauges[key] = gauges.get(key, 0) + value
+        for name, labels, hist in snap['histograms']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            merged = histograms.get(key)
+            if merged is None:
+                histograms[key] = dict(hist, counts=list(hist['counts']))
+                continue
+            counts = hist['counts'] if merged['buckets'] == hist['buckets'] else _rebucket(hist, merged['buckets'])
+            merged['counts'] = [a + b for a, b in zip(merged['counts'], counts)]
+            merged['sum'] += hist['sum']
+            merged['count'] += hist['count']
+
+    return counters, gauges, histograms
+
+
+def _rebucket(hist, buckets):
+    """
+    Cumulative counts of a histogram on other bucket bounds: each bound takes the count of
+    the histogram's largest bound at or below it (exact where the bounds are shared)
+    """
+    counts = []
+    for bound in buckets:
+        below = [count for own, count in zip(hist['buckets'], hist['counts']) if own <= bound]
+        counts.append(below[-1] if below else 0)
+    return counts
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + (list(extra) if extra else [])
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def render_metrics():
+    """Render all metrics in the Prometheus text exposition format"""
+    counters, gauges, histograms = _merged()
+    lines = []
+
+    typed = set()
+    for (name, labels), value in sorted(counters.items()):
+        if name not in typed:
+            lines.append(f'# TYPE {name} counter')
+            typed.add(name)
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+
+    for (name, labels), value in sorted(gauges.items()):
+        if name not in typed:
+            lines.append(f'# TYPE {name} gauge')
+            typed.add(name)
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+
+    for (name, labels), hist in sorted(histograms.items()):
+        if name not in typed:
+            lines.append(f'# TYPE {name} histogram')
+            typed.add(name)
+        for bound, count in zip(hist['buckets'], hist['counts']):
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {count}')
+        lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {hist["count"]}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {hist["sum"]}')
+        lines.append(f'{name}_count{_format_labels(labels)} {hist["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def instrument_sqlalchemy():
+    """Time every ORM session commit (flush + COMMIT) into noteflow_db_commit_seconds"""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    @event.listens_for(Session, 'before_commit')
+    def _before_commit(session):
+        session.info['commit_started'] = time.perf_counter()
+
+    @event.listens_for(Session, 'after_commit')
+    def _after_commit(session):
+        started = session.info.pop('commit_started', None)
+        if started is not None:
+            observe('noteflow_db_commit_seconds', time.perf_counter() - started)
+
+    @event.listens_for(Session, 'after_rollback')
+    def _after_rollback(session):
+        session.info.pop('commit_started', None)
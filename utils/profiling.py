@@ -0,0 +1,181 @@
+"""
+Opt-in request profiling: stack-sampled profiles captured per request and stored as flamegraph input
+
+A request is profiled when it carries `X-Profile: <PROFILING_TOKEN>` or when it is
+picked by PROFILING_SAMPLE_RATE. One sampler thread per process reads the stacks of
+profiled request threads every PROFILING_INTERVAL_MS via sys._current_frames().
+Profiles are written to PROFILING_DIR/<request_id>.folded (collapsed stacks, the input
+format of flamegraph.pl and speedscope) with a <request_id>.json metadata file. The id is
+always generated here and returned in X-Request-ID; an X-Request-ID sent by the client is
+only recorded in the metadata.
+"""
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import threading
+from datetime import datetime
+from flask import g, request
+
+PROFILE_HEADER = 'X-Profile'
+REQUEST_ID_HEADER = 'X-Request-ID'
+PROFILE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}"
+
+
+class _Sampler:
+    """Background thread that samples the stacks of the threads currently being profiled"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active = {}  # thread id -> {stack string: count}
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def start(self, thread_id):
+        with self._lock:
+            self._active[thread_id] = {}
+            # (Re)start the thread lazily, including after a fork
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, thread_id):
+        with self._lock:
+            return self._active.pop(thread_id, {})
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._active
+            if idle:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, stacks in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    stack = ';'.join(reversed(labels))
+                    stacks[stack] = stacks.get(stack, 0) + 1
+            del frames
+            time.sleep(self.interval)
+
+
+class RequestProfiler:
+    """Flask extension that captures sampled profiles for selected requests"""
+
+    def __init__(self, app=None):
+        self.profile_dir = None
+        self.sample_rate = 0.0
+        self.token = None
+        self._sampler = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register request hooks"""
+        self.profile_dir = app.config.get('PROFILING_DIR')
+        self.sample_rate = app.config.get('PROFILING_SAMPLE_RATE', 0.0)
+        self.token = app.config.get('PROFILING_TOKEN')
+        self._sampler = _Sampler(app.config.get('PROFILING_INTERVAL_MS', 5) / 1000.0)
+        app.extensions['request_profiler'] = self
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _wanted(self):
+        """Cheap check run on every request: a header lookup and at most one random()"""
+        if self.token and request.headers.get(PROFILE_HEADER) == self.token:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _before_request(self):
+        if not self._wanted():
+            return
+        g.profile_id = uuid.uuid4().hex
+        g.profile_started = time.perf_counter()
+        self._sampler.start(threading.get_ident())
+
+    def _after_request(self, response):
+        profile_id = g.get('profile_id')
+        if profile_id:
+            g.profile_status = response.status_code
+            response.headers[REQUEST_ID_HEADER] = profile_id
+        return response
+
+    def _teardown_request(self, exc):
+        profile_id = g.pop('profile_id', None)
+        if not profile_id:
+            return
+        stacks = self._sampler.stop(threading.get_ident())
+        duration = time.perf_counter() - g.pop('profile_started')
+        try:
+            self._save(profile_id, stacks, duration, g.pop('profile_status', 500))
+        except OSError as e:
+            print(f"Saving profile {profile_id} failed: {e}")
+
+    def _save(self, profile_id, stacks, duration, status):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        with open(os.path.join(self.profile_dir, f'{profile_id}.folded'), 'w') as f:
+            for stack, count in sorted(stacks.items(), key=lambda kv: -kv[1]):
+                f.write(f'{stack} {count}\n')
+        meta = {
+            'id': profile_id,
+            'client_request_id': request.headers.get(REQUEST_ID_HEADER, '')[:128] or None,
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': status,
+            'duration_ms': round(duration * 1000, 1),
+            'samples': sum(stacks.values()),
+            'interval_ms': self._sampler.interval * 1000,
+            'pid': os.getpid(),
+            'created_at': datetime.utcnow().isoformat()
+        }
+        with open(os.path.join(self.profile_dir, f'{profile_id}.json'), 'w') as f:
+            json.dump(meta, f)
+
+    def list_profiles(self):
+        """Metadata of stored profiles, newest first"""
+        if not os.path.isdir(self.profile_dir):
+            return []
+        profiles = []
+        for name in os.listdir(self.profile_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.profile_dir, name)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda p: p.get('created_at', ''), reverse=True)
+
+    def profile_path(self, profile_id):
+        """Path of a stored .folded profile, or None (also for anything but a generated id)"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.profile_dir, f'{profile_id}.folded')
+        return path if os.path.isfile(path) else None
+
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,253 @@
+"""
+Rate limiting and admission control for the expensive endpoints
+
+Two route classes are limited, each by token buckets and by a concurrency cap:
+    llm         chat and translation (Groq spend): RATE_LIMIT_LLM_* per user,
+                RATE_LIMIT_ANONYMOUS_* per client IP for requests without a login
+    processing  uploads, video processing, batches, live sessions: RATE_LIMIT_PROCESSING_*
+                per user, and at most ADMISSION_PROCESSING_PER_USER running per user
+
+Token buckets live in the rate_limit_buckets table, so every worker draws from the same
+bucket; each request is one conditional UPDATE. Concurrency caps are per worker process:
+a request over its class's cap waits up to ADMISSION_QUEUE_TIMEOUT seconds for a slot,
+with at most ADMISSION_MAX_QUEUE requests waiting. Rejected requests get a 429 with
+Retry-After right away. Rejections, queue length and in-flight requests are in /metrics.
+
+    @app.route('/api/translate', methods=['POST'])
+    @rate_limited('llm')
+    def translate(): ...
+"""
+import math
+import time
+import threading
+from collections import namedtuple
+from functools import wraps
+from flask import jsonify, request
+from flask_login import current_user
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from models.meeting import db, RateLimitBucket
+from utils import metrics
+
+# Token bucket (`per_minute` refill, up to `burst` tokens) and concurrency caps of a route class
+Policy = namedtuple('Policy', ['per_minute', 'burst', 'anonymous_per_minute', 'anonymous_burst',
+                               'concurrency', 'per_user'])
+
+# A refused request: user-facing message and seconds until it is worth retrying
+Rejection = namedtuple('Rejection', ['message', 'retry_after'])
+
+# Buckets untouched for this long are full again and are deleted
+BUCKET_TTL = 24 * 3600
+
+
+def client_ip(remote_addr, forwarded_for, trusted_hops):
+    """
+    Address of the client: the X-Forwarded-For entry added by the outermost of
+    `trusted_hops` reverse proxies, or the peer address without trusted proxies
+    """
+    if trusted_hops > 0 and forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(',') if hop.strip()]
+        if hops:
+            return hops[max(0, len(hops) - trusted_hops)]
+    return remote_addr or 'unknown'
+
+
+class TokenBuckets:
+    """Token buckets in the rate_limit_buckets table, updated atomically by every worker"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def take(self, key, per_minute, burst, now=None):
+        """
+        Take a token from the bucket `key`
+
+        Returns:
+            float: 0 when a token was taken, otherwise seconds until one is available
+        """
+        now = time.time() if now is None else now
+        rate = per_minute / 60.0
+        table = RateLimitBucket.__table__
+        refilled = table.c.tokens + (now - table.c.updated_at) * rate
+        level = case((refilled > burst, burst), else_=refilled)
+
+        # Separate short transaction: the request's session and its transaction are left alone
+        for _ in range(2):
+            try:
+                with self.db.engine.begin() as conn:
+                    taken = conn.execute(
+                        update(table).where(table.c.key == key, level >= 1).values(tokens=level - 1, updated_at=now)
+                    ).rowcount
+                    if taken:
+                        return 0.0
+                    row = conn.execute(select(table.c.tokens, table.c.updated_at).where(table.c.key == key)).first()
+                    if row is None:
+                        conn.execute(delete(table).where(table.c.updated_at < now - BUCKET_TTL))
+                        conn.execute(insert(table).values(key=key, tokens=burst - 1, updated_at=now))
+                        return 0.0
+                tokens = min(burst, row.tokens + (now - row.updated_at) * rate)
+                return (1 - tokens) / rate if rate > 0 else float(BUCKET_TTL)
+            except IntegrityError:
+                continue  # Another worker created the bucket first: take from it
+        return 0.0
+
+
+class _Gate:
+    """Concurrency cap of one route class in this process, with a bounded wait queue"""
+
+    def __init__(self, route_class, limit, per_user):
+        self.route_class = route_class
+        self.limit = limit
+        self.per_user = per_user
+        self.running = 0
+        self.waiting = 0
+        self.by_user = {}
+        self.cond = threading.Condition()
+
+    def acquire(self, identity, max_queue, timeout):
+        """
+        Returns:
+            str or None: rejection reason ('user_concurrency', 'queue_full', 'queue_timeout'),
+            None once a slot is held
+        """
+        with self.cond:
+            if self.per_user and identity[0] == 'user' and self.by_user.get(identity, 0) >= self.per_user:
+                return 'user_concurrency'
+            if self.running >= self.limit:
+                if self.waiting >= max_queue:
+                    return 'queue_full'
+                started = time.monotonic()
+                deadline = started + timeout
+                self.waiting += 1
+                self._report()
+                try:
+                    while self.running >= self.limit:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return 'queue_timeout'
+                        self.cond.wait(remaining)
+                finally:
+                    self.waiting -= 1
+                    metrics.observe('noteflow_admission_wait_seconds', time.monotonic() - started,
+                                    route_class=self.route_class)
+            self.running += 1
+            self.by_user[identity] = self.by_user.get(identity, 0) + 1
+            self._report()
+            return None
+
+    def release(self, identity):
+        with self.cond:
+            self.running -= 1
+            if self.by_user.get(identity, 0) <= 1:
+                self.by_user.pop(identity, None)
+            else:
+                self.by_user[identity] -= 1
+            self._report()
+            self.cond.notify()
+
+    def _report(self):
+        metrics.set_gauge('noteflow_admission_queue_length', self.waiting, route_class=self.route_class)
+        metrics.set_gauge('noteflow_admission_in_flight', self.running, route_class=self.route_class)
+
+
+class RateLimiter:
+    """Flask extension: token buckets plus per-process concurrency caps by route class"""
+
+    def __init__(self, app=None, db=None):
+        self.enabled = False
+        self.policies = {}
+        self.gates = {}
+        self.buckets = None
+        self.max_queue = 16
+        self.queue_timeout = 2.0
+        self.trusted_hops = 0
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None):
+        """Read the limits from the app config"""
+        config = app.config
+        self.enabled = config.get('RATE_LIMIT_ENABLED', True)
+        self.policies = {
+            'llm': Policy(config['RATE_LIMIT_LLM_PER_MINUTE'], config['RATE_LIMIT_LLM_BURST'],
+                          config['RATE_LIMIT_ANONYMOUS_PER_MINUTE'], config['RATE_LIMIT_ANONYMOUS_BURST'],
+                          config['ADMISSION_LLM_CONCURRENCY'], 0),
+            'processing': Policy(config['RATE_LIMIT_PROCESSING_PER_MINUTE'], config['RATE_LIMIT_PROCESSING_BURST'],
+                                 config['RATE_LIMIT_ANONYMOUS_PER_MINUTE'], config['RATE_LIMIT_ANONYMOUS_BURST'],
+                                 config['ADMISSION_PROCESSING_CONCURRENCY'], config['ADMISSION_PROCESSING_PER_USER']),
+        }
+        self.gates = {name: _Gate(name, policy.concurrency, policy.per_user) for name, policy in self.policies.items()}
+        self.buckets = TokenBuckets(db)
+        self.max_queue = config['ADMISSION_MAX_QUEUE']
+        self.queue_timeout = config['ADMISSION_QUEUE_TIMEOUT']
+        self.trusted_hops = config['TRUSTED_PROXY_HOPS']
+        app.extensions['rate_limiter'] = self
+
+    def identity(self, user_id, remote_addr, forwarded_for):
+        """('user', id) for logged-in requests, ('ip', address) for anonymous ones"""
+        if user_id:
+            return 'user', user_id
+        return 'ip', client_ip(remote_addr, forwarded_for, self.trusted_hops)
+
+    def admit(self, route_class, identity):
+        """
+        Take a token and a concurrency slot for a request; call release() when it is done
+
+        Returns:
+            Rejection or None when the request may proceed
+        """
+        if not self.enabled:
+            return None
+        policy = self.policies[route_class]
+        if identity[0] == 'user':
+            per_minute, burst = policy.per_minute, policy.burst
+        else:
+            per_minute, burst = policy.anonymous_per_minute, policy.anonymous_burst
+
+        try:
+            wait = self.buckets.take(f"{route_class}:{identity[0]}:{identity[1]}", per_minute, burst)
+        except Exception as e:
+            print(f"Rate limit store unavailable, admitting request: {e}")
+            wait = 0
+        if wait > 0:
+            return self._reject(route_class, 'rate', wait)
+
+        reason = self.gates[route_class].acquire(identity, self.max_queue, self.queue_timeout)
+        if reason == 'user_concurrency':
+            return self._reject(route_class, reason, 5, f"⏳ You already have {policy.per_user} uploads processing. "
+                                                        f"Please wait for one to finish.")
+        if reason:
+            return self._reject(route_class, reason, 1)
+        return None
+
+    def release(self, route_class, identity):
+        """Give back the concurrency slot taken by admit()"""
+        if self.enabled:
+            self.gates[route_class].release(identity)
+
+    def _reject(self, route_class, reason, retry_after, message=None):
+        retry_after = max(1, math.ceil(retry_after))
+        metrics.inc('noteflow_rate_limit_rejected_total', route_class=route_class, reason=reason)
+        return Rejection(message or f"⏳ Too many requests. Please try again in {retry_after} seconds.", retry_after)
+
+
+rate_limiter = RateLimiter()
+
+
+def rate_limited(route_class):
+    """View decorator: admit the request through rate_limiter or answer 429 with Retry-After"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            user_id = current_user.id if current_user.is_authenticated else None
+            identity = rate_limiter.identity(user_id, request.remote_addr, request.headers.get('X-Forwarded-For'))
+            rejection = rate_limiter.admit(route_class, identity)
+            if rejection:
+                return jsonify({'success': False, 'message': rejection.message}), 429, \
+                    {'Retry-After': str(rejection.retry_after)}
+            try:
+                return view(*args, **kwargs)
+            finally:
+                rate_limiter.release(route_class, identity)
+        return wrapped
+    return decorator
@@ -0,0 +1,103 @@
+"""
+Database schema management at startup (DB_SCHEMA_MODE)
+
+    create      db.create_all() on every start: creates missing tables, one inspection query
+                per table. Default for local development. Databases with a migration history
+                are only checked, as in `migrations` mode.
+    migrations  default in production (Render / FLASK_ENV=production): the schema is managed only
+                by `flask init-db` (start.sh, once per deploy); a worker boot reads the Alembic
+                revision (one query) and warns when the database is behind the migration scripts
+    none        fast start: nothing touches the database while booting
+
+`flask init-db` bootstraps a fresh database (create_all + stamp the migration head) and
+otherwise only runs `flask db upgrade`: new tables and columns come from the migrations.
+"""
+import os
+import re
+import click
+from flask import current_app
+from sqlalchemy import inspect, text
+
+SCHEMA_MODES = ('create', 'migrations', 'none')
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+_REVISION = re.compile(r"^revision\s*=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\s*=\s*['\"](\w+)['\"]", re.MULTILINE)
+
+
+def head_revisions(directory=MIGRATIONS_DIR):
+    """
+    Head revision(s) of the migration scripts, read from the files without importing alembic
+
+    Returns:
+        set: revisions no other migration builds on
+    """
+    revisions, parents = set(), set()
+    versions = os.path.join(directory, 'versions')
+    for filename in os.listdir(versions) if os.path.isdir(versions) else ():
+        if not filename.endswith('.py'):
+            continue
+        with open(os.path.join(versions, filename), encoding='utf-8') as f:
+            source = f.read()
+        revisions.update(_REVISION.findall(source))
+        parents.update(_DOWN_REVISION.findall(source))
+    return revisions - parents
+
+
+def _check_revision(db):
+    """Log the database's Alembic revision and warn when migrations are pending"""
+    try:
+        revision = db.session.execute(text('SELECT version_num FROM alembic_version')).scalar()
+    except Exception:
+        db.session.rollback()
+        print("⚠️ Database has no migration history, run `flask init-db` before serving")
+        return
+    heads = head_revisions()
+    if heads and revision not in heads:
+        print(f"⚠️ Database schema is at revision {revision}, migrations head is {', '.join(sorted(heads))}: "
+              f"run `flask init-db`")
+
+
+def prepare_schema(app, db):
+    """
+    Apply the configured DB_SCHEMA_MODE at startup
+
+    Returns:
+        str: the mode that was applied
+    """
+    mode = app.config.get('DB_SCHEMA_MODE', 'create')
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f"DB_SCHEMA_MODE must be one of {', '.join(SCHEMA_MODES)}, got {mode!r}")
+
+    # `flask db ...` / `flask init-db` manage the schema themselves
+    if mode == 'none' or (mode == 'migrations' and os.environ.get('FLASK_RUN_FROM_CLI') == 'true'):
+        return mode
+
+    with app.app_context():
+        # A database under migrations is never changed from the models: tables they create
+        # would make the next `flask init-db` fail
+        if mode == 'create' and not inspect(db.engine).has_table('alembic_version'):
+            db.create_all()
+        else:
+            _check_revision(db)
+    return mode
+
+
+@click.command('init-db')
+def init_db_command():
+    """Create or upgrade the database schema (run once per deploy)"""
+    from flask_migrate import upgrade, stamp
+
+    db = current_app.extensions['sqlalchemy']
+    fresh = not inspect(db.engine).has_table('alembic_version')
+
+    if fresh:
+        # The migration chain starts from the models' base tables, so a new database is
+        # created from the models and marked as being at the head
+        db.create_all()
+        stamp()
+        click.echo('✅ Created the database schema at the migrations head')
+    else:
+        # Existing databases change only through migrations
+        upgrade()
+        click.echo('✅ Database schema is up to date')
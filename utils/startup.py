@@ -0,0 +1,50 @@
+"""
+Startup timing report: how long the app takes from the first import to ready
+
+app.py marks each phase (imports, extensions, blueprints, schema) and prints one line
+when it is ready to serve:
+
+    Startup: ready in 812 ms (imports 640 ms, extensions 21 ms, blueprints 95 ms, schema[migrations] 3 ms)
+
+Each phase is also recorded in the noteflow_startup_seconds histogram (one observation
+per process start; with gunicorn --preload that is the master).
+"""
+import time
+from utils import metrics
+
+# Seconds; a cold start is normally well under a few seconds
+STARTUP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+
+class StartupReport:
+    """Collects (phase, seconds) pairs between successive mark() calls"""
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self._last = self.started
+        self.phases = []
+
+    def mark(self, phase):
+        """Close the current phase under `phase`"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self.started
+
+    def summary(self):
+        """Phases and total in milliseconds"""
+        return {
+            'total_ms': round(self.total * 1000, 1),
+            'phases': {phase: round(seconds * 1000, 1) for phase, seconds in self.phases},
+        }
+
+    def finish(self):
+        """Print the report and record it in /metrics"""
+        for phase, seconds in self.phases:
+            metrics.observe('noteflow_startup_seconds', seconds, buckets=STARTUP_BUCKETS, phase=phase)
+        metrics.observe('noteflow_startup_seconds', self.total, buckets=STARTUP_BUCKETS, phase='total')
+        details = ', '.join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in self.phases)
+        print(f"Startup: ready in {self.total * 1000:.0f} ms ({details})")
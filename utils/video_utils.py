@@ -3,10 +3,12 @@ Video processing utilities - Extract audio from video files
 """
 import os
 import logging
+from utils import metrics
 
 logger = logging.getLogger(__name__)
 
 
+@metrics.timed('noteflow_stage_seconds', stage='extract_audio')
 def extract_audio_from_video(video_path, output_audio_path=None):
     """
     Extract audio from video file and save as MP3